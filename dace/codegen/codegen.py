@@ -225,6 +225,9 @@ def generate_code(sdfg, validate=True) -> List[CodeObject]:
 
     # NOTE: THE SDFG IS ASSUMED TO BE FROZEN (not change) FROM THIS POINT ONWARDS
 
+    # Preprocessing may have modified the SDFG in-place, clear cached hashes before they are used for codegen
+    sdfg.invalidate_hash()
+
     # Generate frame code (and the rest of the code)
     (global_code, frame_code, used_targets, used_environments) = frame.generate_code(sdfg, None)
     target_objects = [
@@ -5,7 +5,8 @@ import os
 import re
 import shutil
 import subprocess
-from typing import Any, Callable, Dict, List, Tuple, Optional, Type
+import threading
+from typing import Any, Callable, Dict, List, Set, Tuple, Optional, Type
 import warnings
 
 import numpy as np
@@ -37,6 +38,11 @@ class ReloadableDLL(object):
         self._stub = None
         self._lib = None
 
+    @property
+    def loaded(self) -> bool:
+        """ Returns True if the internal library is currently loaded by this object. """
+        return self._lib is not None and self._lib.value is not None
+
     def get_symbol(self, name, restype=ctypes.c_int):
         """ Returns a symbol (e.g., function name) in the loaded library. """
 
@@ -162,15 +168,95 @@ def _array_interface_ptr(array: Any, array_type: dt.Array) -> int:
     return array.__array_interface__['data'][0]
 
 
+def _argument_signature(arg: Any) -> Any:
+    """
+    Returns a hashable key of the properties of an argument that determine how it is passed to a compiled SDFG (i.e.,
+    its type and element type, but not its shape or contents), or None if the argument cannot use a cached call plan.
+    """
+    if isinstance(arg, np.ndarray):
+        return (np.ndarray, arg.dtype, arg.base is None)
+    if isinstance(arg, symbolic.symbol):
+        return (symbolic.symbol, arg.name)
+    if isinstance(arg, (list, sp.Basic)) or callable(arg):
+        return None
+    if dtypes.is_array(arg):
+        return (type(arg), getattr(arg, 'dtype', None))
+    return type(arg)
+
+
+#: Value ranges of 32-bit integer scalars that Python integers are passed to without a cast warning
+_INT_SCALAR_RANGES = {np.int32: (-(1 << 31) + 1, (1 << 31) - 1), np.uint32: (0, (1 << 32) - 1)}
+
+
+def _int_scalar_fits(arg: int, scalar_type: type) -> bool:
+    """ Returns True if the Python integer ``arg`` fits in the given 32-bit integer scalar type. """
+    low, high = _INT_SCALAR_RANGES[scalar_type]
+    return low <= arg <= high
+
+
+class _CallPlan(object):
+    """
+    A specialization of argument construction for a specific argument signature. Each entry in ``callargs`` is a
+    tuple of (argument name, conversion kind, ctypes type, data descriptor), and ``initargs`` lists the indices of
+    call arguments that are also passed to the initialization function. ``CAST`` entries are Python integers passed
+    to 32-bit integer scalars, which are range-checked on every call.
+    """
+    ARRAY, NULL, SYMBOL, STRING, CAST, SCALAR = range(6)
+
+    def __init__(self, callargs: List[Tuple[str, int, Any, dt.Data]], initargs: List[int]):
+        self.callargs = callargs
+        self.initargs = initargs
+
+
+class _ProgramState(object):
+    """
+    A program state of a compiled SDFG (the state struct returned by the initialization function, which contains
+    persistent transients), along with the return values and arguments of the last call that used it.
+    """
+
+    def __init__(self):
+        self.handle = ctypes.c_void_p(0)
+        self.initialized = False
+        self.lastargs = ()
+
+        # Cache SDFG return values
+        self.create_new_arrays: bool = True
+        self.return_syms: Dict[str, Any] = None
+        self.retarray_shapes: List[Optional[Tuple[str, np.dtype, dtypes.StorageType, Tuple[int], Tuple[int],
+                                                  int]]] = []
+        self.return_buffers: List[Optional[np.ndarray]] = []  # Allocated return values, reused by subsequent calls
+        self.retarray_is_scalar: List[bool] = []
+        self.return_arrays: List[np.ndarray] = []  # Return values of the last call
+        self.callback_retval_references: List[Any] = []  # Avoids garbage-collecting callback return values
+
+
 class CompiledSDFG(object):
-    """ A compiled SDFG object that can be called through Python. """
+    """
+    A compiled SDFG object that can be called through Python.
 
-    def __init__(self, sdfg, lib: ReloadableDLL, argnames: List[str] = None):
+    Return values are written to arrays that are allocated on the first call and reused by subsequent calls with the
+    same symbol values, until ``clear_return_values`` is called. Alternatively, callers can provide the buffers to
+    write return values into with the ``out`` keyword argument (a single array, or a tuple of arrays for multiple
+    return values), unless the SDFG has an argument named ``out``.
+
+    By default, all calls share a single program state and must not be concurrent. If ``concurrent_states`` is
+    larger than one, the compiled SDFG keeps a pool of up to that many program states, and every call uses a state
+    (and return values) of its own, such that one compiled SDFG can be called from multiple threads.
+    """
+
+    def __init__(self, sdfg, lib: ReloadableDLL, argnames: List[str] = None, concurrent_states: Optional[int] = None):
         self._sdfg = sdfg
         self._lib = lib
-        self._initialized = False
-        self._libhandle = ctypes.c_void_p(0)
-        self._lastargs = ()
+        # The state used by non-concurrent calls, ``initialize``, ``fast_call``, and ``get_state_struct``
+        self._state = _ProgramState()
+
+        # Pool of program states for concurrent calls
+        if concurrent_states is None:
+            concurrent_states = Config.get('compiler', 'concurrent_states')
+        self._concurrent_states = int(concurrent_states)
+        self._pool: List[_ProgramState] = []
+        self._free_states: List[_ProgramState] = []
+        self._state_released = threading.Condition()
 
         lib.load()  # Explicitly load the library
         self._init = lib.get_symbol('__dace_init_{}'.format(sdfg.name))
@@ -178,20 +264,21 @@ class CompiledSDFG(object):
         self._exit = lib.get_symbol('__dace_exit_{}'.format(sdfg.name))
         self._cfunc = lib.get_symbol('__program_{}'.format(sdfg.name))
 
-        # Cache SDFG return values
-        self._create_new_arrays: bool = True
-        self._return_syms: Dict[str, Any] = None
-        self._retarray_shapes: List[Tuple[str, np.dtype, dtypes.StorageType, Tuple[int], Tuple[int], int]] = []
-        self._retarray_is_scalar: List[bool] = []
-        self._return_arrays: List[np.ndarray] = []
-        self._callback_retval_references: List[Any] = []  # Avoids garbage-collecting callback return values
-
         # Cache SDFG argument properties
         self._typedict = self._sdfg.arglist()
         self._sig = self._sdfg.signature_arglist(with_types=False, arglist=self._typedict)
+        self._return_descs = [(name, desc) for name, desc in sorted(self._sdfg.arrays.items())
+                              if name.startswith('__return') and not desc.transient]
+        # Symbols that determine the shapes and strides of return values
+        self._return_symbols: Set[str] = set(str(s) for _, desc in self._return_descs for s in desc.free_symbols)
+        self._array_args = [a for a in self._sig if isinstance(self._typedict[a], dt.Array)]
+        self._written_arrays: Optional[Set[str]] = None
         self._free_symbols = self._sdfg.free_symbols
         self.argnames = argnames
 
+        # Argument construction plans, specialized per argument signature
+        self._call_plans: Dict[Tuple[Any, ...], Optional[_CallPlan]] = {}
+
     def get_exported_function(self, name: str, restype=None) -> Optional[Callable[..., Any]]:
         """
         Tries to find a symbol by name in the compiled SDFG, and convert it to a callable function
@@ -214,7 +301,7 @@ class CompiledSDFG(object):
             :return: the ctypes.Structure representation of the state struct.
         """
 
-        return ctypes.cast(self._libhandle, ctypes.POINTER(self._try_parse_state_struct())).contents
+        return ctypes.cast(self._state.handle, ctypes.POINTER(self._try_parse_state_struct())).contents
 
     def _try_parse_state_struct(self) -> Optional[Type[ctypes.Structure]]:
         # the path of the main sdfg file containing the state struct
@@ -259,14 +346,20 @@ class CompiledSDFG(object):
     def sdfg(self):
         return self._sdfg
 
-    def _initialize(self, argtuple):
+    @property
+    def concurrent_states(self) -> int:
+        """ The maximal number of program states used by concurrent calls (one if calls cannot be concurrent). """
+        return self._concurrent_states
+
+    def _initialize(self, argtuple, state: Optional[_ProgramState] = None):
+        state = state or self._state
         if self._init is not None:
             res = ctypes.c_void_p(self._init(*argtuple))
             if res == ctypes.c_void_p(0):
                 raise RuntimeError('DaCe application failed to initialize')
 
-            self._libhandle = res
-            self._initialized = True
+            state.handle = res
+            state.initialized = True
 
     def initialize(self, *args, **kwargs):
         """
@@ -277,7 +370,7 @@ class CompiledSDFG(object):
         :return: If successful, returns the library handle (as a ctypes pointer).
         :note: This call requires the same arguments as it would when normally calling the program.
         """
-        if self._initialized:
+        if self._state.initialized:
             return
 
         if len(args) > 0 and self.argnames is not None:
@@ -286,54 +379,298 @@ class CompiledSDFG(object):
         # Construct arguments in the exported C function order
         _, initargtuple = self._construct_args(kwargs)
         self._initialize(initargtuple)
-        return self._libhandle
+        return self._state.handle
 
     def finalize(self):
-        if self._exit is not None:
-            self._exit(self._libhandle)
-            self._initialized = False
+        """ Finalizes all initialized program states (a subsequent call initializes them again). """
+        # Program states cannot be finalized once the library is unloaded
+        if self._exit is not None and self._lib.loaded:
+            for state in [self._state] + self._pool:
+                if state.initialized:
+                    self._exit(state.handle)
+                    state.initialized = False
+
+    def _set_output_buffers(self, kwargs: Dict[str, Any]):
+        """ Replaces the ``out`` keyword argument, if given, with the return value arguments. """
+        if 'out' not in kwargs or 'out' in self._typedict:
+            return
+        out = kwargs.pop('out')
+        if not isinstance(out, (tuple, list)):
+            out = (out, )
+        if len(out) != len(self._return_descs):
+            raise ValueError(f'Expected {len(self._return_descs)} output buffers, got {len(out)}')
+        for (name, _), buffer in zip(self._return_descs, out):
+            if buffer is not None:
+                kwargs[name] = buffer
 
     def __call__(self, *args, **kwargs):
         # Update arguments from ordered list
         if len(args) > 0 and self.argnames is not None:
             kwargs.update({aname: arg for aname, arg in zip(self.argnames, args)})
+        self._set_output_buffers(kwargs)
 
+        if self._concurrent_states <= 1:
+            return self._call(self._state, kwargs)
+
+        state = self._acquire_state()
         try:
-            argtuple, initargtuple = self._construct_args(kwargs)
+            # Return values are handed to the caller, and must not be reused by a subsequent call with this state
+            state.create_new_arrays = True
+            return self._call(state, kwargs)
+        finally:
+            self._release_state(state)
+
+    def _call(self, state: _ProgramState, kwargs):
+        # Invalid arguments do not affect the loaded library, which initialized program states still use
+        argtuple, initargtuple = self._construct_args(kwargs, state)
 
+        try:
             # Call initializer function if necessary, then SDFG
-            if self._initialized is False:
+            if state.initialized is False:
                 self._lib.load()
-                self._initialize(initargtuple)
+                self._initialize(initargtuple, state)
             # PROFILING
             if Config.get_bool('profiling'):
-                operations.timethis(self._sdfg, 'DaCe', 0, self._cfunc, self._libhandle, *argtuple)
+                operations.timethis(self._sdfg, 'DaCe', 0, self._cfunc, state.handle, *argtuple)
             else:
-                self._cfunc(self._libhandle, *argtuple)
+                self._cfunc(state.handle, *argtuple)
 
-            return self._convert_return_values()
+            return self._convert_return_values(state)
         except (RuntimeError, TypeError, UnboundLocalError, KeyError, cgx.DuplicateDLLError, ReferenceError):
-            self._lib.unload()
+            # Other threads may still be using the library
+            if self._concurrent_states <= 1:
+                self._lib.unload()
+                state.initialized = False
             raise
 
+    def _acquire_state(self) -> _ProgramState:
+        """ Returns a program state for a concurrent call, creating a new one or waiting for a free one. """
+        with self._state_released:
+            while not self._free_states:
+                if len(self._pool) < self._concurrent_states:
+                    state = _ProgramState()
+                    self._pool.append(state)
+                    return state
+                self._state_released.wait()
+            return self._free_states.pop()
+
+    def _release_state(self, state: _ProgramState):
+        with self._state_released:
+            self._free_states.append(state)
+            self._state_released.notify()
+
+    def fast_call(self, callargs: Tuple[Any, ...], initargs: Tuple[Any, ...]):
+        """
+        Calls the compiled SDFG directly with prepared arguments, bypassing argument construction and checks.
+
+        Use ``construct_arguments`` once to obtain ``callargs`` and ``initargs``, then call this method repeatedly.
+        Arrays are passed by pointer, so their contents may change between calls, but their location and all other
+        argument values (including scalars and symbols) are fixed. Fast calls always use the same program state and
+        return values, and must not be concurrent.
+
+        :param callargs: Arguments of the SDFG function, as returned by ``construct_arguments``.
+        :param initargs: Arguments of the initialization function, as returned by ``construct_arguments``.
+        :return: The return values of the SDFG, as in a regular call.
+        """
+        if self._state.initialized is False:
+            self._lib.load()
+            self._initialize(initargs)
+        self._cfunc(self._state.handle, *callargs)
+        return self._convert_return_values(self._state)
+
+    def construct_arguments(self, *args, **kwargs) -> Tuple[Tuple[Any, ...], Tuple[Any, ...]]:
+        """
+        Constructs the arguments of the compiled SDFG functions for use with ``fast_call``.
+
+        :param args: Arguments to call SDFG with.
+        :param kwargs: Keyword arguments to call SDFG with.
+        :return: A 2-tuple of (SDFG function arguments, initialization function arguments).
+        """
+        if len(args) > 0 and self.argnames is not None:
+            kwargs.update({aname: arg for aname, arg in zip(self.argnames, args)})
+        self._set_output_buffers(kwargs)
+        return self._construct_args(kwargs)
+
     def __del__(self):
-        if self._initialized is True:
+        if any(state.initialized for state in [self._state] + self._pool):
             self.finalize()
-            self._initialized = False
-            self._libhandle = ctypes.c_void_p(0)
+        for state in [self._state] + self._pool:
+            state.handle = ctypes.c_void_p(0)
         self._lib.unload()
 
-    def _construct_args(self, kwargs) -> Tuple[Tuple[Any], Tuple[Any]]:
+    def _construct_args(self, kwargs, state: Optional[_ProgramState] = None) -> Tuple[Tuple[Any], Tuple[Any]]:
         """ Main function that controls argument construction for calling
             the C prototype of the SDFG.
 
             Organizes arguments first by `sdfg.arglist`, then data descriptors
             by alphabetical order, then symbols by alphabetical order.
         """
+        state = state or self._state
+
+        # Use zero-copy array views of arguments that export DLPack or the buffer protocol
+        exported = self._export_buffers(kwargs)
+
         # Return value initialization (for values that have not been given)
-        self._initialize_return_values(kwargs)
-        for desc, arr in zip(self._retarray_shapes, self._return_arrays):
-            kwargs[desc[0]] = arr
+        self._initialize_return_values(kwargs, state)
+        for (name, _), arr in zip(self._return_descs, state.return_arrays):
+            kwargs[name] = arr
+
+        # Use a cached plan if the argument signature was seen before
+        try:
+            signature = tuple(_argument_signature(kwargs[a]) for a in self._sig)
+        except KeyError:
+            signature = None
+        if signature is not None and None not in signature:
+            if exported:
+                signature += (exported, )
+            plan = self._call_plans.get(signature, False)
+            if plan:
+                state.lastargs = self._construct_args_from_plan(plan, kwargs)
+                if state.lastargs is not None:
+                    return state.lastargs
+            state.lastargs = self._construct_args_generic(kwargs, state, exported)
+            if plan is False:
+                self._call_plans[signature] = self._make_call_plan(kwargs)
+            return state.lastargs
+
+        state.lastargs = self._construct_args_generic(kwargs, state, exported)
+        return state.lastargs
+
+    def _export_buffers(self, kwargs) -> Tuple[str, ...]:
+        """
+        Replaces array arguments that export DLPack or the buffer protocol (see ``dtypes.buffer_to_array``) with
+        zero-copy array views, after checking their element types, strides, and writability.
+
+        :return: The names of the replaced arguments.
+        """
+        exported = ()
+        for aname in self._array_args:
+            arg = kwargs.get(aname)
+            if arg is None or type(arg) is np.ndarray or isinstance(arg, list) or dtypes.is_array(arg):
+                continue
+            array = dtypes.buffer_to_array(arg)
+            if array is not None:
+                kwargs[aname] = self._check_buffer(aname, array, kwargs)
+                exported += (aname, )
+        return exported
+
+    def _check_buffer(self, aname: str, array: Any, kwargs) -> Any:
+        """ Checks that an exported buffer can be passed to an array argument, reinterpreting raw bytes if necessary. """
+        if not isinstance(array, np.ndarray):
+            return array  # Device memory is passed as-is
+
+        desc = self._typedict[aname]
+        dtype = desc.dtype.as_numpy_dtype()
+        if (array.dtype != dtype and array.dtype.itemsize == 1 and array.flags.c_contiguous
+                and array.nbytes % dtype.itemsize == 0):
+            # Raw bytes (e.g., memory-mapped files) are reinterpreted with the element type of the array
+            array = array.reshape(-1).view(dtype)
+        if array.dtype != dtype:
+            raise TypeError(f'Passing a buffer with {array.dtype} elements to a {desc.dtype.type.__name__} array in '
+                            f'argument "{aname}"')
+
+        # Evaluate the shape and strides of the array, if all symbols are given
+        syms = {k: v for k, v in kwargs.items() if k not in self._sdfg.arrays}
+        syms.update(self._sdfg.constants)
+        try:
+            shape = tuple(int(symbolic.evaluate(s, syms)) for s in desc.shape)
+            strides = tuple(int(symbolic.evaluate(s, syms)) for s in desc.strides)
+        except (TypeError, ValueError):
+            shape, strides = None, None
+
+        if array.ndim != len(desc.shape):
+            if shape is None or not array.flags.c_contiguous or array.size != int(np.prod(shape)):
+                raise TypeError(f'Passing a {array.ndim}-dimensional buffer to a {len(desc.shape)}-dimensional array '
+                                f'in argument "{aname}"')
+            array = array.reshape(shape)
+        if any(s % array.itemsize != 0 for s in array.strides):
+            raise TypeError(f'Strides of the buffer in argument "{aname}" are not a multiple of its element size')
+        if strides is not None and any(dim != 1 and s // array.itemsize != expected
+                                       for dim, s, expected in zip(array.shape, array.strides, strides)):
+            raise TypeError(f'Strides of the buffer in argument "{aname}" '
+                            f'({tuple(s // array.itemsize for s in array.strides)}) do not match the strides of the '
+                            f'array ({strides})')
+
+        if not array.flags.writeable:
+            if self._written_arrays is None:
+                self._written_arrays = {
+                    node.data
+                    for state in self._sdfg.nodes() for node in state.data_nodes() if state.in_degree(node) > 0
+                }
+            if aname in self._written_arrays:
+                raise TypeError(f'Passing a read-only buffer to argument "{aname}", which the program writes to')
+
+        return array
+
+    def _construct_args_from_plan(self, plan: _CallPlan, kwargs) -> Optional[Tuple[Tuple[Any], Tuple[Any]]]:
+        """
+        Constructs the arguments according to a call plan, or returns None if a value must go through the generic
+        argument construction (e.g., an integer out of the range of its scalar type).
+        """
+        newargs = []
+        for aname, kind, actype, atype in plan.callargs:
+            arg = kwargs[aname]
+            if kind == _CallPlan.ARRAY:
+                newargs.append(ctypes.c_void_p(_array_interface_ptr(arg, atype)))
+            elif kind == _CallPlan.SCALAR:
+                newargs.append(actype(arg))
+            elif kind == _CallPlan.NULL:
+                newargs.append(ctypes.c_void_p(0))
+            elif kind == _CallPlan.SYMBOL:
+                newargs.append(actype(arg.get()))
+            elif kind == _CallPlan.STRING:
+                newargs.append(ctypes.c_char_p(None if arg is None else arg.encode('utf-8')))
+            else:  # _CallPlan.CAST
+                if not _int_scalar_fits(arg, atype.dtype.type):
+                    return None
+                newargs.append(actype(arg))
+
+        return tuple(newargs), tuple(newargs[i] for i in plan.initargs)
+
+    def _make_call_plan(self, kwargs) -> Optional[_CallPlan]:
+        """
+        Creates a call plan from the arguments of the last (generic) argument construction, or returns None if the
+        arguments cannot be constructed with a plan (e.g., callbacks).
+        """
+        constants = self._sdfg.constants
+        callargs = []
+        initargs = []
+        for aname in self._sig:
+            arg = kwargs[aname]
+            atype = self._typedict[aname]
+            if isinstance(atype.dtype, dtypes.callback):
+                return None
+            if symbolic.issymbolic(arg) and not (hasattr(arg, 'name') and arg.name not in constants):
+                continue  # Symbolic constants are removed from the arguments
+            actype = atype.dtype.as_ctypes()
+
+            if arg is None and isinstance(atype, dt.Array):
+                kind = _CallPlan.NULL
+            elif dtypes.is_array(arg):
+                kind = _CallPlan.ARRAY
+            elif isinstance(arg, symbolic.symbol):
+                kind = _CallPlan.SYMBOL
+            elif atype.dtype == dtypes.string:
+                kind = _CallPlan.STRING
+            elif (isinstance(arg, atype.dtype.type) or (isinstance(arg, int) and atype.dtype.type == np.int64)
+                  or (isinstance(arg, float) and atype.dtype.type == np.float64)):
+                kind = _CallPlan.SCALAR
+            elif isinstance(arg, int) and atype.dtype.type in _INT_SCALAR_RANGES:
+                kind = _CallPlan.CAST
+            else:
+                return None  # Other scalar casts are checked and reported by the generic construction
+
+            if aname in self._free_symbols:
+                initargs.append(len(callargs))
+            callargs.append((aname, kind, actype, atype))
+
+        return _CallPlan(callargs, initargs)
+
+    def _construct_args_generic(self,
+                                kwargs,
+                                state: Optional[_ProgramState] = None,
+                                exported: Tuple[str, ...] = ()) -> Tuple[Tuple[Any], Tuple[Any]]:
+        state = state or self._state
 
         # Argument construction
         sig = self._sig
@@ -378,9 +715,8 @@ class CompiledSDFG(object):
                     pass
                 elif isinstance(arg, float) and atype.dtype.type == np.float64:
                     pass
-                elif (isinstance(arg, int) and atype.dtype.type == np.int32 and abs(arg) <= (1 << 31) - 1):
-                    pass
-                elif (isinstance(arg, int) and atype.dtype.type == np.uint32 and arg >= 0 and arg <= (1 << 32) - 1):
+                elif (isinstance(arg, int) and atype.dtype.type in _INT_SCALAR_RANGES
+                      and _int_scalar_fits(arg, atype.dtype.type)):
                     pass
                 elif (isinstance(arg, str) or arg is None) and atype.dtype == dtypes.string:
                     if arg is None:
@@ -400,7 +736,8 @@ class CompiledSDFG(object):
                     print('WARNING: Passing %s array argument "%s" to a %s array' %
                           (arg.dtype, a, atype.dtype.type.__name__))
             elif (isinstance(atype, dt.Array) and isinstance(arg, np.ndarray) and arg.base is not None
-                  and not '__return' in a and not Config.get_bool('compiler', 'allow_view_arguments')):
+                  and not '__return' in a and a not in exported
+                  and not Config.get_bool('compiler', 'allow_view_arguments')):
                 raise TypeError(f'Passing a numpy view (e.g., sub-array or "A.T") "{a}" to DaCe '
                                 'programs is not allowed in order to retain analyzability. '
                                 'Please make a copy with "numpy.copy(...)". If you know what '
@@ -412,7 +749,7 @@ class CompiledSDFG(object):
         for index, (arg, argtype) in enumerate(zip(arglist, argtypes)):
             # Call a wrapper function to make NumPy arrays from pointers.
             if isinstance(argtype.dtype, dtypes.callback):
-                arglist[index] = argtype.dtype.get_trampoline(arg, kwargs, self._callback_retval_references)
+                arglist[index] = argtype.dtype.get_trampoline(arg, kwargs, state.callback_retval_references)
             # List to array
             elif isinstance(arg, list) and isinstance(argtype, dt.Array):
                 arglist[index] = np.array(arg, dtype=argtype.dtype.type)
@@ -460,11 +797,10 @@ class CompiledSDFG(object):
                 except TypeError as ex:
                     raise TypeError(f'Invalid type for scalar argument "{callparams[i][3]}": {ex}')
 
-        self._lastargs = newargs, initargs
-        return self._lastargs
+        return newargs, initargs
 
     def clear_return_values(self):
-        self._create_new_arrays = True
+        self._state.create_new_arrays = True
 
     def _create_array(self, _: str, dtype: np.dtype, storage: dtypes.StorageType, shape: Tuple[int],
                       strides: Tuple[int], total_size: int):
@@ -490,61 +826,61 @@ class CompiledSDFG(object):
         # Create an array with the properties of the SDFG array
         return ndarray(shape, dtype, buffer=zeros(total_size, dtype), strides=strides)
 
-    def _initialize_return_values(self, kwargs):
+    def _initialize_return_values(self, kwargs, state: _ProgramState):
         # Obtain symbol values from arguments and constants
         syms = dict()
         syms.update({k: v for k, v in kwargs.items() if k not in self.sdfg.arrays})
         syms.update(self.sdfg.constants)
 
         # Clear references from last call (allow garbage collection)
-        self._callback_retval_references.clear()
-
-        if self._initialized:
-            if self._return_syms == syms:
-                if not self._create_new_arrays:
-                    return
-                else:
-                    self._create_new_arrays = False
-                    # Use stored sizes to recreate arrays (fast path)
-                    self._return_arrays = tuple(kwargs[desc[0]] if desc[0] in kwargs else self._create_array(*desc)
-                                                for desc in self._retarray_shapes)
-                    return
-
-        self._return_syms = syms
-        self._create_new_arrays = False
-
-        # Initialize return values with numpy arrays
-        self._retarray_shapes = []
-        self._return_arrays = []
-        for arrname, arr in sorted(self.sdfg.arrays.items()):
-            if arrname.startswith('__return') and not arr.transient:
-                if arrname in kwargs:
-                    self._return_arrays.append(kwargs[arrname])
-                    self._retarray_is_scalar.append(isinstance(arr, dt.Scalar))
-                    self._retarray_shapes.append((arrname, ))
-                    continue
-
-                if isinstance(arr, dt.Stream):
-                    raise NotImplementedError('Return streams are unsupported')
-
-                shape = tuple(symbolic.evaluate(s, syms) for s in arr.shape)
-                dtype = arr.dtype.as_numpy_dtype()
-                total_size = int(symbolic.evaluate(arr.total_size, syms))
-                strides = tuple(symbolic.evaluate(s, syms) * arr.dtype.bytes for s in arr.strides)
-                shape_desc = (arrname, dtype, arr.storage, shape, strides, total_size)
-                self._retarray_is_scalar.append(isinstance(arr, dt.Scalar) or isinstance(arr.dtype, dtypes.pyobject))
-                self._retarray_shapes.append(shape_desc)
+        state.callback_retval_references.clear()
+
+        # Only symbols that appear in return value shapes invalidate the reused return values
+        return_syms = {k: v for k, v in syms.items() if k in self._return_symbols}
+        if not state.initialized or state.return_syms != return_syms:
+            # Return value shapes may have changed
+            state.return_syms = return_syms
+            state.retarray_shapes = [None] * len(self._return_descs)
+            state.return_buffers = [None] * len(self._return_descs)
+        elif state.create_new_arrays:
+            # Return values of previous calls were handed out, do not overwrite them
+            state.return_buffers = [None] * len(self._return_descs)
+        state.create_new_arrays = False
+
+        # Use given return values (e.g., output buffers), or allocate and reuse arrays
+        return_arrays = []
+        is_scalar = []
+        for i, (arrname, arr) in enumerate(self._return_descs):
+            if arrname in kwargs:
+                return_arrays.append(kwargs[arrname])
+                is_scalar.append(isinstance(arr, dt.Scalar))
+                continue
+
+            if state.return_buffers[i] is None:
+                if state.retarray_shapes[i] is None:
+                    if isinstance(arr, dt.Stream):
+                        raise NotImplementedError('Return streams are unsupported')
+
+                    shape = tuple(symbolic.evaluate(s, syms) for s in arr.shape)
+                    dtype = arr.dtype.as_numpy_dtype()
+                    total_size = int(symbolic.evaluate(arr.total_size, syms))
+                    strides = tuple(symbolic.evaluate(s, syms) * arr.dtype.bytes for s in arr.strides)
+                    state.retarray_shapes[i] = (arrname, dtype, arr.storage, shape, strides, total_size)
 
                 # Create an array with the properties of the SDFG array
-                arr = self._create_array(*shape_desc)
-                self._return_arrays.append(arr)
+                state.return_buffers[i] = self._create_array(*state.retarray_shapes[i])
+
+            return_arrays.append(state.return_buffers[i])
+            is_scalar.append(isinstance(arr, dt.Scalar) or isinstance(arr.dtype, dtypes.pyobject))
 
+        state.return_arrays = return_arrays
+        state.retarray_is_scalar = is_scalar
 
-    def _convert_return_values(self):
+    def _convert_return_values(self, state: _ProgramState):
         # Return the values as they would be from a Python function
-        if self._return_arrays is None or len(self._return_arrays) == 0:
+        if state.return_arrays is None or len(state.return_arrays) == 0:
             return None
-        elif len(self._return_arrays) == 1:
-            return self._return_arrays[0].item() if self._retarray_is_scalar[0] else self._return_arrays[0]
+        elif len(state.return_arrays) == 1:
+            return state.return_arrays[0].item() if state.retarray_is_scalar[0] else state.return_arrays[0]
         else:
-            return tuple(r.item() if scalar else r for r, scalar in zip(self._return_arrays, self._retarray_is_scalar))
+            return tuple(r.item() if scalar else r for r, scalar in zip(state.return_arrays, state.retarray_is_scalar))
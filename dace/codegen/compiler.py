@@ -6,13 +6,18 @@
 from __future__ import print_function
 
 import collections
+import concurrent.futures
+import contextlib
 import os
 import six
 import shutil
 import shlex
 import subprocess
+import sys
 import re
-from typing import Any, Callable, Dict, List, Set, Tuple, TypeVar, Union
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, TypeVar, Union
 
 import dace
 from dace.config import Config
@@ -24,6 +29,18 @@ from dace.codegen.targets.target import make_absolute
 
 T = TypeVar('T')
 
+#: Lock that serializes code generation, which is not thread-safe, between concurrent compilations
+codegen_lock = threading.RLock()
+
+_background_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_build_folder_locks: Dict[str, threading.RLock] = {}
+_build_folder_locks_lock = threading.Lock()
+
+# Compiler processes in use by concurrent builds of this process (see ``_acquire_build_jobs``)
+_build_jobs_condition = threading.Condition()
+_build_jobs_used = 0
+_active_builds = 0
+
 
 def generate_program_folder(sdfg, code_objects: List[CodeObject], out_path: str, config=None):
     """ Writes all files required to configure and compile the DaCe program
@@ -97,7 +114,72 @@ def generate_program_folder(sdfg, code_objects: List[CodeObject], out_path: str,
     return out_path
 
 
-def configure_and_compile(program_folder, program_name=None, output_stream=None):
+def get_background_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """ Returns the thread pool used for background compilation (see ``SDFG.compile_async``). """
+    global _background_executor
+    if _background_executor is None:
+        _background_executor = concurrent.futures.ThreadPoolExecutor(max_workers=get_build_jobs(),
+                                                                     thread_name_prefix='dace_compile')
+    return _background_executor
+
+
+def get_build_folder_lock(build_folder: str) -> threading.RLock:
+    """ Returns the lock that serializes generating, building and loading programs in the given build folder.
+        Concurrent compilations of SDFGs with the same build folder (e.g., specializations of the same program)
+        would otherwise overwrite each other's sources and binaries. """
+    key = os.path.realpath(build_folder)
+    with _build_folder_locks_lock:
+        if key not in _build_folder_locks:
+            _build_folder_locks[key] = threading.RLock()
+        return _build_folder_locks[key]
+
+
+def get_build_jobs() -> int:
+    """ Returns the maximal number of concurrent compiler processes, as set in the ``compiler.build_jobs``
+        configuration entry. """
+    jobs = Config.get('compiler', 'build_jobs')
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return jobs
+
+
+def get_object_cache_folder() -> str:
+    """ Returns the absolute path to the compiled object file cache folder (see ``compiler.object_cache``). """
+    folder = Config.get('compiler', 'object_cache_folder')
+    if not folder:
+        folder = os.path.join(Config.get('default_build_folder'), 'object_cache')
+    return os.path.abspath(folder)
+
+
+def _acquire_build_jobs(requested: int) -> int:
+    """ Reserves compiler processes for a build, such that concurrent builds (e.g., background compilations and
+        ``compile_many``) together use at most ``compiler.build_jobs`` processes. Blocks until at least one
+        process is available, and divides the available processes among the active builds.
+
+        :param requested: The maximal number of processes to reserve.
+        :return: The number of reserved processes, which must be returned with ``_release_build_jobs``.
+    """
+    global _build_jobs_used, _active_builds
+    total = get_build_jobs()
+    with _build_jobs_condition:
+        while _build_jobs_used >= total:
+            _build_jobs_condition.wait()
+        jobs = max(1, min(requested, total - _build_jobs_used, total // (_active_builds + 1)))
+        _build_jobs_used += jobs
+        _active_builds += 1
+    return jobs
+
+
+def _release_build_jobs(jobs: int):
+    """ Returns compiler processes reserved with ``_acquire_build_jobs``. """
+    global _build_jobs_used, _active_builds
+    with _build_jobs_condition:
+        _build_jobs_used -= jobs
+        _active_builds -= 1
+        _build_jobs_condition.notify_all()
+
+
+def configure_and_compile(program_folder, program_name=None, output_stream=None, jobs: Optional[int] = None):
     """ Configures and compiles a DaCe program in the specified folder into a
         shared library file.
 
@@ -106,6 +188,9 @@ def configure_and_compile(program_folder, program_name=None, output_stream=None)
                                `generate_program_folder`.
         :param output_stream: Additional output stream to write to (used for
                               other clients such as the vscode extension).
+        :param jobs: Maximal number of parallel compiler processes to use. If
+                     None, uses the ``compiler.build_jobs`` configuration
+                     entry. Concurrent builds share that budget.
         :return: Path to the compiled shared library file.
     """
 
@@ -188,6 +273,17 @@ def configure_and_compile(program_folder, program_name=None, output_stream=None)
 
     cmake_command.append(f"-DCMAKE_BUILD_TYPE={Config.get('compiler', 'build_type')}")
 
+    # Compile host C/C++ code through the object file cache, if enabled (CUDA sources are not cached)
+    if Config.get_bool('compiler', 'object_cache') and os.name != 'nt':
+        launcher = ';'.join([
+            sys.executable,
+            os.path.join(dace_path, 'codegen', 'tools', 'object_cache.py'),
+            get_object_cache_folder(),
+            str(Config.get('compiler', 'object_cache_size'))
+        ])
+        cmake_command.append(f'-DCMAKE_C_COMPILER_LAUNCHER="{launcher}"')
+        cmake_command.append(f'-DCMAKE_CXX_COMPILER_LAUNCHER="{launcher}"')
+
     # Set linker and linker arguments, iff they have been specified
     cmake_linker = Config.get('compiler', 'linker', 'executable') or ''
     cmake_linker = cmake_linker.strip()
@@ -228,8 +324,9 @@ def configure_and_compile(program_folder, program_name=None, output_stream=None)
         fp.write(cmake_command)
 
     # Compile and link
+    jobs = _acquire_build_jobs(get_build_jobs() if jobs is None else jobs)
     try:
-        _run_liveoutput("cmake --build . --config %s" % (Config.get('compiler', 'build_type')),
+        _run_liveoutput("cmake --build . --config %s --parallel %d" % (Config.get('compiler', 'build_type'), jobs),
                         shell=True,
                         cwd=build_folder,
                         output_stream=output_stream)
@@ -239,6 +336,8 @@ def configure_and_compile(program_folder, program_name=None, output_stream=None)
             raise cgx.CompilationError('Compiler failure')
         else:
             raise cgx.CompilationError('Compiler failure:\n' + ex.output)
+    finally:
+        _release_build_jobs(jobs)
 
     shared_library_path = os.path.join(build_folder, "lib{}.{}".format(program_name,
                                                                        Config.get('compiler', 'library_extension')))
@@ -246,6 +345,75 @@ def configure_and_compile(program_folder, program_name=None, output_stream=None)
     return shared_library_path
 
 
+def compile_many(sdfgs: Sequence['dace.SDFG'],
+                 validate: bool = True,
+                 workers: Optional[int] = None,
+                 return_times: bool = False) -> Union[List[csd.CompiledSDFG], Tuple[List[csd.CompiledSDFG], List[float]]]:
+    """ Compiles multiple SDFGs at once. Code for all SDFGs is generated first (sequentially, since code generation
+        is not thread-safe), after which the generated programs are configured and built concurrently.
+
+        :param sdfgs: The SDFGs to compile. Each SDFG must have a distinct build folder.
+        :param validate: If True, validates the SDFGs prior to generating code.
+        :param workers: Number of programs to build concurrently. If None, builds all programs concurrently up to
+                        the number of jobs set in ``compiler.build_jobs``. The build jobs are divided among the
+                        concurrent builds.
+        :param return_times: If True, also returns the wall time (in seconds) spent on compiling each SDFG, including
+                             both code generation and building.
+        :return: A list of callable CompiledSDFG objects (in the order of the input SDFGs), and a list of the
+                 compilation times if ``return_times`` is True.
+    """
+    build_folders = [os.path.abspath(sdfg.build_folder) for sdfg in sdfgs]
+    duplicates = {f for f in build_folders if build_folders.count(f) > 1}
+    if duplicates:
+        raise ValueError('Cannot compile multiple SDFGs into the same build folder(s): ' +
+                         ', '.join(sorted(duplicates)) + '. Use unique SDFG names or set the "cache" configuration '
+                         'entry to "hash".')
+
+    # Serialize with other compilations into the same folders (in sorted order to avoid deadlocks)
+    with contextlib.ExitStack() as stack:
+        for build_folder in sorted(os.path.realpath(f) for f in build_folders):
+            stack.enter_context(get_build_folder_lock(build_folder))
+
+        results: List[Optional[csd.CompiledSDFG]] = [None] * len(sdfgs)
+        times = [0.0] * len(sdfgs)
+        to_build: Dict[int, Tuple['dace.SDFG', str]] = {}
+
+        # Load existing binaries and generate code for the rest
+        for i, (sdfg, build_folder) in enumerate(zip(sdfgs, build_folders)):
+            start = time.time()
+            results[i] = sdfg._load_cached_binary(build_folder)
+            if results[i] is None:
+                to_build[i] = sdfg._generate_program_folder(build_folder, validate)
+            times[i] = time.time() - start
+
+        # Build concurrently
+        if to_build:
+            jobs = get_build_jobs()
+            if workers is None:
+                workers = jobs
+            workers = max(1, min(workers, len(to_build)))
+            jobs_per_build = max(1, jobs // workers)
+
+            def build(index: int) -> Tuple[int, str, float]:
+                sdfg, program_folder = to_build[index]
+                start = time.time()
+                shared_library = configure_and_compile(program_folder, sdfg.name, jobs=jobs_per_build)
+                return index, shared_library, time.time() - start
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                for index, shared_library, build_time in executor.map(build, to_build.keys()):
+                    times[index] += build_time
+                    results[index] = get_program_handle(shared_library, to_build[index][0])
+
+    if Config.get_bool('debugprint'):
+        for sdfg, compile_time in zip(sdfgs, times):
+            print(f'Compiled {sdfg.name} in {compile_time:.3f} s')
+
+    if return_times:
+        return results, times
+    return results
+
+
 def _get_or_eval(value_or_function: Union[T, Callable[[], T]]) -> T:
     """
     Returns a stored value or lazily evaluates it. Used in environments
@@ -30,6 +30,7 @@ class InstrumentationReport(object):
 
         self.durations = {}
         self.counters = {}
+        self.aggregates = {}
         self._sortcat = None
         self._sortdesc = False
 
@@ -77,6 +78,23 @@ class InstrumentationReport(object):
 
                         self.counters[uuid][name][counter][tid].append(value)
 
+            # Aggregated durations (see the ``instrumentation.aggregate`` configuration entry)
+            for event in report.get('aggregatedEvents', []):
+                uuid = self.get_event_uuid(event)
+                if uuid not in self.aggregates:
+                    self.aggregates[uuid] = {}
+                count = event['count']
+                self.aggregates[uuid][event['name']] = {
+                    'count': count,
+                    'sum': event['sum'] / 1000,
+                    'mean': event['sum'] / count / 1000 if count > 0 else 0.0,
+                    'min': event['min'] / 1000,
+                    'max': event['max'] / 1000,
+                    'p50': event['p50'] / 1000,
+                    'p90': event['p90'] / 1000,
+                    'p99': event['p99'] / 1000,
+                }
+
     def __repr__(self):
         return 'InstrumentationReport(name=%s)' % self.name
 
@@ -258,6 +276,25 @@ class InstrumentationReport(object):
 
                 string += ('-' * (COLW * 5)) + '\n'
 
+        if len(self.aggregates) > 0:
+            string += ('-' * (COLW * 5)) + '\n'
+            string += ('{:<{width}}' * 2).format('Element', 'Runtime (ms), aggregated', width=COLW) + '\n'
+            string += row_format.format('', 'Min', 'Mean', 'Median', 'Max', width=COLW)
+            string += ('-' * (COLW * 5)) + '\n'
+
+            for element in sorted(self.aggregates.keys()):
+                for event, stats in self.aggregates[element].items():
+                    string += row_format.format(str(element), '', '', '', '', width=COLW)
+                    string += row_format.format('|' + event + ' (%d calls):' % stats['count'], '', '', '', '', width=COLW)
+                    string += row_format.format('|',
+                                                '%.3f' % stats['min'],
+                                                '%.3f' % stats['mean'],
+                                                '%.3f' % stats['p50'],
+                                                '%.3f' % stats['max'],
+                                                width=COLW)
+
+            string += ('-' * (COLW * 5)) + '\n'
+
         if len(self.counters) > 0:
             string += ('-' * (COLW * 5)) + '\n'
             string += ('{:<{width}}' * 2).format('Element', 'Counter', width=COLW) + '\n'
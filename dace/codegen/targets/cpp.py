@@ -235,6 +235,16 @@ def ptr(name: str, desc: data.Data, sdfg: SDFG = None, framecode=None) -> str:
     return name
 
 
+def arena_buffer(sdfg: SDFG, desc: data.Data) -> Optional[str]:
+    """
+    Returns the name of the arena buffer that a data descriptor is placed in by memory planning (see
+    ``dace.transformation.passes.MemoryPlanning``), or None if the descriptor is allocated separately.
+    """
+    if isinstance(desc, data.Array) and desc.arena is not None and desc.arena in sdfg.arrays:
+        return desc.arena
+    return None
+
+
 def emit_memlet_reference(dispatcher,
                           sdfg: SDFG,
                           memlet: mmlt.Memlet,
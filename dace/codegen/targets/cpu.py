@@ -3,8 +3,11 @@ from copy import deepcopy
 from dace.sdfg.state import SDFGState
 import functools
 import itertools
+import platform
 import warnings
 
+import numpy as np
+
 from sympy.functions.elementary.complexes import arg
 
 from dace import data, dtypes, registry, memlet as mmlt, sdfg as sd, subsets, symbolic, Config
@@ -19,9 +22,47 @@ from dace.sdfg import nodes, utils as sdutils
 from dace.sdfg import (ScopeSubgraphView, SDFG, scope_contains_scope, is_array_stream_view, NodeNotExpandedError,
                        dynamic_map_inputs, local_transients)
 from dace.sdfg.scope import is_devicelevel_gpu, is_devicelevel_fpga
-from typing import Union
+from typing import Dict, Iterator, List, Set, Tuple, Union
 from dace.codegen.targets import fpga
 
+#: OpenMP reduction identifiers of supported reduction types
+_REDUCTION_TYPE_TO_OPENMP = {
+    dtypes.ReductionType.Sum: '+',
+    dtypes.ReductionType.Product: '*',
+    dtypes.ReductionType.Min: 'min',
+    dtypes.ReductionType.Max: 'max',
+    dtypes.ReductionType.Logical_And: '&&',
+    dtypes.ReductionType.Logical_Or: '||',
+    dtypes.ReductionType.Bitwise_And: '&',
+    dtypes.ReductionType.Bitwise_Or: '|',
+    dtypes.ReductionType.Bitwise_Xor: '^',
+}
+_BITWISE_REDUCTIONS = {dtypes.ReductionType.Bitwise_And, dtypes.ReductionType.Bitwise_Or, dtypes.ReductionType.Bitwise_Xor}
+#: Element types supported in OpenMP reduction clauses
+_OPENMP_REDUCTION_TYPES = {
+    np.bool_, np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.uint64, np.float32, np.float64
+}
+#: Storage types of data that can be privatized by OpenMP reduction clauses
+_OPENMP_REDUCTION_STORAGES = {
+    dtypes.StorageType.Default, dtypes.StorageType.Register, dtypes.StorageType.CPU_Heap,
+    dtypes.StorageType.CPU_Pinned
+}
+
+
+def _in_parallel_scope(sdfg: SDFG, state: SDFGState, node: nodes.Node) -> bool:
+    """ Returns True if the given node is nested in a parallel scope, including scopes surrounding nested SDFGs. """
+    while True:
+        scope = state.entry_node(node)
+        while scope is not None:
+            if not isinstance(scope, nodes.MapEntry) or scope.map.schedule != dtypes.ScheduleType.Sequential:
+                return True
+            scope = state.entry_node(scope)
+        if sdfg.parent_nsdfg_node is None:
+            return False
+        node = sdfg.parent_nsdfg_node
+        state = sdfg.parent
+        sdfg = sdfg.parent_sdfg
+
 
 @registry.autoregister_params(name='cpu')
 class CPUCodeGen(TargetCodeGenerator):
@@ -55,6 +96,14 @@ class CPUCodeGen(TargetCodeGenerator):
         # Keep track of generated NestedSDG, and the name of the assigned function
         self._generated_nested_sdfg = dict()
 
+        # Keep track of data that is privatized by OpenMP reduction clauses in the currently generated map scopes
+        # (as tuples of SDFG ID and data name), and of the reduced data of each map
+        self._privately_reduced: Set[Tuple[int, str]] = set()
+        self._map_reductions: Dict[nodes.MapEntry, List[Tuple[int, str]]] = {}
+
+        # Keep track of arrays allocated from the transient pool (as tuples of SDFG ID and pointer name)
+        self._pooled: Set[Tuple[int, str]] = set()
+
         # Keeps track of generated connectors, so we know how to access them in
         # nested scopes
         for name, arg_type in self._frame.arglist.items():
@@ -371,9 +420,23 @@ class CPUCodeGen(TargetCodeGenerator):
 
             if not declared:
                 declaration_stream.write(f'{nodedesc.dtype.ctype} *{name};\n', sdfg, state_id, node)
-            allocation_stream.write(
-                "%s = new %s DACE_ALIGN(64)[%s];\n" % (alloc_name, nodedesc.dtype.ctype, cpp.sym2cpp(arrsize)), sdfg,
-                state_id, node)
+            arena = cpp.arena_buffer(sdfg, nodedesc)
+            if arena is not None:
+                # Placed in a buffer shared with other transients (see MemoryPlanning)
+                arena_name = cpp.ptr(arena, sdfg.arrays[arena], sdfg, self._frame)
+                allocation_stream.write(
+                    f'{alloc_name} = reinterpret_cast<{nodedesc.dtype.ctype} *>({arena_name} + '
+                    f'{nodedesc.arena_offset});\n', sdfg, state_id, node)
+            elif self._use_transient_pool(sdfg, state_id, node, nodedesc):
+                allocation_stream.write(
+                    f'{alloc_name} = __state->transient_pool.allocate<{nodedesc.dtype.ctype}>'
+                    f'({cpp.sym2cpp(arrsize)});\n', sdfg, state_id, node)
+                self._pooled.add((sdfg.sdfg_id, alloc_name))
+                self._frame.uses_transient_pool = True
+            else:
+                allocation_stream.write(
+                    "%s = new %s DACE_ALIGN(64)[%s];\n" % (alloc_name, nodedesc.dtype.ctype, cpp.sym2cpp(arrsize)),
+                    sdfg, state_id, node)
             define_var(name, DefinedType.Pointer, ctypedef)
 
             if node.setzero:
@@ -442,6 +505,24 @@ class CPUCodeGen(TargetCodeGenerator):
         else:
             raise NotImplementedError("Unimplemented storage type " + str(nodedesc.storage))
 
+    def _use_transient_pool(self, sdfg: SDFG, state_id: int, node: nodes.AccessNode, nodedesc: data.Data) -> bool:
+        """
+        Returns True if a CPU heap array should be allocated from the transient pool in the SDFG state struct, which
+        is reset at the end of every invocation. Arrays allocated in parallel scopes are excluded to avoid contention.
+        """
+        if not (sdfg.pool_transients or getattr(nodedesc, 'pool', False)):
+            return False
+        if nodedesc.lifetime in (dtypes.AllocationLifetime.Persistent, dtypes.AllocationLifetime.Global):
+            return False
+        if state_id is not None:
+            state = sdfg.node(state_id)
+            if node in state.nodes() and _in_parallel_scope(sdfg, state, node):
+                return False
+        elif sdfg.parent_nsdfg_node is not None and _in_parallel_scope(sdfg.parent_sdfg, sdfg.parent,
+                                                                         sdfg.parent_nsdfg_node):
+            return False
+        return True
+
     def deallocate_array(self, sdfg, dfg, state_id, node, nodedesc, function_stream, callsite_stream):
         arrsize = nodedesc.total_size
         alloc_name = cpp.ptr(node.data, nodedesc, sdfg, self._frame)
@@ -456,7 +537,12 @@ class CPUCodeGen(TargetCodeGenerator):
             return
         elif (nodedesc.storage == dtypes.StorageType.CPU_Heap
               or (nodedesc.storage == dtypes.StorageType.Register and symbolic.issymbolic(arrsize, sdfg.constants))):
-            callsite_stream.write("delete[] %s;\n" % alloc_name, sdfg, state_id, node)
+            pool_key = (sdfg.sdfg_id, cpp.ptr(node.data, nodedesc, sdfg, self._frame))
+            if pool_key in self._pooled:
+                self._pooled.remove(pool_key)
+                callsite_stream.write(f'__state->transient_pool.deallocate({alloc_name});\n', sdfg, state_id, node)
+            elif cpp.arena_buffer(sdfg, nodedesc) is None:  # Arena buffers are deallocated separately
+                callsite_stream.write("delete[] %s;\n" % alloc_name, sdfg, state_id, node)
         elif nodedesc.storage is dtypes.StorageType.CPU_ThreadLocal:
             # Deallocate in each OpenMP thread
             callsite_stream.write(
@@ -735,7 +821,7 @@ class CPUCodeGen(TargetCodeGenerator):
                                         src_strides, dst_strides)
 
             nc = True
-            if memlet.wcr is not None:
+            if memlet.wcr is not None and (sdfg.sdfg_id, memlet.data) not in self._privately_reduced:
                 nc = not cpp.is_write_conflicted(dfg, edge, sdfg_schedule=self._toplevel_schedule)
             if nc:
                 stream.write(
@@ -805,6 +891,8 @@ class CPUCodeGen(TargetCodeGenerator):
         """
 
         redtype = operations.detect_reduction_type(memlet.wcr)
+        if (sdfg.sdfg_id, memlet.data) in self._privately_reduced:
+            nc = True
         atomic = "_atomic" if not nc else ""
         ptrname = cpp.ptr(memlet.data, sdfg.arrays[memlet.data], sdfg, self._frame)
         defined_type, _ = self._dispatcher.defined_vars.get(ptrname)
@@ -1670,6 +1758,81 @@ class CPUCodeGen(TargetCodeGenerator):
 
         self._dispatcher.defined_vars.exit_scope(sdfg)
 
+    def _openmp_reductions(self, sdfg: SDFG, state: SDFGState, node: nodes.MapEntry) -> Iterator[Tuple[str, str]]:
+        """
+        Finds write-conflict resolution outputs of a multicore map that can be privatized with OpenMP reduction
+        clauses, rather than resolved with atomics on every iteration. This is the case for scalars and small arrays
+        of basic types that are only written (with the same recognized reduction type) within the map, if no other
+        parallel scope can write to them concurrently.
+
+        :return: A generator of tuples (data name, OpenMP reduction clause).
+        """
+        max_elements = Config.get('compiler', 'cpu', 'openmp_reduction_size')
+        if max_elements <= 0:
+            return
+        # Visual C++ does not support min/max or array section reductions
+        if platform.system() == 'Windows':
+            return
+        # Reduction results may be overwritten by concurrent writers in surrounding parallel scopes
+        if _in_parallel_scope(sdfg, state, node):
+            return
+
+        exit_node = state.exit_node(node)
+        scope = state.scope_subgraph(node)
+        # Nested parallel maps would write to the privatized data concurrently
+        for n in scope.nodes():
+            if isinstance(n, nodes.EntryNode) and n is not node:
+                if not isinstance(n, nodes.MapEntry) or n.map.schedule != dtypes.ScheduleType.Sequential:
+                    return
+
+        candidates: Dict[str, dtypes.ReductionType] = {}
+        for e in state.out_edges(exit_node):
+            if e.data.is_empty() or e.data.wcr is None or not isinstance(e.dst, nodes.AccessNode):
+                continue
+            candidates[e.data.data] = operations.detect_reduction_type(e.data.wcr)
+
+        # All accesses within the map must be writes with the same reduction type
+        for e in itertools.chain(scope.edges(), state.in_edges(node), state.out_edges(exit_node)):
+            if e.data.data not in candidates:
+                continue
+            if e.data.wcr is None or operations.detect_reduction_type(e.data.wcr) != candidates[e.data.data]:
+                del candidates[e.data.data]
+
+        for dname, redtype in candidates.items():
+            if redtype not in _REDUCTION_TYPE_TO_OPENMP:
+                continue
+            desc = sdfg.arrays[dname]
+            if not isinstance(desc, (data.Scalar, data.Array)) or desc.storage not in _OPENMP_REDUCTION_STORAGES:
+                continue
+            # Only basic arithmetic types (and integers for bitwise operations)
+            if not isinstance(desc.dtype, dtypes.typeclass) or desc.dtype.type not in _OPENMP_REDUCTION_TYPES:
+                continue
+            if redtype in _BITWISE_REDUCTIONS and not issubclass(desc.dtype.type, (np.integer, np.bool_)):
+                continue
+            size = desc.total_size
+            if symbolic.issymbolic(size, sdfg.constants):
+                continue
+            size = int(symbolic.evaluate(size, sdfg.constants))
+            if size > max_elements:
+                continue
+
+            # The data must not be written elsewhere in the state, which may run concurrently
+            if any(e.src is not exit_node for n in state.data_nodes() if n.data == dname for e in state.in_edges(n)):
+                continue
+
+            ptrname = cpp.ptr(dname, desc, sdfg, self._frame)
+            try:
+                defined_type, _ = self._dispatcher.defined_vars.get(ptrname)
+            except KeyError:
+                continue
+            if defined_type == DefinedType.Scalar:
+                var = ptrname
+            elif defined_type == DefinedType.Pointer:
+                var = f'{ptrname}[0:{sym2cpp(size)}]'
+            else:
+                continue
+            yield dname, f'reduction({_REDUCTION_TYPE_TO_OPENMP[redtype]}: {var})'
+
     def _generate_MapEntry(
         self,
         sdfg,
@@ -1728,20 +1891,17 @@ class CPUCodeGen(TargetCodeGenerator):
             if node.map.collapse > 1:
                 map_header += ' collapse(%d)' % node.map.collapse
             # Loop over outputs, add OpenMP reduction clauses to detected cases
-            # TODO: set up register outside loop
-            # exit_node = dfg.exit_node(node)
             reduction_stmts = []
-            # for outedge in dfg.in_edges(exit_node):
-            #    if (isinstance(outedge.src, nodes.CodeNode)
-            #            and outedge.data.wcr is not None):
-            #        redt = operations.detect_reduction_type(outedge.data.wcr)
-            #        if redt != dtypes.ReductionType.Custom:
-            #            reduction_stmts.append('reduction({typ}:{var})'.format(
-            #                typ=_REDUCTION_TYPE_TO_OPENMP[redt],
-            #                var=outedge.src_conn))
-            #            reduced_variables.append(outedge)
-
-            map_header += " %s\n" % ", ".join(reduction_stmts)
+            reduced_data = []
+            for dname, clause in self._openmp_reductions(sdfg, state_dfg, node):
+                reduction_stmts.append(clause)
+                reduced_data.append((sdfg.sdfg_id, dname))
+            if reduced_data:
+                # Writes to privatized data inside the map do not need atomics
+                self._privately_reduced.update(reduced_data)
+                self._map_reductions[node] = reduced_data
+
+            map_header += " %s\n" % " ".join(reduction_stmts)
 
         # TODO: Explicit map unroller
         if node.map.unroll:
@@ -1799,6 +1959,9 @@ class CPUCodeGen(TargetCodeGenerator):
         for _ in map_node.map.range:
             result.write("}", sdfg, state_id, node)
 
+        # Privatized reduction outputs are merged by OpenMP at the end of the loop
+        self._privately_reduced.difference_update(self._map_reductions.pop(map_node, []))
+
         result.write(outer_stream.getvalue())
 
         callsite_stream.write('}', sdfg, state_id, node)
@@ -578,7 +578,13 @@ DACE_EXPORTED void __dace_gpu_set_all_streams({sdfg.name}_t *__state, gpuStream_
                 result_decl.write('%s %s;\n' % (ctypedef, dataname))
             self._dispatcher.defined_vars.add(dataname, DefinedType.Pointer, ctypedef)
 
-            if nodedesc.pool:
+            arena = cpp.arena_buffer(sdfg, nodedesc)
+            if arena is not None:
+                # Placed in a buffer shared with other transients (see MemoryPlanning)
+                arena_name = cpp.ptr(arena, sdfg.arrays[arena], sdfg, self._frame)
+                result_alloc.write(f'{dataname} = reinterpret_cast<{ctypedef}>({arena_name} + '
+                                   f'{nodedesc.arena_offset});\n')
+            elif nodedesc.pool:
                 cudastream = getattr(node, '_cuda_stream', 'nullptr')
                 if cudastream != 'nullptr':
                     cudastream = f'__state->gpu_context->streams[{cudastream}]'
@@ -717,7 +723,8 @@ void __dace_alloc_{location}(uint32_t {size}, dace::GPUStream<{type}, {is_pow2}>
             return
 
         if nodedesc.storage == dtypes.StorageType.GPU_Global:
-            if not nodedesc.pool:  # If pooled, will be freed somewhere else
+            # If pooled or placed in an arena, will be freed somewhere else
+            if not nodedesc.pool and cpp.arena_buffer(sdfg, nodedesc) is None:
                 callsite_stream.write('%sFree(%s);\n' % (self.backend, dataname), sdfg, state_id, node)
         elif nodedesc.storage == dtypes.StorageType.CPU_Pinned:
             callsite_stream.write('%sFreeHost(%s);\n' % (self.backend, dataname), sdfg, state_id, node)
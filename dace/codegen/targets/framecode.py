@@ -41,6 +41,8 @@ class DaCeCodeGenerator(object):
         self._initcode = CodeIOStream()
         self._exitcode = CodeIOStream()
         self.statestruct: List[str] = []
+        # Set by target code generators that allocate arrays from the transient pool (see ``dace::TransientPool``)
+        self.uses_transient_pool = False
         self.environments: List[Any] = []
         self.targets: Set[TargetCodeGenerator] = set()
         self.to_allocate: DefaultDict[Union[SDFG, SDFGState, nodes.EntryNode],
@@ -200,11 +202,17 @@ struct {sdfg.name}_t {{
 
         # Instrumentation preamble
         if len(self._dispatcher.instrumentation) > 2:
-            self.statestruct.append('dace::perf::Report report;')
+            if config.Config.get_bool('instrumentation', 'aggregate'):
+                self.statestruct.append('dace::perf::Report report{true};')
+            else:
+                self.statestruct.append('dace::perf::Report report;')
             # Reset report if written every invocation
             if config.Config.get_bool('instrumentation', 'report_each_invocation'):
                 callsite_stream.write('__state->report.reset();', sdfg)
 
+        if self.uses_transient_pool:
+            self.statestruct.append('dace::TransientPool transient_pool;')
+
         self.generate_fileheader(sdfg, global_stream, 'frame')
 
     def generate_footer(self, sdfg: SDFG, global_stream: CodeIOStream, callsite_stream: CodeIOStream):
@@ -227,6 +235,14 @@ struct {sdfg.name}_t {{
             if instr is not None:
                 instr.on_sdfg_end(sdfg, callsite_stream, global_stream)
 
+        # Release pooled transients, reporting the pool's high-water mark if instrumented
+        if self.uses_transient_pool:
+            if len(self._dispatcher.instrumentation) > 2:
+                callsite_stream.write(
+                    '__state->report.add_counter("Transient pool", "pool", "high_water_mark_bytes", '
+                    '__state->transient_pool.high_water_mark(), 0, 0, -1, -1);', sdfg)
+            callsite_stream.write('__state->transient_pool.reset();', sdfg)
+
         # Instrumentation saving
         if (config.Config.get_bool('instrumentation', 'report_each_invocation')
                 and len(self._dispatcher.instrumentation) > 2):
@@ -461,6 +477,7 @@ DACE_EXPORTED void __dace_exit_{sdfg.name}({sdfg.name}_t *__state)
         fsyms = {}
         reachability = StateReachability().apply_pass(top_sdfg, {})
         access_instances: Dict[int, Dict[str, List[Tuple[SDFGState, nodes.AccessNode]]]] = {}
+        arena_buffers: Dict[int, Set[str]] = {}
         for sdfg in top_sdfg.all_sdfgs_recursive():
             shared_transients[sdfg.sdfg_id] = sdfg.shared_transients(check_toplevel=False)
             fsyms[sdfg.sdfg_id] = self.symbols_and_constants(sdfg)
@@ -470,12 +487,20 @@ DACE_EXPORTED void __dace_exit_{sdfg.name}({sdfg.name}_t *__state)
             instances: Dict[str, List[Tuple[SDFGState, nodes.AccessNode]]] = collections.defaultdict(list)
             array_names = sdfg.arrays.keys(
             )  #set(k for k, v in sdfg.arrays.items() if v.lifetime == dtypes.AllocationLifetime.Scope)
+            # Arena buffers (see MemoryPlanning) are used wherever the arrays placed in them are used
+            arenas = {
+                k: v.arena
+                for k, v in sdfg.arrays.items() if isinstance(v, data.Array) and v.arena in sdfg.arrays
+            }
+            arena_buffers[sdfg.sdfg_id] = set(arenas.values())
             # Iterate topologically to get state-order
             for state in sdfg.topological_sort():
                 for node in state.data_nodes():
                     if node.data not in array_names:
                         continue
                     instances[node.data].append((state, node))
+                    if node.data in arenas:
+                        instances[arenas[node.data]].append((state, nodes.AccessNode(arenas[node.data])))
 
                 # Look in the surrounding edges for usage
                 edge_fsyms: Set[str] = set()
@@ -512,7 +537,16 @@ DACE_EXPORTED void __dace_exit_{sdfg.name}({sdfg.name}_t *__state)
                 access_instances[sdfg.sdfg_id].get(name, [(None, None)])[-1]
 
             # Cases
-            if desc.lifetime is dtypes.AllocationLifetime.Persistent:
+            if name in arena_buffers[sdfg.sdfg_id]:
+                # If unused, skip
+                if first_node_instance is None:
+                    continue
+
+                # Arena buffers are allocated in the beginning of their SDFG, before the arrays placed in them
+                self.to_allocate[sdfg].insert(0, (sdfg, first_state_instance, first_node_instance, True, True, True))
+                self.where_allocated[(sdfg, name)] = sdfg
+                continue
+            elif desc.lifetime is dtypes.AllocationLifetime.Persistent:
                 # Persistent memory is allocated in initialization code and
                 # exists in the library state structure
 
@@ -0,0 +1,221 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+"""
+    A content-addressed cache for compiled object files, used as a CMake compiler launcher
+    (``CMAKE_<LANG>_COMPILER_LAUNCHER``) for generated DaCe translation units.
+
+    Each compiler invocation is keyed by the compiler, its flags (excluding input and output paths), and the
+    preprocessed source. If an object file with the same key was compiled before, it is copied from the cache instead
+    of invoking the compiler. Otherwise, the preprocessed source is compiled, such that the preprocessor only runs
+    once. The key ignores line markers, such that the same code generated into different program folders (e.g., after
+    renaming an SDFG) maps to the same entry. The number of entries is bounded, and the least recently used entries
+    are evicted first. Only host C and C++ compilers are wrapped, so CUDA and other device code is not cached.
+
+    This module is invoked as a standalone script by the build system and only depends on the Python standard library.
+    Usage: ``python object_cache.py <cache folder> <cache size> <compiler> <compiler arguments...>``
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import List, Optional, Tuple
+
+#: Flags that are followed by a path that should not be part of the cache key
+PATH_FLAGS = {'-o', '-MF', '-MT', '-MQ'}
+#: Flags that produce dependency files as a side effect of compilation
+DEPENDENCY_FLAGS = {'-MD', '-MMD'}
+#: Preprocessor flags, whose effect is already captured by the preprocessed source
+PREPROCESSOR_FLAGS = ('-I', '-D', '-U', '-isystem', '-iquote', '-include', '-imacros')
+#: File extensions of compilable sources, along with the language of their preprocessed output
+SOURCE_EXTENSIONS = {'.c': 'cpp-output', '.cc': 'c++-cpp-output', '.cpp': 'c++-cpp-output', '.cxx': 'c++-cpp-output'}
+#: Line markers in preprocessed sources, which refer to source paths
+LINE_MARKER = re.compile(rb'^# \d+.*\n?', re.MULTILINE)
+
+
+def _parse_arguments(args: List[str]) -> Optional[Tuple[str, str, List[str], List[str]]]:
+    """
+    Parses a compiler command line.
+
+    :return: A tuple of (source file, output file, arguments that affect the output, arguments to compile the
+             preprocessed source with), or None if the command line is not a single-source compilation that can be
+             cached.
+    """
+    if '-c' not in args:
+        return None
+    source = output = None
+    key_args = []
+    compile_args = []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in PATH_FLAGS:
+            if arg == '-o':
+                if i + 1 >= len(args):
+                    return None
+                output = args[i + 1]
+                compile_args.extend(args[i:i + 2])
+            i += 2
+            continue
+        if arg in DEPENDENCY_FLAGS:
+            i += 1
+            continue
+        if arg in PREPROCESSOR_FLAGS:
+            i += 2
+            continue
+        if arg.startswith(PREPROCESSOR_FLAGS) or arg.startswith('-Wp,'):
+            i += 1
+            continue
+        if not arg.startswith('-') and os.path.splitext(arg)[1] in SOURCE_EXTENSIONS:
+            if source is not None:  # Multiple sources
+                return None
+            source = arg
+        elif arg == '-x':  # The language of the preprocessed source is set explicitly
+            if i + 1 >= len(args):
+                return None
+            key_args.extend(args[i:i + 2])
+            i += 2
+            continue
+        else:
+            key_args.append(arg)
+            compile_args.append(arg)
+        i += 1
+
+    if source is None or output is None:
+        return None
+    return source, output, key_args, compile_args
+
+
+def _compiler_identity(compiler: str) -> str:
+    """ Returns a string that changes whenever the compiler executable changes. """
+    path = shutil.which(compiler) or compiler
+    try:
+        stat = os.stat(path)
+        return f'{os.path.realpath(path)}:{stat.st_size}:{stat.st_mtime_ns}'
+    except OSError:
+        return path
+
+
+def _preprocess(compiler: str, args: List[str]) -> Optional[bytes]:
+    """
+    Runs the preprocessor on the compiler command line. Dependency file flags are kept, such that dependency files are
+    generated even if the compiler itself is not invoked.
+
+    :return: The preprocessed source (with line markers), or None if preprocessing failed.
+    """
+    ppargs = []
+    i = 0
+    while i < len(args):
+        if args[i] == '-o':
+            i += 2
+            continue
+        if args[i] != '-c':
+            ppargs.append(args[i])
+        i += 1
+    try:
+        result = subprocess.run([compiler, '-E'] + ppargs, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def _compile_preprocessed(compiler: str, source: str, output: str, compile_args: List[str],
+                          preprocessed: bytes) -> int:
+    """
+    Compiles an already preprocessed source. The line markers it contains keep diagnostics and debug information
+    pointing to the original source files.
+
+    :return: The return code of the compilation.
+    """
+    fd, ppname = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output)), suffix='.ii')
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(preprocessed)
+        language = SOURCE_EXTENSIONS[os.path.splitext(source)[1]]
+        return subprocess.call([compiler] + compile_args + ['-x', language, ppname])
+    finally:
+        os.remove(ppname)
+
+
+def _evict(cache_folder: str, size: int) -> None:
+    """ Removes the least recently used entries until at most ``size`` entries remain in the cache. """
+    entries = []
+    for subfolder in os.scandir(cache_folder):
+        if not subfolder.is_dir():
+            continue
+        for entry in os.scandir(subfolder.path):
+            if entry.name.endswith('.o'):
+                try:
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+                except FileNotFoundError:  # Evicted concurrently
+                    pass
+    if len(entries) <= size:
+        return
+    entries.sort()
+    for _, path in entries[:len(entries) - size]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:  # Evicted concurrently
+            pass
+
+
+def cached_compile(cache_folder: str, compiler: str, args: List[str], size: Optional[int] = None) -> int:
+    """
+    Compiles a translation unit, reusing a previously compiled object file with the same key if it exists.
+
+    :param cache_folder: The folder containing the cached object files.
+    :param compiler: The compiler executable.
+    :param args: The compiler arguments.
+    :param size: The maximal number of entries in the cache, or None for an unbounded cache.
+    :return: The return code of the compilation.
+    """
+    parsed = _parse_arguments(args)
+    preprocessed = _preprocess(compiler, args) if parsed is not None else None
+    if preprocessed is None:
+        # Cannot cache, run the compiler as-is
+        return subprocess.call([compiler] + args)
+    source, output, key_args, compile_args = parsed
+
+    key = hashlib.sha256()
+    key.update(_compiler_identity(compiler).encode('utf-8'))
+    key.update('\0'.join(key_args).encode('utf-8'))
+    key.update(os.path.splitext(source)[1].encode('utf-8'))
+    key.update(b'\0')
+    key.update(LINE_MARKER.sub(b'', preprocessed))
+    digest = key.hexdigest()
+    entry = os.path.join(cache_folder, digest[:2], digest + '.o')
+
+    try:
+        shutil.copyfile(entry, output)
+        # Mark entry as recently used
+        os.utime(entry)
+        return 0
+    except FileNotFoundError:  # Not cached, or evicted concurrently
+        pass
+
+    retcode = _compile_preprocessed(compiler, source, output, compile_args, preprocessed)
+    if retcode == 0 and os.path.isfile(output):
+        # Store atomically, such that concurrent builds never read partial entries
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        fd, tmpname = tempfile.mkstemp(dir=os.path.dirname(entry), suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(output, tmpname)
+            os.replace(tmpname, entry)
+        except OSError:
+            if os.path.exists(tmpname):
+                os.remove(tmpname)
+        if size is not None:
+            _evict(cache_folder, size)
+    return retcode
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 4:
+        print('USAGE: object_cache.py <cache folder> <cache size> <compiler> [compiler arguments...]')
+        sys.exit(1)
+    sys.exit(cached_compile(sys.argv[1], sys.argv[3], sys.argv[4:], int(sys.argv[2])))
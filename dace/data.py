@@ -121,6 +121,12 @@ def create_datadescriptor(obj, no_custom_desc=False):
         # Cannot determine return value/argument types from function object
         return Scalar(dtypes.callback(None))
 
+    # Objects that export DLPack or a typed buffer are described by their (zero-copy) array view. Raw bytes are
+    # rejected, since their element type is unknown
+    array = dtypes.buffer_to_array(obj, allow_bytes=False)
+    if array is not None:
+        return create_datadescriptor(array, no_custom_desc)
+
     raise TypeError(f'Could not create a DaCe data descriptor from object {obj}. '
                     'If this is a custom object, consider creating a `__descriptor__` '
                     'adaptor method to the type hint or object itself.')
@@ -526,6 +532,12 @@ class Array(Data):
                         'If False, the array must not be None. If option is not set, '
                         'it is inferred by other properties and the OptionalArrayInference pass.')
     pool = Property(dtype=bool, default=False, desc='Hint to the allocator that using a memory pool is preferred')
+    arena = Property(dtype=str,
+                     default=None,
+                     allow_none=True,
+                     desc='If set, the array is not allocated separately, but placed in the given transient buffer '
+                     '(see the MemoryPlanning pass)')
+    arena_offset = Property(dtype=int, default=0, desc='Offset (in bytes) of the array in its arena buffer')
 
     def __init__(self,
                  dtype,
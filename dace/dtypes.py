@@ -1507,6 +1507,41 @@ def is_array(obj: Any) -> bool:
     return False
 
 
+# DLPack device type of CUDA memory
+_DLPACK_CUDA = 2
+
+
+def buffer_to_array(obj: Any, allow_bytes: bool = True) -> Any:
+    """
+    Returns a zero-copy array view of an object that exports DLPack (``__dlpack__``) or the Python buffer protocol
+    (e.g., ``memoryview``, ``array.array``, ``mmap.mmap``, or Arrow buffers), such that it can be used wherever
+    objects that implement the array interface (see ``is_array``) are supported. Read-only buffers result in
+    read-only arrays, and device memory exported through DLPack results in CuPy arrays.
+
+    :param obj: The given object.
+    :param allow_bytes: If False, one-dimensional byte buffers without an element type (e.g., ``bytes``,
+                        ``bytearray``, or a plain ``memoryview`` of them) are not converted.
+    :return: A NumPy (or CuPy) array sharing the memory of the object, or None if the object exports neither DLPack
+             nor the buffer protocol (or is an untyped byte buffer and ``allow_bytes`` is False).
+    """
+    if hasattr(obj, '__dlpack__'):
+        try:
+            if hasattr(obj, '__dlpack_device__') and obj.__dlpack_device__()[0] == _DLPACK_CUDA:
+                import cupy
+                return cupy.from_dlpack(obj)
+            return numpy.from_dlpack(obj)
+        except (AttributeError, BufferError, ImportError, RuntimeError, TypeError):
+            # Older NumPy versions or unsupported (e.g., read-only) DLPack exports, try the buffer protocol
+            pass
+    try:
+        view = memoryview(obj)
+    except TypeError:
+        return None
+    if not allow_bytes and view.ndim <= 1 and view.format.lstrip('@=<>!') in ('B', 'b', 'c'):
+        return None
+    return numpy.asarray(view)
+
+
 def is_gpu_array(obj: Any) -> bool:
     """
     Returns True if an object is a GPU array, i.e., implements the 
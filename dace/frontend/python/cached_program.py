@@ -1,9 +1,26 @@
 # Copyright 2019-2021 ETH Zurich and the DaCe authors. All rights reserved.
 """ Precompiled DaCe program/method cache. """
 
+import atexit
 from collections import OrderedDict
+import contextlib
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Optional, Set, Tuple
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy
 
 import dace
 from dace import config
@@ -48,6 +65,30 @@ def _make_sortable(obj):
     except TypeError:
         return repr(obj)
 
+
+# Types whose data descriptor is determined by the type alone
+_SCALAR_TYPES = (bool, int, float, complex, type(None))
+
+
+def argument_fingerprint(value: Any) -> Optional[Hashable]:
+    """
+    Returns a fingerprint of an argument value that determines its data descriptor (i.e., type, data type, shape and
+    strides), without creating the descriptor.
+
+    :param value: The argument value.
+    :return: A hashable fingerprint, or None if the value is not supported (e.g., lists, callables, or objects with
+             custom descriptors), in which case the data descriptor has to be created.
+    """
+    vtype = type(value)
+    if vtype is numpy.ndarray:
+        return (vtype, value.dtype, value.shape, value.strides)
+    if vtype in _SCALAR_TYPES:
+        return vtype
+    if isinstance(value, numpy.generic):
+        return (vtype, value.dtype)
+    return None
+
+
 @dataclass
 class ProgramCacheKey:
     """ A key object representing a single instance of a DaCe program. """
@@ -69,9 +110,10 @@ class ProgramCacheKey:
             tuple((k, _make_hashable(v)) for k, v in sorted(closure_constants.items())),
             tuple(sorted(_make_sortable(a) for a in specified_args)),
         )
+        self._hash = hash(self._tuple)
 
     def __hash__(self) -> int:
-        return hash(self._tuple)
+        return self._hash
 
     def __eq__(self, o: 'ProgramCacheKey') -> bool:
         return self._tuple == o._tuple
@@ -87,6 +129,17 @@ class ProgramCacheEntry:
     compiled_sdfg: 'dace.codegen.compiled_sdfg.CompiledSDFG'
 
 
+@dataclass
+class ProgramDispatchEntry:
+    """
+    A value object representing a fast dispatch entry of a DaCe program, which maps a fingerprint of the call-site
+    arguments and closure to a program cache key. Also contains the symbol values inferred from the argument shapes
+    and strides (which are part of the fingerprint), once known.
+    """
+    key: ProgramCacheKey
+    symbols: Optional[Dict[str, Any]] = None
+
+
 class DaceProgramCache:
     def __init__(self, evaluate: EvalCallback, size: Optional[int] = None) -> None:
         """ 
@@ -99,10 +152,12 @@ class DaceProgramCache:
         self.eval_callback = evaluate
         self.size = size or config.Config.get('frontend', 'cache_size')
         self.cache: OrderedDict[ProgramCacheKey, ProgramCacheEntry] = LimitedSizeDict(size_limit=size)
+        self.dispatch: OrderedDict[Hashable, ProgramDispatchEntry] = LimitedSizeDict(size_limit=self.size)
 
     def clear(self):
         """ Clears the program cache. """
         self.cache.clear()
+        self.dispatch.clear()
 
     def _evaluate_constants(self, constants: Set[str], extra_constants: Dict[str, Any] = None) -> ConstantTypes:
         # Evaluate closure constants at call time
@@ -146,3 +201,306 @@ class DaceProgramCache:
     def pop(self) -> None:
         """ Remove the first entry from the cache. """
         self.cache.popitem(last=False)
+
+    def add_dispatch(self, fingerprint: Hashable, key: ProgramCacheKey) -> None:
+        """ Maps a fingerprint of call-site arguments and closure to an existing program cache entry. """
+        self.dispatch[fingerprint] = ProgramDispatchEntry(key)
+
+    def get_dispatch(self, fingerprint: Hashable) -> Optional[Tuple[ProgramDispatchEntry, ProgramCacheEntry]]:
+        """
+        Returns the dispatch entry of the given fingerprint and its compiled program cache entry, or None if the
+        fingerprint is unknown or its program is no longer cached or not compiled.
+        """
+        dispatch = self.dispatch.get(fingerprint)
+        if dispatch is None:
+            return None
+        entry = self.cache.get(dispatch.key)
+        if entry is None or entry.compiled_sdfg is None:
+            return None
+        return dispatch, entry
+
+
+def _source_of(obj: Any) -> str:
+    """ Returns the source code of a function or SDFG-convertible object, or a representation of its bytecode. """
+    if isinstance(obj, SDFG):
+        return obj.hash_sdfg()
+    func = getattr(obj, 'f', obj)
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        code = getattr(func, '__code__', None)
+        if code is not None:
+            return repr((code.co_code, code.co_consts, code.co_names))
+        return repr(obj)
+
+
+class PersistentProgramCache:
+    """
+    An on-disk cache of compiled DaCe programs, shared between processes.
+
+    Entries are keyed by a fingerprint of the program cache key, the source code of the program and the programs it
+    calls, the configuration, and the DaCe version. Each entry is stored in the layout of a build folder (SDFG in
+    ``program.sdfg`` and the shared library in ``build``), see ``dace.sdfg.utils.load_precompiled_sdfg``.
+    The number of entries is bounded, and the least recently used entries are evicted first. Lookups only take a
+    shared file lock, while modifications of the cache take an exclusive one. Usage information and statistics
+    from lookups are accumulated in memory and written to the index in batches (see ``flush``).
+    """
+
+    #: Minimal time (in seconds) between two index updates caused by lookups.
+    index_update_interval = 10.0
+
+    def __init__(self, folder: Optional[str] = None, size: Optional[int] = None) -> None:
+        """
+        Initializes a persistent program cache.
+
+        :param folder: The folder to store the cache in (if not given, uses the default value from the
+                       configuration).
+        :param size: The maximal number of cache entries (if not given, uses the default value from the
+                     configuration).
+        """
+        self.folder = folder or PersistentProgramCache.default_folder()
+        self.size = size if size is not None else int(config.Config.get('frontend', 'persistent_cache_size'))
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.folder, exist_ok=True)
+
+        # Lookup results that were not yet written to the index
+        self._pending_usage: Dict[str, float] = {}
+        self._pending_invalid: Set[str] = set()
+        self._pending_hits = 0
+        self._pending_misses = 0
+        self._last_flush = time.time()
+        atexit.register(self._flush_at_exit)
+
+    @staticmethod
+    def default_folder() -> str:
+        """ Returns the persistent cache folder set in the configuration. """
+        return (config.Config.get('frontend', 'persistent_cache_folder')
+                or os.path.join(config.Config.get('default_build_folder'), 'persistent'))
+
+    @contextlib.contextmanager
+    def _lock(self, shared: bool = False, blocking: bool = True):
+        """
+        Locks the cache folder. Yields True if the lock was acquired, or False if ``blocking`` is False and the lock
+        is held by another process. Shared locks are exclusive on platforms without ``fcntl``.
+        """
+        with open(os.path.join(self.folder, '.lock'), 'a+') as fp:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fp.fileno(), (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) |
+                                (0 if blocking else fcntl.LOCK_NB))
+                else:
+                    msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            except OSError:
+                if blocking:
+                    raise
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+                else:
+                    fp.seek(0)
+                    msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read_index(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.folder, 'index.json'), 'r') as fp:
+                return json.load(fp)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'entries': {}, 'hits': 0, 'misses': 0}
+
+    def _write_index(self, index: Dict[str, Any]) -> None:
+        # Write atomically, so that readers never observe a partial index
+        fd, tmpname = tempfile.mkstemp(dir=self.folder, suffix='.json')
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(index, fp)
+        os.replace(tmpname, os.path.join(self.folder, 'index.json'))
+
+    def fingerprint(self, program: 'dace.frontend.python.parser.DaceProgram', key: ProgramCacheKey) -> Optional[str]:
+        """
+        Computes the persistent cache fingerprint of a program instance.
+
+        :param program: The DaCe program (after its closure was resolved).
+        :param key: The program cache key of the instance.
+        :return: A hexadecimal digest string, or None if the instance cannot be identified across processes (e.g.,
+                 if its closure contains objects whose representation depends on their memory address).
+        """
+        sources = [_source_of(program.f)]
+        if program.resolver is not None:
+            sources.extend(_source_of(obj) for _, obj in program.resolver.closure_sdfgs.values())
+        envvars = sorted((k, v) for k, v in os.environ.items() if k.startswith('DACE_'))
+        contents = repr((dace.__version__, program.name, sources, key._tuple,
+                         json.dumps(config.Config._config, sort_keys=True, default=str), envvars))
+        if ' at 0x' in contents:
+            return None
+        return hashlib.sha256(contents.encode('utf-8')).hexdigest()
+
+    def load(self, fingerprint: str) -> Optional['dace.codegen.compiled_sdfg.CompiledSDFG']:
+        """
+        Loads a compiled program from the cache.
+
+        :param fingerprint: The program instance fingerprint (see ``fingerprint``).
+        :return: The compiled SDFG object, or None if not found in the cache.
+        """
+        from dace.codegen import compiler  # Avoid import loop
+
+        folder = os.path.join(self.folder, fingerprint)
+        result = None
+        # A shared lock prevents entries from being evicted while they are loaded
+        with self._lock(shared=True):
+            index = self._read_index()
+            if fingerprint in index['entries']:
+                try:
+                    sdfg = SDFG.from_file(os.path.join(folder, 'program.sdfg'))
+                    result = compiler.get_program_handle(compiler.get_binary_name(folder, sdfg.name), sdfg)
+                except (OSError, RuntimeError):
+                    # Entry was removed or corrupted externally
+                    self._pending_invalid.add(fingerprint)
+
+        if result is None:
+            self.misses += 1
+            self._pending_misses += 1
+        else:
+            self.hits += 1
+            self._pending_hits += 1
+            self._pending_usage[fingerprint] = time.time()
+
+        if time.time() - self._last_flush >= self.index_update_interval:
+            self.flush(blocking=False)
+
+        return result
+
+    def flush(self, blocking: bool = True) -> None:
+        """
+        Writes the usage information and statistics accumulated by lookups to the index.
+
+        :param blocking: If False, skips the update if the cache is currently locked by another process.
+        """
+        if not (self._pending_usage or self._pending_invalid or self._pending_hits or self._pending_misses):
+            return
+        with self._lock(blocking=blocking) as locked:
+            if not locked:
+                return
+            index = self._read_index()
+            self._apply_pending(index)
+            self._write_index(index)
+
+    def _flush_at_exit(self) -> None:
+        try:
+            self.flush()
+        except OSError:  # Cache folder was removed
+            pass
+
+    def _apply_pending(self, index: Dict[str, Any]) -> None:
+        """ Applies the pending lookup results to the given index. Must be called with an exclusive lock. """
+        entries = index['entries']
+        for fingerprint, last_used in self._pending_usage.items():
+            if fingerprint in entries:
+                entries[fingerprint]['last_used'] = max(entries[fingerprint]['last_used'], last_used)
+        for fingerprint in self._pending_invalid:
+            if fingerprint in entries:
+                del entries[fingerprint]
+                shutil.rmtree(os.path.join(self.folder, fingerprint), ignore_errors=True)
+        index['hits'] += self._pending_hits
+        index['misses'] += self._pending_misses
+
+        self._pending_usage.clear()
+        self._pending_invalid.clear()
+        self._pending_hits = 0
+        self._pending_misses = 0
+        self._last_flush = time.time()
+
+    def store(self, fingerprint: str, compiled_sdfg: 'dace.codegen.compiled_sdfg.CompiledSDFG') -> None:
+        """
+        Stores a compiled program in the cache, evicting least recently used entries if necessary.
+
+        :param fingerprint: The program instance fingerprint (see ``fingerprint``).
+        :param compiled_sdfg: The compiled SDFG object to store.
+        """
+        from dace.codegen import compiler  # Avoid import loop
+
+        sdfg = compiled_sdfg.sdfg
+        binary = compiler.get_binary_name(sdfg.build_folder, sdfg.name)
+        stub = os.path.join(os.path.dirname(binary),
+                            'libdacestub_%s.%s' % (sdfg.name, config.Config.get('compiler', 'library_extension')))
+
+        # Prepare entry in a temporary folder outside the lock
+        tmpfolder = tempfile.mkdtemp(dir=self.folder, prefix='.tmp_')
+        try:
+            sdfg.save(os.path.join(tmpfolder, 'program.sdfg'), hash=False)
+            os.makedirs(os.path.join(tmpfolder, 'build'))
+            shutil.copyfile(binary, compiler.get_binary_name(tmpfolder, sdfg.name))
+            shutil.copyfile(stub, os.path.join(tmpfolder, 'build', os.path.basename(stub)))
+        except OSError:
+            shutil.rmtree(tmpfolder, ignore_errors=True)
+            return
+        size = sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(tmpfolder) for f in files)
+
+        folder = os.path.join(self.folder, fingerprint)
+        with self._lock():
+            index = self._read_index()
+            # Apply pending lookup results first, so that eviction sees recent usage
+            self._apply_pending(index)
+            if fingerprint in index['entries']:  # Another process stored the same entry
+                shutil.rmtree(tmpfolder, ignore_errors=True)
+                self._write_index(index)
+                return
+
+            shutil.rmtree(folder, ignore_errors=True)
+            os.replace(tmpfolder, folder)
+            index['entries'][fingerprint] = {'name': sdfg.name, 'size': size, 'last_used': time.time()}
+
+            # Evict least recently used entries
+            entries = index['entries']
+            while len(entries) > self.size:
+                oldest = min(entries, key=lambda k: entries[k]['last_used'])
+                del entries[oldest]
+                shutil.rmtree(os.path.join(self.folder, oldest), ignore_errors=True)
+
+            self._write_index(index)
+
+    def clear(self) -> None:
+        """ Removes all entries from the persistent cache. """
+        with self._lock():
+            index = self._read_index()
+            for fingerprint in index['entries']:
+                shutil.rmtree(os.path.join(self.folder, fingerprint), ignore_errors=True)
+            self._apply_pending(index)
+            index['entries'] = {}
+            self._write_index(index)
+
+    def statistics(self) -> Dict[str, int]:
+        """
+        Returns cache statistics: hits and misses of this object, total hits and misses across all processes, the
+        number of entries, and their total size in bytes.
+        """
+        self.flush()
+        with self._lock(shared=True):
+            index = self._read_index()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'total_hits': index['hits'],
+            'total_misses': index['misses'],
+            'entries': len(index['entries']),
+            'size': sum(e['size'] for e in index['entries'].values()),
+        }
+
+
+_persistent_caches: Dict[str, PersistentProgramCache] = {}
+
+
+def get_persistent_cache() -> Optional[PersistentProgramCache]:
+    """
+    Returns the persistent program cache of the configured folder, or None if the persistent cache is disabled
+    (see the ``frontend.persistent_cache`` configuration entry).
+    """
+    if not config.Config.get_bool('frontend', 'persistent_cache'):
+        return None
+    folder = os.path.abspath(PersistentProgramCache.default_folder())
+    if folder not in _persistent_caches:
+        _persistent_caches[folder] = PersistentProgramCache(folder)
+    return _persistent_caches[folder]
@@ -30,6 +30,8 @@ def program(*args,
             regenerate_code: bool = True,
             recompile: bool = True,
             constant_functions=False,
+            compile: str = 'blocking',
+            reuse_return_values: bool = False,
             **kwargs) -> Callable[..., parser.DaceProgram]:
     ...
 
@@ -43,6 +45,8 @@ def program(f: F,
             regenerate_code: bool = True,
             recompile: bool = True,
             constant_functions=False,
+            compile: str = 'blocking',
+            reuse_return_values: bool = False,
             **kwargs) -> Callable[..., parser.DaceProgram]:
     """
     Entry point to a data-centric program. For methods and ``classmethod``s, use
@@ -64,6 +68,12 @@ def program(f: F,
                                not depend on internal variables are constant.
                                This will hardcode their return values into the
                                resulting program.
+    :param compile: Compilation mode. If ``'blocking'`` (default), calls wait for the program to compile. If
+                    ``'background'``, the program is compiled in a background thread and calls run the function in
+                    Python mode until compilation completes (see ``DaceProgram.compile_async``).
+    :param reuse_return_values: If True, calls write return values into the arrays returned by the previous call (with
+                                the same argument types), rather than allocating new arrays. Use this to avoid
+                                allocations in repeated calls if previous return values are no longer needed.
     :note: If arguments are defined with type hints, the program can be compiled
            ahead-of-time with ``.compile()``.
     """
@@ -78,7 +88,9 @@ def program(f: F,
                               constant_functions,
                               recreate_sdfg=recreate_sdfg,
                               regenerate_code=regenerate_code,
-                              recompile=recompile)
+                              recompile=recompile,
+                              compile_mode=compile,
+                              reuse_return_values=reuse_return_values)
 
 
 function = program
@@ -94,6 +106,8 @@ def method(*args,
            auto_optimize=False,
            device=dtypes.DeviceType.CPU,
            constant_functions=False,
+           compile: str = 'blocking',
+           reuse_return_values: bool = False,
            **kwargs) -> parser.DaceProgram:
     ...
 
@@ -107,6 +121,8 @@ def method(f: F,
            regenerate_code: bool = True,
            recompile: bool = True,
            constant_functions=False,
+           compile: str = 'blocking',
+           reuse_return_values: bool = False,
            **kwargs) -> parser.DaceProgram:
     """ 
     Entry point to a data-centric program that is a method or  a ``classmethod``. 
@@ -127,6 +143,12 @@ def method(f: F,
                                not depend on internal variables are constant.
                                This will hardcode their return values into the
                                resulting program.
+    :param compile: Compilation mode. If ``'blocking'`` (default), calls wait for the program to compile. If
+                    ``'background'``, the program is compiled in a background thread and calls run the function in
+                    Python mode until compilation completes (see ``DaceProgram.compile_async``).
+    :param reuse_return_values: If True, calls write return values into the arrays returned by the previous call (with
+                                the same argument types), rather than allocating new arrays. Use this to avoid
+                                allocations in repeated calls if previous return values are no longer needed.
     :note: If arguments are defined with type hints, the program can be compiled
            ahead-of-time with ``.compile()``.    
     """
@@ -152,7 +174,9 @@ def method(f: F,
                                       recreate_sdfg=recreate_sdfg,
                                       regenerate_code=regenerate_code,
                                       recompile=recompile,
-                                      method=True)
+                                      compile_mode=compile,
+                                      method=True,
+                                      reuse_return_values=reuse_return_values)
             prog.methodobj = obj
             self.wrapped[objid] = prog
             return prog
@@ -169,7 +193,9 @@ def method(f: F,
                                           recreate_sdfg=recreate_sdfg,
                                           regenerate_code=regenerate_code,
                                           recompile=recompile,
-                                          method=False)
+                                          compile_mode=compile,
+                                          method=False,
+                                          reuse_return_values=reuse_return_values)
                 self.wrapped[None] = prog
             else:
                 prog = self.wrapped[None]
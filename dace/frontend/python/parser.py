@@ -1,13 +1,15 @@
 # Copyright 2019-2021 ETH Zurich and the DaCe authors. All rights reserved.
 """ DaCe Python parsing functionality and entry point to Python frontend. """
 import ast
+import concurrent.futures
 from dataclasses import dataclass
 import inspect
 import itertools
 import copy
 import os
 import sympy
-from typing import Any, Callable, Dict, List, Optional, Set, Sequence, Tuple, Union
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Sequence, Tuple, Union
 import warnings
 
 from dace import symbolic, data, dtypes
@@ -16,6 +18,9 @@ from dace.frontend.python import (newast, common as pycommon, cached_program, pr
 from dace.sdfg import SDFG
 from dace.data import create_datadescriptor, Data
 
+if TYPE_CHECKING:
+    import dace.codegen.compiled_sdfg
+
 try:
     from typing import get_origin, get_args
 except ImportError:
@@ -44,6 +49,13 @@ def _get_cell_contents_or_none(cell):
         return None
 
 
+def _get_free_variables(f) -> Dict[str, Any]:
+    """ Retrieves the free variables (i.e., locals captured in a closure) of the function ``f``. """
+    if f.__closure__ is None:
+        return {}
+    return {k: v for k, v in zip(f.__code__.co_freevars, [_get_cell_contents_or_none(x) for x in f.__closure__])}
+
+
 def _get_locals_and_globals(f):
     """ Retrieves a list of local and global variables for the function ``f``.
         This is used to retrieve variables around and defined before  @dace.programs for adding symbols and constants.
@@ -52,14 +64,22 @@ def _get_locals_and_globals(f):
     # Update globals, then locals
     result.update(f.__globals__)
     # grab the free variables (i.e. locals)
-    if f.__closure__ is not None:
-        result.update(
-            {k: v
-             for k, v in zip(f.__code__.co_freevars, [_get_cell_contents_or_none(x) for x in f.__closure__])})
+    result.update(_get_free_variables(f))
 
     return result
 
 
+def _write_output_buffers(result: Any, out: Any) -> Any:
+    """ Copies the return values of a program called in Python mode into the given output buffers. """
+    if not isinstance(out, (tuple, list)):
+        out, result = (out, ), (result, )
+    for buffer, value in zip(out, result):
+        if buffer is not None:
+            buffer[...] = value
+    result = tuple(value if buffer is None else buffer for buffer, value in zip(out, result))
+    return result[0] if len(result) == 1 else result
+
+
 def infer_symbols_from_datadescriptor(sdfg: SDFG,
                                       args: Dict[str, Any],
                                       exclude: Optional[Set[str]] = None) -> Dict[str, Any]:
@@ -146,9 +166,14 @@ class DaceProgram(pycommon.SDFGConvertible):
                  recreate_sdfg: bool = True,
                  regenerate_code: bool = True,
                  recompile: bool = True,
-                 method: bool = False):
+                 compile_mode: str = 'blocking',
+                 method: bool = False,
+                 reuse_return_values: bool = False):
         from dace.codegen import compiled_sdfg  # Avoid import loops
 
+        if compile_mode not in ('blocking', 'background'):
+            raise ValueError(f'Invalid compilation mode "{compile_mode}", expected "blocking" or "background"')
+
         self.f = f
         self.dec_args = args
         self.dec_kwargs = kwargs
@@ -166,6 +191,10 @@ class DaceProgram(pycommon.SDFGConvertible):
         self.recreate_sdfg = recreate_sdfg
         self.regenerate_code = regenerate_code
         self.recompile = recompile
+        self.compile_mode = compile_mode
+        #: If True, calls reuse the arrays returned by the previous call (with the same argument types) instead of
+        #: allocating new return values
+        self.reuse_return_values = reuse_return_values
 
         self.global_vars = _get_locals_and_globals(f)
         self.signature = inspect.signature(f)
@@ -188,6 +217,14 @@ class DaceProgram(pycommon.SDFGConvertible):
         self.constant_args = set(pname for pname, pval in self.signature.parameters.items()
                                  if pval.annotation is dtypes.compiletime)
 
+        # Programs with variable-length arguments are always dispatched through full program cache keys
+        self._fast_dispatch = Config.get_bool('frontend', 'fast_dispatch') and not any(
+            pval.kind in (pval.VAR_POSITIONAL, pval.VAR_KEYWORD) for pval in self.signature.parameters.values())
+
+        # Output buffers can be given in the ``out`` keyword argument, unless the function accepts it
+        self._out_argument = 'out' not in self.signature.parameters and not any(
+            pval.kind is pval.VAR_KEYWORD for pval in self.signature.parameters.values())
+
         if self.argnames is None:
             self.argnames = []
 
@@ -197,6 +234,10 @@ class DaceProgram(pycommon.SDFGConvertible):
         # the same unless the argument types change
         self.closure_array_keys: Set[str] = set()
         self.closure_constant_keys: Set[str] = set()
+        # Programs that are compiling in the background, mapped to their SDFG and compilation future
+        self._pending: Dict[cached_program.ProgramCacheKey, Tuple[SDFG, concurrent.futures.Future]] = {}
+        # Serializes program cache lookups and compilation of concurrent calls
+        self._lock = threading.RLock()
 
     # A modified version of deepcopy that reuses the closure as-is
     def __deepcopy__(self, memo):
@@ -209,6 +250,10 @@ class DaceProgram(pycommon.SDFGConvertible):
                 setattr(result, k, v)
             elif k == 'global_vars':
                 setattr(result, k, copy.copy(v))
+            elif k == '_pending':  # Background compilations are not copied
+                setattr(result, k, {})
+            elif k == '_lock':
+                setattr(result, k, threading.RLock())
             else:
                 setattr(result, k, copy.deepcopy(v, memo))
         return result
@@ -277,6 +322,46 @@ class DaceProgram(pycommon.SDFGConvertible):
 
         return sdfg.compile(validate=self.validate)
 
+    def compile_async(self, *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Parses a DaCe program and compiles it in a background thread. Subsequent calls with arguments of the same
+        types use the compiled program once compilation completes. Until then, calls wait for compilation to complete,
+        or run the function in Python mode if the program was created with ``compile='background'``.
+
+        :param args: Arguments (or argument examples) to specialize the program for.
+        :param kwargs: Keyword arguments (or argument examples) to specialize the program for.
+        :return: A future that resolves to the compiled program.
+        """
+        # Update global variables with current closure
+        self.global_vars = _get_locals_and_globals(self.f)
+
+        # Move "self" from an argument into the closure
+        if self.methodobj is not None:
+            self.global_vars[self.objname] = self.methodobj
+
+        argtypes, arg_mapping, constant_args, specified = self._get_type_annotations(args, kwargs)
+        self.global_vars.update(constant_args)
+
+        sdfg = self._parse(args, kwargs)
+        if self.recreate_sdfg:
+            # Invoke auto-optimization as necessary
+            if Config.get_bool('optimizer', 'autooptimize') or self.autoopt:
+                kwargs.update(arg_mapping)
+                sdfg = self.auto_optimize(sdfg, symbols=self._create_sdfg_args(sdfg, args, kwargs))
+                sdfg.simplify()
+
+        cachekey = self._cache.make_key(argtypes, specified, self.closure_array_keys, self.closure_constant_keys,
+                                        constant_args)
+        future = sdfg.compile_async(validate=self.validate)
+        self._pending[cachekey] = (sdfg, future)
+        return future
+
+    def _call_python(self, args, kwargs):
+        """ Calls the program function in Python mode. """
+        if self.methodobj is not None:
+            return self.f(self.methodobj, *args, **kwargs)
+        return self.f(*args, **kwargs)
+
     @property
     def methodobj(self) -> Any:
         return self._methodobj
@@ -368,7 +453,11 @@ class DaceProgram(pycommon.SDFGConvertible):
             return self.closure_arg_mapping[arg]()
         return eval(arg, self.global_vars, extra_constants)
 
-    def _create_sdfg_args(self, sdfg: SDFG, args: Tuple[Any], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_sdfg_args(self,
+                          sdfg: SDFG,
+                          args: Tuple[Any],
+                          kwargs: Dict[str, Any],
+                          dispatch: Optional[cached_program.ProgramDispatchEntry] = None) -> Dict[str, Any]:
         # Start with default arguments, then add other arguments
         result = {**self.default_args}
         # Reconstruct keyword arguments
@@ -381,16 +470,116 @@ class DaceProgram(pycommon.SDFGConvertible):
         # Update closure with respect to callback mapping
         result.update({k: result[v] for k, v in sdfg.callback_mapping.items()})
 
-        # Update arguments with symbols in data shapes
-        result.update(
-            infer_symbols_from_datadescriptor(
+        # Update arguments with symbols in data shapes (which are fixed for a dispatch entry)
+        if dispatch is not None and dispatch.symbols is not None:
+            symbols = dispatch.symbols
+        else:
+            symbols = infer_symbols_from_datadescriptor(
                 sdfg, {k: create_datadescriptor(v)
-                       for k, v in result.items() if k not in self.constant_args}))
+                       for k, v in result.items() if k not in self.constant_args})
+            if dispatch is not None:
+                dispatch.symbols = symbols
+        result.update(symbols)
         return result
 
+    def _dispatch_fingerprint(self, args: Tuple[Any], kwargs: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+        """
+        Computes a fingerprint of the call-site arguments and the current closure that determines the program cache
+        key, without creating data descriptors. Compile-time arguments only contribute to the fingerprint through the
+        closure constants that use them (as in the program cache key).
+
+        :param args: The call-site arguments to the dace.program.
+        :param kwargs: The call-site keyword arguments to the program.
+        :return: A hashable fingerprint, or None if an argument, closure array, or closure constant is not supported
+                 (see ``cached_program.argument_fingerprint``) or cannot be evaluated.
+        """
+        if len(args) > len(self.argnames):
+            return None
+        fingerprint = []
+        constants = {}
+        for aname, arg in itertools.chain(zip(self.argnames, args), sorted(kwargs.items())):
+            if aname in self.constant_args:
+                constants[aname] = arg
+                fingerprint.append((aname, None))
+                continue
+            argfp = cached_program.argument_fingerprint(arg)
+            if argfp is None:
+                return None
+            fingerprint.append((aname, argfp))
+
+        # Evaluate closure arrays and constants with the current free variables and globals of the function
+        local_vars = _get_free_variables(self.f)
+        if self.methodobj is not None:
+            local_vars[self.objname] = self.methodobj
+        local_vars.update({k: v for k, v in self.default_args.items() if k in self.constant_args})
+        local_vars.update(constants)
+        try:
+            for aname in sorted(self.closure_array_keys):
+                if aname in self.closure_arg_mapping:
+                    value = self.closure_arg_mapping[aname]()
+                else:
+                    value = eval(aname, self.f.__globals__, local_vars)
+                argfp = cached_program.argument_fingerprint(value)
+                if argfp is None:
+                    return None
+                fingerprint.append((aname, argfp))
+            for cname in sorted(self.closure_constant_keys):
+                fingerprint.append((cname, cached_program._make_hashable(eval(cname, self.f.__globals__, local_vars))))
+        except Exception:
+            # Evaluating arbitrary code - leave error handling to the full program cache key
+            return None
+
+        return tuple(fingerprint)
+
+    def _add_dispatch(self, args: Tuple[Any], kwargs: Dict[str, Any], cachekey: cached_program.ProgramCacheKey):
+        """ Enables fast dispatch of calls with the given arguments to the given (compiled) program cache entry. """
+        if not self._fast_dispatch:
+            return
+        fingerprint = self._dispatch_fingerprint(args, kwargs)
+        if fingerprint is not None:
+            self._cache.add_dispatch(fingerprint, cachekey)
+
     def __call__(self, *args, **kwargs):
         """ Convenience function that parses, compiles, and runs a DaCe 
-            program. """
+            program. If given, the ``out`` keyword argument specifies the buffers to write the return values into
+            (a single array, or a tuple of arrays for multiple return values). """
+        out = kwargs.pop('out', None) if self._out_argument else None
+
+        # Fast path: find a compiled program by a fingerprint of the arguments and closure
+        if self._fast_dispatch and len(self._cache.dispatch) > 0:
+            call_fingerprint = self._dispatch_fingerprint(args, kwargs)
+            dispatched = self._cache.get_dispatch(call_fingerprint) if call_fingerprint is not None else None
+            if dispatched is not None:
+                dispatch, entry = dispatched
+                if not self.reuse_return_values:
+                    entry.compiled_sdfg.clear_return_values()
+                sdfg_args = self._create_sdfg_args(entry.sdfg, args, kwargs, dispatch)
+                if out is not None:
+                    sdfg_args['out'] = out
+                return entry.compiled_sdfg(**sdfg_args)
+
+        # Find or compile the program (serialized, as this modifies the program and its caches)
+        with self._lock:
+            binaryobj, sdfg_args = self._get_compiled_program(args, dict(kwargs))
+        if binaryobj is None:
+            # The program is compiling in the background
+            result = self._call_python(args, kwargs)
+            return result if out is None else _write_output_buffers(result, out)
+        if out is not None:
+            sdfg_args['out'] = out
+        return binaryobj(**sdfg_args)
+
+    def _get_compiled_program(
+        self, args: Tuple[Any], kwargs: Dict[str, Any]
+    ) -> Tuple[Optional['dace.codegen.compiled_sdfg.CompiledSDFG'], Optional[Dict[str, Any]]]:
+        """
+        Finds the compiled program for the given arguments in the program caches, or parses and compiles it.
+
+        :param args: The call-site arguments to the dace.program.
+        :param kwargs: The call-site keyword arguments to the program (modified by this method).
+        :return: A 2-tuple of (compiled SDFG, arguments to call it with), or (None, None) if the program is compiling
+                 in the background and should be called in Python mode.
+        """
         # Update global variables with current closure
         self.global_vars = _get_locals_and_globals(self.f)
 
@@ -411,16 +600,52 @@ class DaceProgram(pycommon.SDFGConvertible):
             entry = self._cache.get(cachekey)
             # If the cache does not just contain a parsed SDFG
             if entry.compiled_sdfg is not None:
+                self._add_dispatch(args, kwargs, cachekey)
                 kwargs.update(arg_mapping)
-                entry.compiled_sdfg.clear_return_values()
-                return entry.compiled_sdfg(**self._create_sdfg_args(entry.sdfg, args, kwargs))
+                if not self.reuse_return_values:
+                    entry.compiled_sdfg.clear_return_values()
+                return entry.compiled_sdfg, self._create_sdfg_args(entry.sdfg, args, kwargs)
+
+        # Use a program that is compiling in the background, waiting for it unless calls should fall back to Python
+        if cachekey in self._pending:
+            sdfg, future = self._pending[cachekey]
+            if not future.done() and self.compile_mode == 'background':
+                return None, None
+            del self._pending[cachekey]
+            binaryobj = future.result()
+            self._cache.add(cachekey, sdfg, binaryobj)
+            self._add_dispatch(args, kwargs, cachekey)
+            kwargs.update(arg_mapping)
+            return binaryobj, self._create_sdfg_args(sdfg, args, kwargs)
 
         # Clear cache to enforce deletion and closure of compiled program
         # self._cache.pop()
 
+        # Try to load the compiled program from the persistent (on-disk) cache
+        persistent_cache = None
+        fingerprint = None
+        if self.recreate_sdfg and not Config.get_bool('optimizer', 'transform_on_call'):
+            persistent_cache = cached_program.get_persistent_cache()
+        if persistent_cache is not None:
+            # Resolve the closure to obtain the full cache key without parsing the program
+            self._load_sdfg(None, *args, **kwargs)
+            cachekey = self._cache.make_key(argtypes, specified, self.closure_array_keys, self.closure_constant_keys,
+                                            constant_args)
+            fingerprint = persistent_cache.fingerprint(self, cachekey)
+            if fingerprint is not None:
+                binaryobj = persistent_cache.load(fingerprint)
+                if binaryobj is not None:
+                    self._cache.add(cachekey, binaryobj.sdfg, binaryobj)
+                    self._add_dispatch(args, kwargs, cachekey)
+                    kwargs.update(arg_mapping)
+                    return binaryobj, self._create_sdfg_args(binaryobj.sdfg, args, kwargs)
+
         # Parse SDFG
         sdfg = self._parse(args, kwargs)
 
+        # Keep the given arguments for fast dispatch
+        given_kwargs = dict(kwargs)
+
         # Add named arguments to the call
         kwargs.update(arg_mapping)
         sdfg_args = self._create_sdfg_args(sdfg, args, kwargs)
@@ -435,19 +660,34 @@ class DaceProgram(pycommon.SDFGConvertible):
                 sdfg = self.auto_optimize(sdfg, symbols=sdfg_args)
                 sdfg.simplify()
 
+        # Recreate key
+        cachekey = self._cache.make_key(argtypes, specified, self.closure_array_keys, self.closure_constant_keys,
+                                        constant_args)
+
+        if self.compile_mode == 'background':
+            # Compile in the background and run in Python mode in the meantime
+            future = sdfg.compile_async(validate=self.validate)
+            if fingerprint is not None:
+
+                def store(f: concurrent.futures.Future):
+                    if f.exception() is None:
+                        persistent_cache.store(fingerprint, f.result())
+
+                future.add_done_callback(store)
+            self._pending[cachekey] = (sdfg, future)
+            return None, None
+
         # Compile SDFG (note: this is done after symbol inference due to shape
         # altering transformations such as Vectorization)
         binaryobj = sdfg.compile(validate=self.validate)
 
-        # Recreate key and add to cache
-        cachekey = self._cache.make_key(argtypes, specified, self.closure_array_keys, self.closure_constant_keys,
-                                        constant_args)
+        # Add to cache
         self._cache.add(cachekey, sdfg, binaryobj)
+        self._add_dispatch(args, given_kwargs, cachekey)
+        if fingerprint is not None:
+            persistent_cache.store(fingerprint, binaryobj)
 
-        # Call SDFG
-        result = binaryobj(**sdfg_args)
-
-        return result
+        return binaryobj, sdfg_args
 
     def _parse(self, args, kwargs, simplify=None, save=False, validate=False) -> SDFG:
         """ 
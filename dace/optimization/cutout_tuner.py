@@ -5,8 +5,9 @@ import math
 import dace
 import json
 
-from typing import Dict, Generator, Any, List, Tuple
+from typing import Dict, Generator, Any, List, Optional, Tuple
 from dace.optimization import auto_tuner
+from dace.optimization import search_strategies as ss
 from dace.optimization import utils as optim_utils
 from dace.sdfg.sdfg import SDFG
 from dace.sdfg.state import SDFGState
@@ -33,17 +34,26 @@ class CutoutTuner(auto_tuner.AutoTuner):
 
         results = tuner.optimize()
         # results will now contain the fastest data layout configurations for each array
+
+    By default, every configuration of the search space is evaluated. Large search spaces can instead be explored
+    with a search strategy (see ``dace.optimization.search_strategies``), either set on the tuner or given to
+    ``optimize``::
+
+        results = tuner.optimize(strategy=SuccessiveHalving(eta=3, budget=100))
     """
 
-    def __init__(self, task: str, sdfg: SDFG) -> None:
+    def __init__(self, task: str, sdfg: SDFG, strategy: Optional[ss.SearchStrategy] = None) -> None:
         """
         Creates a cutout tuner.
         
         :param task: Name of tuning task (for filename labeling).
         :param sdfg: The SDFG to tune.
+        :param strategy: The strategy used to search the configuration space of each cutout (defaults to an
+                         exhaustive search).
         """
         super().__init__(sdfg=sdfg)
         self._task = task
+        self.strategy = strategy or ss.ExhaustiveSearch()
 
     @property
     def task(self) -> str:
@@ -123,18 +133,15 @@ class CutoutTuner(auto_tuner.AutoTuner):
 
         return tuning_report
 
-    def search(self, cutout: SDFG, measurements: int,
+    def search(self,
+               cutout: SDFG,
+               measurements: int,
+               strategy: Optional[ss.SearchStrategy] = None,
                **kwargs) -> Dict[str, float]:
         kwargs = self.pre_evaluate(cutout=cutout, measurements=measurements, **kwargs)
 
-        results = {}
-        key = kwargs["key"]
-        for config in tqdm(list(self.space(**(kwargs["space_kwargs"])))):
-            kwargs["config"] = config
-            runtime = self.evaluate(**kwargs)
-            results[key(config)] = runtime
-
-        return results
+        strategy = strategy or self.strategy
+        return strategy.search(self, kwargs, measurements)
 
     @staticmethod
     def top_k_configs(tuning_report, k: int) -> List[Tuple[str, float]]:
@@ -0,0 +1,299 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+"""
+Search strategies for cutout tuners. A strategy decides which configurations of a tuner's search space are evaluated,
+and with how many measurements, instead of compiling and measuring every configuration. Strategies work with any
+``CutoutTuner`` subclass, since they only use its ``space``, ``evaluate`` and ``key`` interface:
+
+.. code-block:: python
+
+    tuner = MapPermutationTuner(sdfg)
+    tuner.optimize(strategy=SuccessiveHalving(eta=3, budget=100))
+
+"""
+import collections
+import itertools
+import math
+import random
+
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from tqdm import tqdm
+except (ImportError, ModuleNotFoundError):
+    tqdm = lambda x, **kwargs: x
+
+
+def sample_space(space: Iterable[Any], k: int, rng: random.Random) -> List[Any]:
+    """
+    Samples up to ``k`` configurations uniformly from a search space, without materializing the space in memory
+    (reservoir sampling).
+
+    :param space: An iterable of configurations.
+    :param k: The number of configurations to sample.
+    :param rng: The random number generator to use.
+    :return: A list of at most ``k`` configurations, in the order of the search space.
+    """
+    reservoir: List[Tuple[int, Any]] = []
+    for i, config in enumerate(space):
+        if i < k:
+            reservoir.append((i, config))
+        else:
+            j = rng.randint(0, i)
+            if j < k:
+                reservoir[j] = (i, config)
+    return [config for _, config in sorted(reservoir, key=lambda c: c[0])]
+
+
+def key_features(key: str) -> Tuple[str, ...]:
+    """
+    Splits a configuration key into categorical features, one per line and dot-separated component (e.g., tile sizes
+    ``64.8.1``, map parameter orders ``i.j.k`` or one array layout per line).
+    """
+    return tuple(feature.strip() for line in key.split('\n') for feature in line.split('.'))
+
+
+class SearchStrategy:
+    """
+    Base class for search strategies of cutout tuners. Subclasses implement ``search``, evaluating configurations
+    through ``evaluate``.
+    """
+
+    def __init__(self, prune_factor: Optional[float] = None, screening: Optional[int] = None) -> None:
+        """
+        Creates a search strategy.
+
+        :param prune_factor: If given, every configuration is first measured with ``screening`` repetitions, and only
+                             measured with all repetitions if it is at most ``prune_factor`` times slower than the
+                             best configuration so far. Clearly losing configurations are thus terminated early.
+        :param screening: The number of repetitions of the screening measurement (defaults to a tenth of the
+                          measurements).
+        """
+        self.prune_factor = prune_factor
+        self.screening = screening
+
+    def search(self, tuner, evaluate_kwargs: Dict[str, Any], measurements: int) -> Dict[str, float]:
+        """
+        Searches the configuration space of a cutout.
+
+        :param tuner: The cutout tuner.
+        :param evaluate_kwargs: The keyword arguments returned by the tuner's ``pre_evaluate`` method.
+        :param measurements: The (maximal) number of measurements per configuration.
+        :return: A dictionary mapping the keys of the evaluated configurations to their runtime.
+        """
+        raise NotImplementedError
+
+    def evaluate(self, tuner, evaluate_kwargs: Dict[str, Any], config: Any, measurements: int) -> float:
+        """ Evaluates a single configuration with the given number of measurements. """
+        evaluate_kwargs["config"] = config
+        evaluate_kwargs["measurements"] = measurements
+        return tuner.evaluate(**evaluate_kwargs)
+
+    def measure(self, tuner, evaluate_kwargs: Dict[str, Any], config: Any, measurements: int, best: float) -> float:
+        """
+        Evaluates a configuration, terminating it after the screening measurement if it is clearly slower than
+        ``best`` (see ``prune_factor``).
+        """
+        if self.prune_factor is not None and math.isfinite(best):
+            screening = self.screening or max(1, measurements // 10)
+            if screening < measurements:
+                runtime = self.evaluate(tuner, evaluate_kwargs, config, screening)
+                if runtime > self.prune_factor * best:
+                    return runtime
+        return self.evaluate(tuner, evaluate_kwargs, config, measurements)
+
+
+class ExhaustiveSearch(SearchStrategy):
+    """ Evaluates every configuration of the search space (the default strategy). """
+
+    def search(self, tuner, evaluate_kwargs: Dict[str, Any], measurements: int) -> Dict[str, float]:
+        results = {}
+        key = evaluate_kwargs["key"]
+        best = math.inf
+        for config in tqdm(list(tuner.space(**(evaluate_kwargs["space_kwargs"])))):
+            runtime = self.measure(tuner, evaluate_kwargs, config, measurements, best)
+            results[key(config)] = runtime
+            best = min(best, runtime)
+
+        return results
+
+
+class RandomSearch(SearchStrategy):
+    """ Evaluates a uniformly random sample of the search space, of at most ``budget`` configurations. """
+
+    def __init__(self,
+                 budget: int = 50,
+                 prune_factor: Optional[float] = 1.5,
+                 screening: Optional[int] = None,
+                 seed: Optional[int] = None) -> None:
+        """
+        Creates a random search strategy.
+
+        :param budget: The maximal number of configurations to evaluate.
+        :param prune_factor: See ``SearchStrategy``.
+        :param screening: See ``SearchStrategy``.
+        :param seed: Seed of the random number generator.
+        """
+        super().__init__(prune_factor=prune_factor, screening=screening)
+        self.budget = budget
+        self.seed = seed
+
+    def search(self, tuner, evaluate_kwargs: Dict[str, Any], measurements: int) -> Dict[str, float]:
+        rng = random.Random(self.seed)
+        configs = sample_space(tuner.space(**(evaluate_kwargs["space_kwargs"])), self.budget, rng)
+        rng.shuffle(configs)
+
+        results = {}
+        key = evaluate_kwargs["key"]
+        best = math.inf
+        for config in tqdm(configs):
+            runtime = self.measure(tuner, evaluate_kwargs, config, measurements, best)
+            results[key(config)] = runtime
+            best = min(best, runtime)
+
+        return results
+
+
+class SuccessiveHalving(SearchStrategy):
+    """
+    Successive halving: all (or ``budget`` sampled) configurations are first measured with few repetitions, after
+    which only the best ``1 / eta`` of them are measured again with ``eta`` times more repetitions, until one
+    configuration remains, measured with all repetitions.
+
+    The runtimes of eliminated configurations are reported from their last (less precise) measurement.
+    """
+
+    def __init__(self, eta: int = 3, budget: Optional[int] = None, seed: Optional[int] = None) -> None:
+        """
+        Creates a successive halving strategy.
+
+        :param eta: The elimination factor of every round (at least 2).
+        :param budget: If given, the maximal number of configurations (sampled uniformly from the search space).
+        :param seed: Seed of the random number generator used for sampling.
+        """
+        super().__init__()
+        if eta < 2:
+            raise ValueError('Successive halving requires eta >= 2')
+        self.eta = eta
+        self.budget = budget
+        self.seed = seed
+
+    def search(self, tuner, evaluate_kwargs: Dict[str, Any], measurements: int) -> Dict[str, float]:
+        space = tuner.space(**(evaluate_kwargs["space_kwargs"]))
+        if self.budget is None:
+            configs = list(space)
+        else:
+            configs = sample_space(space, self.budget, random.Random(self.seed))
+
+        # Number of rounds until a single configuration remains
+        rounds = 0
+        while self.eta**rounds < len(configs):
+            rounds += 1
+
+        results = {}
+        key = evaluate_kwargs["key"]
+        for r in range(rounds + 1):
+            repetitions = max(1, measurements // self.eta**(rounds - r))
+            runtimes = []
+            for config in tqdm(configs, desc=f'Round {r + 1}/{rounds + 1}'):
+                runtime = self.evaluate(tuner, evaluate_kwargs, config, repetitions)
+                results[key(config)] = runtime
+                runtimes.append(runtime)
+
+            # Keep the best configurations, dropping failed ones
+            survivors = sorted((rt, i) for i, rt in enumerate(runtimes) if math.isfinite(rt))
+            configs = [configs[i] for _, i in survivors[:max(1, len(configs) // self.eta)]]
+            if len(configs) <= 1 and r < rounds:
+                # Measure the winner with all repetitions
+                for config in configs:
+                    results[key(config)] = self.evaluate(tuner, evaluate_kwargs, config, measurements)
+                break
+
+        return results
+
+
+class TPESearch(SearchStrategy):
+    """
+    Model-based search with a Tree-structured Parzen Estimator (TPE) over categorical configuration features. After
+    a number of random configurations, the evaluated configurations are split into a good (fastest ``gamma``
+    fraction) and a bad set, and the next configuration is the candidate maximizing the ratio between its likelihood
+    under the good and the bad feature distributions.
+
+    Configurations are described by the features of their key (see ``key_features``), so that the strategy works
+    with any tuner. A custom ``features`` function may be given for more structured search spaces.
+    """
+
+    def __init__(self,
+                 budget: int = 50,
+                 startup: int = 10,
+                 gamma: float = 0.25,
+                 candidates: int = 1000,
+                 features: Optional[Callable[[str], Sequence[Hashable]]] = None,
+                 prune_factor: Optional[float] = 1.5,
+                 screening: Optional[int] = None,
+                 seed: Optional[int] = None) -> None:
+        """
+        Creates a TPE search strategy.
+
+        :param budget: The maximal number of configurations to evaluate.
+        :param startup: The number of randomly chosen configurations evaluated before using the model.
+        :param gamma: The fraction of evaluated configurations considered good.
+        :param candidates: The maximal number of candidate configurations sampled from the search space.
+        :param features: A function returning the categorical features of a configuration key.
+        :param prune_factor: See ``SearchStrategy``.
+        :param screening: See ``SearchStrategy``.
+        :param seed: Seed of the random number generator.
+        """
+        super().__init__(prune_factor=prune_factor, screening=screening)
+        self.budget = budget
+        self.startup = startup
+        self.gamma = gamma
+        self.candidates = candidates
+        self.features = features or key_features
+        self.seed = seed
+
+    def search(self, tuner, evaluate_kwargs: Dict[str, Any], measurements: int) -> Dict[str, float]:
+        rng = random.Random(self.seed)
+        key = evaluate_kwargs["key"]
+        pool = sample_space(tuner.space(**(evaluate_kwargs["space_kwargs"])), self.candidates, rng)
+        keys = [key(config) for config in pool]
+        features = [tuple(self.features(k)) for k in keys]
+        num_values = collections.Counter(i for i, _ in set(itertools.chain.from_iterable(map(enumerate, features))))
+
+        remaining = list(range(len(pool)))
+        rng.shuffle(remaining)
+        evaluated: List[Tuple[float, int]] = []
+        results = {}
+        best = math.inf
+        for it in tqdm(range(min(self.budget, len(pool)))):
+            if it < self.startup:
+                index = remaining.pop()
+            else:
+                index = self._suggest(remaining, evaluated, features, num_values)
+                remaining.remove(index)
+
+            runtime = self.measure(tuner, evaluate_kwargs, pool[index], measurements, best)
+            results[keys[index]] = runtime
+            evaluated.append((runtime, index))
+            best = min(best, runtime)
+
+        return results
+
+    def _suggest(self, remaining: List[int], evaluated: List[Tuple[float, int]], features: List[Tuple[Hashable, ...]],
+                 num_values: Dict[int, int]) -> int:
+        """ Returns the remaining candidate with the highest (log) likelihood ratio of good over bad. """
+        ranked = [i for _, i in sorted(evaluated, key=lambda e: e[0])]
+        num_good = max(1, int(math.ceil(self.gamma * len(ranked))))
+        good, bad = ranked[:num_good], ranked[num_good:]
+        good_counts = collections.Counter(f for i in good for f in enumerate(features[i]))
+        bad_counts = collections.Counter(f for i in bad for f in enumerate(features[i]))
+
+        def score(index: int) -> float:
+            # Categorical Parzen estimators with add-one smoothing
+            result = 0.0
+            for feature in enumerate(features[index]):
+                values = num_values[feature[0]]
+                result += math.log((good_counts[feature] + 1) / (len(good) + values))
+                result -= math.log((bad_counts[feature] + 1) / (len(bad) + values))
+            return result
+
+        return max(remaining, key=score)
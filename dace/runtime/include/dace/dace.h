@@ -21,6 +21,7 @@
 #include "copy.h"
 #include "stream.h"
 #include "os.h"
+#include "pool.h"
 #include "perf/reporting.h"
 #include "comm.h"
 #include "serialization.h"
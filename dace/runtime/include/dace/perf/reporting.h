@@ -2,13 +2,20 @@
 #ifndef __DACE_PERF_REPORTING_H
 #define __DACE_PERF_REPORTING_H
 
+#include <atomic>
 #include <chrono>
+#include <cstdint>
+#include <cstdio>
 #include <cstring>
 #include <fstream>
+#include <functional>
 #include <map>
+#include <memory>
 #include <mutex>
 #include <sstream>
+#include <string>
 #include <thread>
+#include <unordered_map>
 #include <vector>
 
 #ifdef _WIN32
@@ -22,16 +29,24 @@
 #define DACE_REPORT_BUFFER_SIZE     2048
 #define DACE_REPORT_EVENT_NAME_LEN  64
 #define DACE_REPORT_EVENT_CAT_LEN   10
+// Log-linear histogram: values below DACE_REPORT_HISTOGRAM_SUB are exact,
+// every further power of two is split into DACE_REPORT_HISTOGRAM_SUB buckets
+#define DACE_REPORT_HISTOGRAM_SUB_BITS  4
+#define DACE_REPORT_HISTOGRAM_SUB       (1 << DACE_REPORT_HISTOGRAM_SUB_BITS)
+#define DACE_REPORT_HISTOGRAM_BUCKETS   ((64 - DACE_REPORT_HISTOGRAM_SUB_BITS + 1) * DACE_REPORT_HISTOGRAM_SUB)
 
 namespace dace {
 namespace perf {
 
+    /**
+     * A single trace event. Timestamps are stored in nanoseconds.
+     */
     struct TraceEvent {
         char ph;
         char name[DACE_REPORT_EVENT_NAME_LEN];
         char cat[DACE_REPORT_EVENT_CAT_LEN];
-        unsigned long int tstart;
-        unsigned long int tend;
+        uint64_t tstart;
+        uint64_t tend;
         size_t tid;
         struct _element_id {
             int sdfg_id;
@@ -44,23 +59,243 @@ namespace perf {
         } counter;
     };
 
+    /**
+     * Running statistics of the durations of completion events with the same
+     * name, category, and element, with a log-linear histogram for percentiles.
+     */
+    struct AggregateEvent {
+        char name[DACE_REPORT_EVENT_NAME_LEN];
+        char cat[DACE_REPORT_EVENT_CAT_LEN];
+        TraceEvent::_element_id element_id;
+        uint64_t count = 0;
+        uint64_t sum = 0;
+        uint64_t min = UINT64_MAX;
+        uint64_t max = 0;
+        uint64_t buckets[DACE_REPORT_HISTOGRAM_BUCKETS] = { 0 };
+
+        AggregateEvent(const char *name, const char *cat, int sdfg_id, int state_id, int el_id)
+            : element_id{ sdfg_id, state_id, el_id } {
+            strncpy(this->name, name, DACE_REPORT_EVENT_NAME_LEN);
+            this->name[DACE_REPORT_EVENT_NAME_LEN - 1] = '\0';
+            strncpy(this->cat, cat, DACE_REPORT_EVENT_CAT_LEN);
+            this->cat[DACE_REPORT_EVENT_CAT_LEN - 1] = '\0';
+        }
+
+        bool matches(const char *name, const char *cat, int sdfg_id, int state_id, int el_id) const {
+            return element_id.sdfg_id == sdfg_id && element_id.state_id == state_id &&
+                   element_id.el_id == el_id &&
+                   strncmp(this->name, name, DACE_REPORT_EVENT_NAME_LEN - 1) == 0 &&
+                   strncmp(this->cat, cat, DACE_REPORT_EVENT_CAT_LEN - 1) == 0;
+        }
+
+        static int bucket(uint64_t value) {
+            if (value < DACE_REPORT_HISTOGRAM_SUB)
+                return (int)value;
+            int msb = 63;
+            while (!(value >> msb))
+                --msb;
+            int shift = msb - DACE_REPORT_HISTOGRAM_SUB_BITS;
+            return (shift + 1) * DACE_REPORT_HISTOGRAM_SUB +
+                   (int)((value >> shift) & (DACE_REPORT_HISTOGRAM_SUB - 1));
+        }
+
+        // Returns the smallest value that falls into the given bucket
+        static uint64_t bucket_start(int index) {
+            if (index < DACE_REPORT_HISTOGRAM_SUB)
+                return (uint64_t)index;
+            int shift = index / DACE_REPORT_HISTOGRAM_SUB - 1;
+            uint64_t sub = (uint64_t)(index % DACE_REPORT_HISTOGRAM_SUB);
+            return (DACE_REPORT_HISTOGRAM_SUB + sub) << shift;
+        }
+
+        void add(uint64_t duration) {
+            ++count;
+            sum += duration;
+            if (duration < min) min = duration;
+            if (duration > max) max = duration;
+            ++buckets[bucket(duration)];
+        }
+
+        void merge(const AggregateEvent& other) {
+            count += other.count;
+            sum += other.sum;
+            if (other.min < min) min = other.min;
+            if (other.max > max) max = other.max;
+            for (int i = 0; i < DACE_REPORT_HISTOGRAM_BUCKETS; ++i)
+                buckets[i] += other.buckets[i];
+        }
+
+        /**
+         * Returns an approximation of the given percentile (within the
+         * relative bucket width of 1 / DACE_REPORT_HISTOGRAM_SUB).
+         */
+        uint64_t percentile(double p) const {
+            if (count == 0)
+                return 0;
+            uint64_t rank = (uint64_t)(p / 100.0 * (double)(count - 1)) + 1;
+            uint64_t seen = 0;
+            for (int i = 0; i < DACE_REPORT_HISTOGRAM_BUCKETS; ++i) {
+                seen += buckets[i];
+                if (seen >= rank) {
+                    // Midpoint of the bucket, clamped to the observed range
+                    uint64_t start = bucket_start(i);
+                    uint64_t end = (i + 1 < DACE_REPORT_HISTOGRAM_BUCKETS) ? bucket_start(i + 1) : UINT64_MAX;
+                    uint64_t value = start + (end - start) / 2;
+                    if (value < min) value = min;
+                    if (value > max) value = max;
+                    return value;
+                }
+            }
+            return max;
+        }
+    };
+
+    /**
+     * Events recorded by a single thread. Only the owning thread appends to
+     * its buffer, such that recording events does not require locking.
+     */
+    struct ThreadBuffer {
+        struct Key {
+            const char *name;
+            const char *cat;
+            int sdfg_id;
+            int state_id;
+            int el_id;
+
+            bool operator==(const Key& other) const {
+                return name == other.name && cat == other.cat && sdfg_id == other.sdfg_id &&
+                       state_id == other.state_id && el_id == other.el_id;
+            }
+        };
+        struct KeyHash {
+            size_t operator()(const Key& key) const {
+                size_t h = std::hash<const void *>{}(key.name);
+                h = h * 31 + std::hash<const void *>{}(key.cat);
+                h = h * 31 + (size_t)key.sdfg_id;
+                h = h * 31 + (size_t)key.state_id;
+                return h * 31 + (size_t)key.el_id;
+            }
+        };
+
+        std::thread::id thread;
+        size_t tid;
+        std::vector<TraceEvent> events;
+        std::vector<std::unique_ptr<AggregateEvent>> aggregates;
+        // Fast lookup of aggregates by string address, verified by contents
+        std::unordered_map<Key, AggregateEvent *, KeyHash> aggregate_index;
+
+        ThreadBuffer(std::thread::id thread) : thread(thread), tid(std::hash<std::thread::id>{}(thread)) {
+            events.reserve(DACE_REPORT_BUFFER_SIZE);
+        }
+
+        AggregateEvent& aggregate(const char *name, const char *cat, int sdfg_id, int state_id, int el_id) {
+            Key key = { name, cat, sdfg_id, state_id, el_id };
+            auto it = aggregate_index.find(key);
+            if (it != aggregate_index.end() && it->second->matches(name, cat, sdfg_id, state_id, el_id))
+                return *it->second;
+
+            // Slow path: new key, or string storage that was reused for a different name
+            AggregateEvent *result = nullptr;
+            for (auto& agg : aggregates) {
+                if (agg->matches(name, cat, sdfg_id, state_id, el_id)) {
+                    result = agg.get();
+                    break;
+                }
+            }
+            if (result == nullptr) {
+                aggregates.emplace_back(new AggregateEvent(name, cat, sdfg_id, state_id, el_id));
+                result = aggregates.back().get();
+            }
+            aggregate_index[key] = result;
+            return *result;
+        }
+
+        void clear() {
+            events.clear();
+            aggregates.clear();
+            aggregate_index.clear();
+        }
+    };
+
     /**
      * Simple instrumentation report class that can save to JSON.
+     *
+     * Events are appended to per-thread buffers and merged when the report is
+     * saved. In aggregation mode, completion events are not stored
+     * individually. Instead, running statistics and a duration histogram are
+     * kept per event name and element, bounding the memory usage of
+     * instrumentation in long-running loops.
      */
     class Report {
     protected:
         std::mutex _mutex;
-        std::vector<TraceEvent> _events;
+        std::vector<std::unique_ptr<ThreadBuffer>> _buffers;
+        const uint64_t _id;
+        const bool _aggregate;
+
+        static uint64_t next_id() {
+            static std::atomic<uint64_t> counter(1);
+            return counter++;
+        }
+
+        /**
+         * Returns the event buffer of the calling thread, creating it if necessary.
+         */
+        ThreadBuffer& buffer() {
+            struct Cache {
+                uint64_t report_id;
+                ThreadBuffer *buffer;
+            };
+            static thread_local Cache cache = { 0, nullptr };
+            if (cache.report_id == this->_id)
+                return *cache.buffer;
+
+            std::lock_guard<std::mutex> guard (this->_mutex);
+            std::thread::id thread = std::this_thread::get_id();
+            ThreadBuffer *result = nullptr;
+            for (auto& buf : this->_buffers) {
+                if (buf->thread == thread) {
+                    result = buf.get();
+                    break;
+                }
+            }
+            if (result == nullptr) {
+                this->_buffers.emplace_back(new ThreadBuffer(thread));
+                result = this->_buffers.back().get();
+            }
+            cache = { this->_id, result };
+            return *result;
+        }
+
+        static void write_microseconds(std::ostream& ofs, uint64_t ns) {
+            char buf[32];
+            snprintf(buf, sizeof(buf), "%llu.%03llu", (unsigned long long)(ns / 1000),
+                     (unsigned long long)(ns % 1000));
+            ofs << buf;
+        }
+
     public:
+        Report(bool aggregate = false) : _id(next_id()), _aggregate(aggregate) {}
         ~Report() {}
 
         /**
-         * Clears the report.
+         * Returns the current time in nanoseconds, for use with
+         * ``add_completion_ns``.
+         */
+        static uint64_t now_ns() {
+            return std::chrono::duration_cast<std::chrono::nanoseconds>(
+                std::chrono::high_resolution_clock::now().time_since_epoch()
+            ).count();
+        }
+
+        /**
+         * Clears the report. Must not be called while instrumented code is
+         * recording events.
          */
         void reset() {
             std::lock_guard<std::mutex> guard (this->_mutex);
-            this->_events.clear();
-            this->_events.reserve(DACE_REPORT_BUFFER_SIZE);
+            for (auto& buf : this->_buffers)
+                buf->clear();
         }
 
         void add_counter(
@@ -69,9 +304,8 @@ namespace perf {
             const char *counter_name,
             unsigned long int counter_val
         ) {
-            std::thread::id thread_id = std::this_thread::get_id();
-            size_t tid = std::hash<std::thread::id>{}(thread_id);
-            add_counter(name, cat, counter_name, counter_val, tid, -1, -1, -1);
+            ThreadBuffer& buf = this->buffer();
+            add_counter(name, cat, counter_name, counter_val, buf.tid, -1, -1, -1);
         }
 
         void add_counter(
@@ -84,15 +318,11 @@ namespace perf {
             int state_id,
             int el_id
         ) {
-            long unsigned int tstart = std::chrono::duration_cast<std::chrono::microseconds>(
-                std::chrono::high_resolution_clock::now().time_since_epoch()
-            ).count();
-            std::lock_guard<std::mutex> guard (this->_mutex);
             struct TraceEvent event = {
                 'C',
                 "",
                 "",
-                tstart,
+                now_ns(),
                 0,
                 tid,
                 { sdfg_id, state_id, el_id },
@@ -104,15 +334,15 @@ namespace perf {
             event.cat[DACE_REPORT_EVENT_CAT_LEN - 1] = '\0';
             strncpy(event.counter.name, counter_name, DACE_REPORT_EVENT_NAME_LEN);
             event.counter.name[DACE_REPORT_EVENT_NAME_LEN - 1] = '\0';
-            this->_events.push_back(event);
+            this->buffer().events.push_back(event);
         }
 
         /**
          * Appends a single completion event to the report.
          * @param name:     Name of the event.
          * @param cat:      Comma separated categories the event belongs to.
-         * @param tstart:   Start timestamp of the event.
-         * @param tend:     End timestamp of the event.
+         * @param tstart:   Start timestamp of the event (in microseconds).
+         * @param tend:     End timestamp of the event (in microseconds).
          * @param sdfg_id:  SDFG ID of the element associated with this event.
          * @param state_id: State ID of the element associated with this event.
          * @param el_id:    ID of the element associated with this event.
@@ -126,9 +356,9 @@ namespace perf {
             int state_id,
             int el_id
         ) {
-            std::thread::id thread_id = std::this_thread::get_id();
-            size_t tid = std::hash<std::thread::id>{}(thread_id);
-            add_completion(name, cat, tstart, tend, tid, sdfg_id, state_id, el_id);
+            ThreadBuffer& buf = this->buffer();
+            add_completion_ns(buf, name, cat, (uint64_t)tstart * 1000, (uint64_t)tend * 1000, buf.tid,
+                              sdfg_id, state_id, el_id);
         }
 
         void add_completion(
@@ -141,7 +371,43 @@ namespace perf {
             int state_id,
             int el_id
         ) {
-            std::lock_guard<std::mutex> guard (this->_mutex);
+            add_completion_ns(this->buffer(), name, cat, (uint64_t)tstart * 1000, (uint64_t)tend * 1000, tid,
+                              sdfg_id, state_id, el_id);
+        }
+
+        /**
+         * Appends a single completion event with nanosecond timestamps to the
+         * report (see ``add_completion``).
+         */
+        void add_completion_ns(
+            const char *name,
+            const char *cat,
+            uint64_t tstart,
+            uint64_t tend,
+            int sdfg_id,
+            int state_id,
+            int el_id
+        ) {
+            ThreadBuffer& buf = this->buffer();
+            add_completion_ns(buf, name, cat, tstart, tend, buf.tid, sdfg_id, state_id, el_id);
+        }
+
+    protected:
+        void add_completion_ns(
+            ThreadBuffer& buf,
+            const char *name,
+            const char *cat,
+            uint64_t tstart,
+            uint64_t tend,
+            size_t tid,
+            int sdfg_id,
+            int state_id,
+            int el_id
+        ) {
+            if (this->_aggregate) {
+                buf.aggregate(name, cat, sdfg_id, state_id, el_id).add(tend - tstart);
+                return;
+            }
             struct TraceEvent event = {
                 'X',
                 "",
@@ -156,11 +422,13 @@ namespace perf {
             event.name[DACE_REPORT_EVENT_NAME_LEN - 1] = '\0';
             strncpy(event.cat, cat, DACE_REPORT_EVENT_CAT_LEN);
             event.cat[DACE_REPORT_EVENT_CAT_LEN - 1] = '\0';
-            this->_events.push_back(event);
+            buf.events.push_back(event);
         }
 
+    public:
         /**
-         * Saves the report to a timestamped JSON file.
+         * Saves the report to a timestamped JSON file. Must not be called
+         * while instrumented code is recording events.
          * @param path: Path to folder where the output JSON file will be stored.
          * @param hash: Hash of the SDFG.
          */
@@ -175,6 +443,28 @@ namespace perf {
                 );
             ss << path << "/" << "report-" << ms.count() << ".json";
 
+            // Merge thread buffers
+            std::vector<const TraceEvent *> events;
+            std::vector<std::unique_ptr<AggregateEvent>> aggregates;
+            for (const auto& buf : this->_buffers) {
+                for (const auto& event : buf->events)
+                    events.push_back(&event);
+                for (const auto& agg : buf->aggregates) {
+                    AggregateEvent *merged = nullptr;
+                    for (auto& existing : aggregates) {
+                        if (existing->matches(agg->name, agg->cat, agg->element_id.sdfg_id,
+                                              agg->element_id.state_id, agg->element_id.el_id)) {
+                            merged = existing.get();
+                            break;
+                        }
+                    }
+                    if (merged == nullptr)
+                        aggregates.emplace_back(new AggregateEvent(*agg));
+                    else
+                        merged->merge(*agg);
+                }
+            }
+
             // Dump report as JSON
             {
                 bool first = true;
@@ -185,7 +475,8 @@ namespace perf {
 
                 int pid = getpid();
 
-                for (const auto& event : this->_events) {
+                for (const TraceEvent *eventptr : events) {
+                    const TraceEvent& event = *eventptr;
                     if (first)
                         first = false;
                     else
@@ -196,10 +487,15 @@ namespace perf {
                     ofs << "\"cat\": \"" << event.cat << "\", ";
                     ofs << "\"ph\": \"" << event.ph << "\", ";
 
-                    ofs << "\"ts\": " << event.tstart << ", ";
+                    ofs << "\"ts\": ";
+                    write_microseconds(ofs, event.tstart);
+                    ofs << ", ";
 
-                    if (event.ph == 'X')
-                        ofs << "\"dur\": " << event.tend - event.tstart << ", ";
+                    if (event.ph == 'X') {
+                        ofs << "\"dur\": ";
+                        write_microseconds(ofs, event.tend - event.tstart);
+                        ofs << ", ";
+                    }
 
                     ofs << "\"pid\": " << pid << ", ";
                     ofs << "\"tid\": " << event.tid << ", ";
@@ -225,6 +521,43 @@ namespace perf {
 
                 ofs << std::endl << "  ]," << std::endl;
 
+                // Aggregated durations (in microseconds)
+                if (this->_aggregate) {
+                    ofs << "  \"aggregatedEvents\": [" << std::endl;
+                    first = true;
+                    for (const auto& agg : aggregates) {
+                        if (first)
+                            first = false;
+                        else
+                            ofs << "," << std::endl;
+
+                        ofs << "    {";
+                        ofs << "\"name\": \"" << agg->name << "\", ";
+                        ofs << "\"cat\": \"" << agg->cat << "\", ";
+                        ofs << "\"count\": " << agg->count << ", ";
+                        ofs << "\"sum\": ";
+                        write_microseconds(ofs, agg->sum);
+                        ofs << ", \"min\": ";
+                        write_microseconds(ofs, agg->min);
+                        ofs << ", \"max\": ";
+                        write_microseconds(ofs, agg->max);
+                        ofs << ", \"p50\": ";
+                        write_microseconds(ofs, agg->percentile(50));
+                        ofs << ", \"p90\": ";
+                        write_microseconds(ofs, agg->percentile(90));
+                        ofs << ", \"p99\": ";
+                        write_microseconds(ofs, agg->percentile(99));
+                        ofs << ", \"args\": {";
+                        ofs << "\"sdfg_id\": " << agg->element_id.sdfg_id;
+                        if (agg->element_id.state_id > -1)
+                            ofs << ", \"state_id\": " << agg->element_id.state_id;
+                        if (agg->element_id.el_id > -1)
+                            ofs << ", \"id\": " << agg->element_id.el_id;
+                        ofs << "}}";
+                    }
+                    ofs << std::endl << "  ]," << std::endl;
+                }
+
                 ofs << "  \"sdfgHash\": \"";
                 ofs << hash;
                 ofs << "\"" << std::endl;
@@ -242,5 +575,8 @@ namespace perf {
 #undef DACE_REPORT_BUFFER_SIZE
 #undef DACE_REPORT_EVENT_NAME_LEN
 #undef DACE_REPORT_EVENT_CAT_LEN
+#undef DACE_REPORT_HISTOGRAM_SUB_BITS
+#undef DACE_REPORT_HISTOGRAM_SUB
+#undef DACE_REPORT_HISTOGRAM_BUCKETS
 
 #endif  // __DACE_PERF_REPORTING_H
@@ -0,0 +1,197 @@
+// Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+#ifndef __DACE_POOL_H
+#define __DACE_POOL_H
+
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+namespace dace {
+
+    /**
+     * A memory pool for transients that are allocated and freed within one
+     * invocation of an SDFG. Blocks are carved out of large chunks, and freed
+     * blocks are kept in free lists of log-linear size classes (four per power
+     * of two) for reuse. Resetting the pool at the end of an invocation merges
+     * all chunks into one, such that subsequent invocations with the same
+     * allocation pattern are served without any system allocation.
+     */
+    class TransientPool {
+    public:
+        static constexpr size_t ALIGNMENT = 64;
+        static constexpr size_t MIN_CHUNK_SIZE = 1 << 20;
+
+    protected:
+        static constexpr int NUM_CLASSES = 4 * 64;
+
+        struct Chunk {
+            char *raw;
+            char *base;
+            size_t size;
+        };
+
+        std::atomic_flag m_lock = ATOMIC_FLAG_INIT;
+        std::vector<Chunk> m_chunks;
+        size_t m_offset = 0;  // Bump offset in the last chunk
+        size_t m_reserved = 0;
+        size_t m_in_use = 0;
+        size_t m_high_water_mark = 0;
+        char *m_free[NUM_CLASSES] = { nullptr };
+
+        static int size_class(size_t size) {
+            if (size <= 2 * ALIGNMENT)
+                return 0;
+            unsigned long long value = size - 1;
+#if defined(__GNUC__) || defined(__clang__)
+            int msb = 63 - __builtin_clzll(value);
+#else
+            int msb = 63;
+            while (!(value >> msb))
+                --msb;
+#endif
+            int sub = (int)((value >> (msb - 2)) & 3);
+            return (msb - 7) * 4 + sub + 1;
+        }
+
+        static size_t class_size(int cls) {
+            if (cls == 0)
+                return 2 * ALIGNMENT;
+            --cls;
+            int msb = cls / 4 + 7;
+            size_t sub = (size_t)(cls % 4);
+            return (4 + sub + 1) << (msb - 2);
+        }
+
+        void lock() {
+            while (m_lock.test_and_set(std::memory_order_acquire)) { }
+        }
+
+        void unlock() {
+            m_lock.clear(std::memory_order_release);
+        }
+
+        static size_t align(size_t size) {
+            return (size + ALIGNMENT - 1) / ALIGNMENT * ALIGNMENT;
+        }
+
+        void add_chunk(size_t size) {
+            Chunk chunk;
+            chunk.raw = new char[size + ALIGNMENT];
+            chunk.base = chunk.raw + (ALIGNMENT - reinterpret_cast<uintptr_t>(chunk.raw) % ALIGNMENT) % ALIGNMENT;
+            chunk.size = size;
+            m_chunks.push_back(chunk);
+            m_offset = 0;
+            m_reserved += size;
+        }
+
+        char *carve(size_t size) {
+            size = align(size);
+            if (m_chunks.empty() || m_offset + size > m_chunks.back().size) {
+                // Grow geometrically
+                size_t chunk_size = MIN_CHUNK_SIZE;
+                if (chunk_size < m_reserved) chunk_size = m_reserved;
+                if (chunk_size < size) chunk_size = size;
+                add_chunk(chunk_size);
+            }
+            char *result = m_chunks.back().base + m_offset;
+            m_offset += size;
+            return result;
+        }
+
+    public:
+        TransientPool() = default;
+        TransientPool(const TransientPool&) = delete;
+        TransientPool& operator=(const TransientPool&) = delete;
+
+        ~TransientPool() {
+            for (auto& chunk : m_chunks)
+                delete[] chunk.raw;
+        }
+
+        /**
+         * Allocates an array aligned to ``ALIGNMENT`` bytes.
+         * @param count: Number of elements.
+         */
+        template <typename T>
+        T *allocate(size_t count) {
+            return static_cast<T *>(allocate_bytes(count * sizeof(T)));
+        }
+
+        void *allocate_bytes(size_t size) {
+            // Each block starts with a header that stores its size class
+            int cls = size_class(size + ALIGNMENT);
+            size_t block_size = class_size(cls);
+
+            lock();
+            char *block = m_free[cls];
+            if (block != nullptr)
+                m_free[cls] = *reinterpret_cast<char **>(block);
+            else
+                block = carve(block_size);
+
+            m_in_use += block_size;
+            if (m_in_use > m_high_water_mark)
+                m_high_water_mark = m_in_use;
+            unlock();
+
+            *reinterpret_cast<int *>(block) = cls;
+            return block + ALIGNMENT;
+        }
+
+        /**
+         * Returns an array allocated with ``allocate`` to the pool.
+         */
+        void deallocate(void *ptr) {
+            if (ptr == nullptr)
+                return;
+            char *block = static_cast<char *>(ptr) - ALIGNMENT;
+            int cls = *reinterpret_cast<int *>(block);
+
+            lock();
+            *reinterpret_cast<char **>(block) = m_free[cls];
+            m_free[cls] = block;
+            m_in_use -= class_size(cls);
+            unlock();
+        }
+
+        /**
+         * Releases all blocks at once and resets the high-water mark. If the
+         * pool grew over multiple chunks, they are merged into one. Must only
+         * be called when no arrays allocated from the pool are in use.
+         */
+        void reset() {
+            lock();
+            if (m_in_use != 0) {
+                unlock();
+                return;
+            }
+            for (int i = 0; i < NUM_CLASSES; ++i)
+                m_free[i] = nullptr;
+            if (m_chunks.size() > 1) {
+                size_t total = m_reserved;
+                for (auto& chunk : m_chunks)
+                    delete[] chunk.raw;
+                m_chunks.clear();
+                m_reserved = 0;
+                add_chunk(total);
+            }
+            m_offset = 0;
+            m_high_water_mark = 0;
+            unlock();
+        }
+
+        /** Returns the largest number of bytes in use at the same time since the last reset. */
+        size_t high_water_mark() const {
+            return m_high_water_mark;
+        }
+
+        /** Returns the number of bytes reserved from the system. */
+        size_t reserved() const {
+            return m_reserved;
+        }
+    };
+
+}  // namespace dace
+
+#endif  // __DACE_POOL_H
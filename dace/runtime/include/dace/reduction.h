@@ -2,7 +2,10 @@
 #ifndef __DACE_REDUCTION_H
 #define __DACE_REDUCTION_H
 
+#include <atomic>
 #include <cstdint>
+#include <cstring>
+#include <type_traits>
 
 #include "types.h"
 #include "vector.h"
@@ -42,6 +45,95 @@ namespace dace {
     };
 
 
+    namespace detail {
+
+        // Number of locks in the lock-stripe table used for atomic updates of
+        // types that do not fit in a native compare-and-swap
+        #ifndef DACE_WCR_LOCK_STRIPES
+        #define DACE_WCR_LOCK_STRIPES 1024
+        #endif
+
+        // Spinlock padded to a cache line to avoid false sharing
+        struct alignas(64) wcr_lock {
+            std::atomic<bool> locked{false};
+
+            inline void lock() {
+                while (locked.exchange(true, std::memory_order_acquire)) {
+                    while (locked.load(std::memory_order_relaxed)) { }
+                }
+            }
+            inline void unlock() { locked.store(false, std::memory_order_release); }
+        };
+
+        // Returns the lock that guards the given address. The address is
+        // hashed, such that neighboring elements use different locks
+        inline wcr_lock& get_wcr_lock(const void *ptr) {
+            static wcr_lock locks[DACE_WCR_LOCK_STRIPES];
+            uint64_t hash = (uint64_t)(uintptr_t)ptr * 0x9E3779B97F4A7C15ULL;
+            return locks[(hash >> 32) % DACE_WCR_LOCK_STRIPES];
+        }
+
+        template <typename T, typename WCR>
+        inline T locked_reduce(WCR wcr, T *ptr, const T& value) {
+            wcr_lock& lock = get_wcr_lock(ptr);
+            lock.lock();
+            T old = *ptr;
+            *ptr = wcr(old, value);
+            lock.unlock();
+            return old;
+        }
+
+        // Compare-and-swap loop on the bit representation of T (stored as U)
+        template <typename T, typename U, typename WCR>
+        inline T cas_reduce(WCR wcr, T *ptr, const T& value) {
+        #if defined(__GNUC__) || defined(__clang__)
+            if ((uintptr_t)ptr % sizeof(U) != 0)  // Misaligned data cannot be swapped atomically
+                return locked_reduce(wcr, ptr, value);
+            U *uptr = (U *)ptr;
+            U expected = __atomic_load_n(uptr, __ATOMIC_RELAXED), desired;
+            T old, result;
+            do {
+                std::memcpy(&old, &expected, sizeof(T));
+                result = wcr(old, value);
+                std::memcpy(&desired, &result, sizeof(T));
+            } while (!__atomic_compare_exchange_n(uptr, &expected, desired, true,
+                                                  __ATOMIC_ACQ_REL, __ATOMIC_RELAXED));
+            return old;
+        #else
+            return locked_reduce(wcr, ptr, value);
+        #endif
+        }
+
+        // Selects an atomic update implementation by the size of T: a
+        // compare-and-swap loop for 4- and 8-byte types, or a striped lock
+        // for all other types
+        template <typename T, size_t SIZE = sizeof(T),
+                  bool TRIVIAL = std::is_trivially_copyable<T>::value>
+        struct atomic_wcr {
+            template <typename WCR>
+            static inline T reduce(WCR wcr, T *ptr, const T& value) {
+                return locked_reduce(wcr, ptr, value);
+            }
+        };
+
+        template <typename T>
+        struct atomic_wcr<T, 4, true> {
+            template <typename WCR>
+            static inline T reduce(WCR wcr, T *ptr, const T& value) {
+                return cas_reduce<T, uint32_t>(wcr, ptr, value);
+            }
+        };
+
+        template <typename T>
+        struct atomic_wcr<T, 8, true> {
+            template <typename WCR>
+            static inline T reduce(WCR wcr, T *ptr, const T& value) {
+                return cas_reduce<T, uint64_t>(wcr, ptr, value);
+            }
+        };
+
+    }  // namespace detail
+
     // Custom reduction with a lambda function
     template <typename T>
     struct wcr_custom {
@@ -59,11 +151,7 @@ namespace dace {
                     old = atomicCAS(ptr, assumed, wcr(assumed, value));
                 } while (assumed != old);
             #else
-                #pragma omp critical
-                {
-                  old = *ptr;
-                  *ptr = wcr(old, value);
-                }
+                old = detail::atomic_wcr<T>::reduce(wcr, ptr, value);
             #endif
 
             return old;
@@ -96,13 +184,7 @@ namespace dace {
                 } while (assumed != old);
                 return __int_as_float(old);
             #else
-                float old;
-                #pragma omp critical
-                {
-                    old = *ptr;
-                    *ptr = wcr(old, value);
-                }
-                return old;
+                return detail::atomic_wcr<float>::reduce(wcr, ptr, value);
             #endif
         }
 
@@ -135,13 +217,7 @@ namespace dace {
                 } while (assumed != old);
                 return __longlong_as_double(old);
             #else
-                double old;
-                #pragma omp critical
-                {
-                    old = *ptr;
-                    *ptr = wcr(old, value);
-                }
-                return old;
+                return detail::atomic_wcr<double>::reduce(wcr, ptr, value);
             #endif
         }
 
@@ -482,13 +558,7 @@ namespace dace {
             #ifdef DACE_USE_GPU_ATOMICS
                 return atomicExch(ptr, value);
             #else
-                T old;
-                #pragma omp critical
-                {
-                    old = *ptr;
-                    *ptr = value;
-                }
-                return old;
+                return detail::atomic_wcr<T>::reduce(_wcr_fixed<ReductionType::Exchange, T>(), ptr, value);
             #endif
         }
 
@@ -497,13 +567,14 @@ namespace dace {
 
     //////////////////////////////////////////////////////////////////////////
 
-    // Specialization that regresses to critical section / locked update for
+    // Specialization that regresses to compare-and-swap / locked update for
     // unsupported types
     template<typename T>
     using EnableIfScalar = typename std::enable_if<std::is_scalar<T>::value>::type;
 
     // Any vector type that is not of length 1, or struct/complex types 
-    // do not support atomics. In these cases, we regress to locked updates.
+    // do not support atomics. In these cases, we regress to compare-and-swap
+    // loops or locked updates.
     template <ReductionType REDTYPE, typename T, typename SFINAE = void>
     struct wcr_fixed
     {
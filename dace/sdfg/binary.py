@@ -0,0 +1,362 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+"""
+Compact binary SDFG format with lazy loading.
+
+The format stores the same element trees as the JSON format (see ``SDFG.to_json``), in a tagged binary encoding in
+which all strings are stored once in a string table, and memlet subsets that appear multiple times are deduplicated.
+The contents of every state (nodes and edges) are stored in a separate section, which is written as soon as the state
+is serialized and deserialized only when the state is first accessed. Nested SDFGs are stored as part of the state
+that contains them, and are thus also loaded on demand.
+
+File layout::
+
+    MAGIC VERSION section* footer footer_offset(8 bytes) MAGIC
+
+where the footer contains the string table, the subset table, the section table, and the index of the root section.
+"""
+import json
+import struct
+from typing import Any, BinaryIO, Dict, List, Tuple
+
+import dace
+import dace.serialize
+from dace.sdfg import nodes as nd
+
+MAGIC = b'DACESDFG'
+VERSION = 1
+
+# Value tags
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT, _SUBSET, _SECTION = range(10)
+
+#: Serialized types that are deduplicated
+_SUBSET_TYPES = ('Range', 'Indices')
+
+_DOUBLE = struct.Struct('<d')
+_OFFSET = struct.Struct('<Q')
+
+
+def _write_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class _SectionReference:
+    """ A reference to a separately-stored section in a binary SDFG file. """
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+class _Writer:
+    """ Streams sections of an SDFG into a file, collecting the string and subset tables for the footer. """
+
+    def __init__(self, fp: BinaryIO):
+        self.fp = fp
+        self.offset = 0
+        self.strings: Dict[str, int] = {}
+        self.subsets: Dict[bytes, int] = {}
+        self.sections: List[Tuple[int, int]] = []
+        self._write(MAGIC + bytes([VERSION]))
+
+    def _write(self, data: bytes):
+        self.fp.write(data)
+        self.offset += len(data)
+
+    def _string(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings[value] = index
+        return index
+
+    def encode(self, obj: Any, out: bytearray):
+        if obj is None:
+            out.append(_NONE)
+        elif obj is True:
+            out.append(_TRUE)
+        elif obj is False:
+            out.append(_FALSE)
+        elif isinstance(obj, str):
+            out.append(_STR)
+            _write_varint(out, self._string(obj))
+        elif isinstance(obj, int):
+            out.append(_INT)
+            _write_varint(out, (obj << 1) if obj >= 0 else ((-obj << 1) - 1))
+        elif isinstance(obj, float):
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(obj)
+        elif isinstance(obj, (list, tuple)):
+            out.append(_LIST)
+            _write_varint(out, len(obj))
+            for value in obj:
+                self.encode(value, out)
+        elif isinstance(obj, dict):
+            if obj.get('type') in _SUBSET_TYPES:
+                encoded = bytearray()
+                self._encode_dict(obj, encoded)
+                encoded = bytes(encoded)
+                index = self.subsets.get(encoded)
+                if index is None:
+                    index = len(self.subsets)
+                    self.subsets[encoded] = index
+                out.append(_SUBSET)
+                _write_varint(out, index)
+            else:
+                self._encode_dict(obj, out)
+        elif isinstance(obj, _SectionReference):
+            out.append(_SECTION)
+            _write_varint(out, obj.index)
+        else:
+            # Same fallback as the JSON format
+            self.encode(dace.serialize.to_json(obj), out)
+
+    def _encode_dict(self, obj: Dict[Any, Any], out: bytearray):
+        out.append(_DICT)
+        _write_varint(out, len(obj))
+        for key, value in obj.items():
+            # Same key conversion as the JSON format
+            _write_varint(out, self._string(key if isinstance(key, str) else json.dumps(key)))
+            self.encode(value, out)
+
+    def write_section(self, obj: Any) -> _SectionReference:
+        """ Encodes and writes a section to the file, returning a reference to it. """
+        data = bytearray()
+        self.encode(obj, data)
+        self.sections.append((self.offset, len(data)))
+        self._write(data)
+        return _SectionReference(len(self.sections) - 1)
+
+    def finalize(self, root: _SectionReference):
+        """ Writes the footer of the file. """
+        footer_offset = self.offset
+        out = bytearray()
+        _write_varint(out, len(self.strings))
+        for string in self.strings:  # Dictionaries maintain insertion (index) order
+            encoded = string.encode('utf-8')
+            _write_varint(out, len(encoded))
+            out += encoded
+        _write_varint(out, len(self.subsets))
+        for subset in self.subsets:
+            _write_varint(out, len(subset))
+            out += subset
+        _write_varint(out, len(self.sections))
+        for offset, length in self.sections:
+            _write_varint(out, offset)
+            _write_varint(out, length)
+        _write_varint(out, root.index)
+        self._write(bytes(out))
+        self._write(_OFFSET.pack(footer_offset) + MAGIC)
+
+    def write_sdfg(self, sdfg: 'dace.SDFG') -> Dict[str, Any]:
+        """
+        Serializes an SDFG, writing the contents of each of its states as a separate section.
+
+        :return: The serialized SDFG without state contents, which refers to the state sections.
+        """
+        tmp = {
+            'type': type(sdfg).__name__,
+            'attributes': dace.serialize.all_properties_to_json(sdfg),
+            'nodes': [self.write_state(state, i) for i, state in enumerate(sdfg.nodes())],
+            'edges': [e.to_json(sdfg) for e in sdfg.edges()],
+            'sdfg_list_id': int(sdfg.sdfg_id),
+            'start_state': sdfg._start_state,
+        }
+        # Ensure properties are serialized correctly
+        tmp['attributes']['constants_prop'] = json.loads(dace.serialize.dumps(tmp['attributes']['constants_prop']))
+        tmp['attributes']['name'] = sdfg.name
+        if int(sdfg.sdfg_id) == 0:
+            tmp['dace_version'] = dace.__version__
+        return tmp
+
+    def write_state(self, state: 'dace.SDFGState', state_id: int) -> Dict[str, Any]:
+        """
+        Serializes an SDFG state, writing its nodes and edges as a separate section.
+
+        :return: The serialized state without its contents, which refers to the contents section.
+        """
+        # Create scope dictionary with a failsafe
+        try:
+            scope_dict = {k: sorted(v) for k, v in sorted(state.scope_children(return_ids=True).items())}
+        except (RuntimeError, ValueError):
+            scope_dict = {}
+
+        # Try to initialize edges before serialization
+        for edge in state.edges():
+            edge.data.try_initialize(state.parent, state, edge)
+
+        nodes = []
+        for node in state.nodes():
+            if isinstance(node, nd.NestedSDFG) and node.sdfg is not None:
+                # Serialize the node without its SDFG, which is written in parts instead
+                nsdfg = node.sdfg
+                node._sdfg = None
+                try:
+                    nodejson = node.to_json(state)
+                finally:
+                    node._sdfg = nsdfg
+                nodejson['attributes']['sdfg'] = self.write_sdfg(nsdfg)
+            else:
+                nodejson = node.to_json(state)
+            nodes.append(nodejson)
+
+        contents = {
+            'scope_dict': scope_dict,
+            'nodes': nodes,
+            'edges':
+            [e.to_json(state) for e in sorted(state.edges(), key=lambda e: (e.src_conn or '', e.dst_conn or ''))],
+        }
+        return {
+            'type': type(state).__name__,
+            'label': state.name,
+            'id': state_id,
+            'collapsed': state.is_collapsed,
+            'attributes': dace.serialize.all_properties_to_json(state),
+            'contents': self.write_section(contents),
+        }
+
+
+class _Reader:
+    """ Decodes sections of a binary SDFG file from memory. """
+
+    def __init__(self, data: bytes, lazy: bool = True):
+        if data[:len(MAGIC)] != MAGIC or data[-len(MAGIC):] != MAGIC:
+            raise ValueError('Not a binary SDFG file')
+        if data[len(MAGIC)] != VERSION:
+            raise ValueError(f'Unsupported binary SDFG format version {data[len(MAGIC)]}')
+        self.data = data
+        self.lazy = lazy
+
+        pos = _OFFSET.unpack_from(data, len(data) - len(MAGIC) - _OFFSET.size)[0]
+        num_strings, pos = self._varint(pos)
+        self.strings: List[str] = []
+        for _ in range(num_strings):
+            length, pos = self._varint(pos)
+            self.strings.append(data[pos:pos + length].decode('utf-8'))
+            pos += length
+        num_subsets, pos = self._varint(pos)
+        self.subsets: List[int] = []
+        for _ in range(num_subsets):
+            length, pos = self._varint(pos)
+            self.subsets.append(pos)
+            pos += length
+        num_sections, pos = self._varint(pos)
+        self.sections: List[int] = []
+        for _ in range(num_sections):
+            offset, pos = self._varint(pos)
+            _, pos = self._varint(pos)
+            self.sections.append(offset)
+        self.root, pos = self._varint(pos)
+
+    def _varint(self, pos: int) -> Tuple[int, int]:
+        data = self.data
+        result = 0
+        shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result, pos
+            shift += 7
+
+    def decode(self, pos: int) -> Tuple[Any, int]:
+        """ Decodes a value starting at the given position, returning the value and the position after it. """
+        data = self.data
+        tag = data[pos]
+        pos += 1
+        if tag == _STR:
+            index, pos = self._varint(pos)
+            return self.strings[index], pos
+        elif tag == _DICT:
+            length, pos = self._varint(pos)
+            result = {}
+            strings = self.strings
+            for _ in range(length):
+                key, pos = self._varint(pos)
+                result[strings[key]], pos = self.decode(pos)
+            return result, pos
+        elif tag == _LIST:
+            length, pos = self._varint(pos)
+            result = [None] * length
+            for i in range(length):
+                result[i], pos = self.decode(pos)
+            return result, pos
+        elif tag == _INT:
+            value, pos = self._varint(pos)
+            return (value >> 1) if not (value & 1) else -((value + 1) >> 1), pos
+        elif tag == _SUBSET:
+            index, pos = self._varint(pos)
+            # Decode a new copy every time, since deserialization may modify the dictionary
+            return self.decode(self.subsets[index])[0], pos
+        elif tag == _NONE:
+            return None, pos
+        elif tag == _TRUE:
+            return True, pos
+        elif tag == _FALSE:
+            return False, pos
+        elif tag == _FLOAT:
+            return _DOUBLE.unpack_from(data, pos)[0], pos + _DOUBLE.size
+        elif tag == _SECTION:
+            index, pos = self._varint(pos)
+            if self.lazy:
+                return _LazySection(self, index), pos
+            return self.section(index), pos
+        raise ValueError(f'Invalid tag {tag} in binary SDFG file at position {pos - 1}')
+
+    def section(self, index: int) -> Any:
+        """ Decodes a section of the file. """
+        return self.decode(self.sections[index])[0]
+
+
+class _LazySection:
+    """ A callable that decodes a section of a binary SDFG file when called. """
+
+    def __init__(self, reader: _Reader, index: int):
+        self.reader = reader
+        self.index = index
+
+    def __call__(self) -> Any:
+        return self.reader.section(self.index)
+
+
+def dump(sdfg: 'dace.SDFG', fp: BinaryIO):
+    """
+    Writes an SDFG to a binary file.
+
+    :param sdfg: The SDFG to write.
+    :param fp: A file object opened for writing in binary mode.
+    """
+    # Location in the SDFG list (only for root SDFG)
+    if sdfg.parent_sdfg is None:
+        sdfg.reset_sdfg_list()
+
+    writer = _Writer(fp)
+    root = writer.write_section(writer.write_sdfg(sdfg))
+    writer.finalize(root)
+
+
+def loads(data: bytes, lazy: bool = True) -> 'dace.SDFG':
+    """
+    Reads an SDFG from the contents of a binary SDFG file.
+
+    :param data: The file contents.
+    :param lazy: If True, the contents of each state (including nested SDFGs) are only deserialized when the state is
+                 first accessed.
+    :return: The loaded SDFG.
+    """
+    reader = _Reader(data, lazy)
+    return dace.SDFG.from_json(reader.section(reader.root))
+
+
+def load(fp: BinaryIO, lazy: bool = True) -> 'dace.SDFG':
+    """
+    Reads an SDFG from a binary file.
+
+    :param fp: A file object opened for reading in binary mode.
+    :param lazy: If True, the contents of each state (including nested SDFGs) are only deserialized when the state is
+                 first accessed.
+    :return: The loaded SDFG.
+    """
+    return loads(fp.read(), lazy)
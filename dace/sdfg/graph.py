@@ -6,7 +6,7 @@ import itertools
 import networkx as nx
 from dace.dtypes import deduplicate
 import dace.serialize
-from typing import Any, Callable, Generic, Iterable, List, Sequence, TypeVar, Union
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 
 
 class NodeNotFoundError(Exception):
@@ -617,31 +617,88 @@ class OrderedDiGraph(Graph[NodeT, EdgeT], Generic[NodeT, EdgeT]):
     """ Directed graph where nodes and edges are returned in the order they
         were added. """
     def __init__(self):
-        self._nx = nx.DiGraph()
+        # networkx view of the graph, built on first access (see ``nx``)
+        self._nx_view: Optional[nx.DiGraph] = None
+        # Incremented whenever nodes or edges are added or removed
+        self._structure_version = 0
+        # {node class: {node: None}}, maintained on insertion and removal
+        self._type_index: Dict[type, Dict[NodeT, None]] = {}
         # {node: ({in edge: None}, {out edges: None})}
         self._nodes = OrderedDict()
         # {(src, dst): edge}
         self._edges = OrderedDict()
+        self._reset_node_index()
 
     @property
     def nx(self):
+        """ Returns a networkx version of this graph. The view is created on
+            first access and cached until the graph is next modified. """
         return self._nx
 
+    @property
+    def _nx(self):
+        if self._nx_view is None:
+            self._nx_view = self._build_nx()
+        return self._nx_view
+
+    @property
+    def structure_version(self) -> int:
+        """ Returns a counter that changes whenever nodes or edges are added
+            to or removed from the graph. Can be used to detect whether
+            structural information computed on the graph is still valid. """
+        return self._structure_version
+
+    def _structure_changed(self):
+        self._nx_view = None
+        self._structure_version += 1
+
+    def _build_nx(self):
+        result = nx.DiGraph()
+        result.add_nodes_from(self._nodes.keys())
+        result.add_edges_from((e.src, e.dst, {'data': e.data}) for e in self._edges.values())
+        return result
+
+    def _reset_node_index(self):
+        # Node ID index, maintained on insertion and lazily rebuilt after removal
+        self._node_list: List[NodeT] = list(self._nodes.keys())
+        self._node_index: Optional[Dict[NodeT, int]] = {n: i for i, n in enumerate(self._node_list)}
+
+    def _get_node_index(self) -> Dict[NodeT, int]:
+        if self._node_index is None:
+            self._reset_node_index()
+        return self._node_index
+
     def node(self, id: int) -> NodeT:
-        try:
-            return next(n for i, n in enumerate(self._nodes.keys()) if i == id)
-        except StopIteration:
+        self._get_node_index()
+        if id < 0 or id >= len(self._node_list):
             raise NodeNotFoundError
+        return self._node_list[id]
 
     def node_id(self, node: NodeT) -> int:
         try:
-            return next(i for i, n in enumerate(self._nodes.keys()) if n is node)
-        except StopIteration:
+            return self._get_node_index()[node]
+        except (KeyError, TypeError):
             raise NodeNotFoundError(node)
 
     def nodes(self) -> List[NodeT]:
         return list(self._nodes.keys())
 
+    def nodes_of_type(self, node_type: Union[Type, Tuple[Type, ...]]) -> List[NodeT]:
+        """ Returns the nodes that are instances of the given type (or tuple
+            of types), in the order of ``nodes()``. Uses an index of nodes by
+            class, such that the cost depends on the number of matching nodes
+            rather than on the size of the graph. """
+        groups = [nodes for cls, nodes in self._type_index.items() if issubclass(cls, node_type)]
+        if len(groups) == 1:
+            return list(groups[0])
+        node_index = self._get_node_index()
+        return sorted((node for nodes in groups for node in nodes), key=node_index.__getitem__)
+
+    def number_of_nodes_of_type(self, node_type: Union[Type, Tuple[Type, ...]]) -> int:
+        """ Returns the number of nodes that are instances of the given type
+            (or tuple of types). """
+        return sum(len(nodes) for cls, nodes in self._type_index.items() if issubclass(cls, node_type))
+
     def edges(self) -> List[Edge[EdgeT]]:
         return list(self._edges.values())
 
@@ -655,7 +712,11 @@ class OrderedDiGraph(Graph[NodeT, EdgeT], Generic[NodeT, EdgeT]):
         if node in self._nodes:
             raise RuntimeError("Duplicate node added")
         self._nodes[node] = (OrderedDict(), OrderedDict())
-        self._nx.add_node(node)
+        self._type_index.setdefault(type(node), {})[node] = None
+        if self._node_index is not None:
+            self._node_index[node] = len(self._node_list)
+            self._node_list.append(node)
+        self._structure_changed()
 
     def add_edge(self, src: NodeT, dst: NodeT, data: EdgeT = None):
         t = (src, dst)
@@ -669,14 +730,19 @@ class OrderedDiGraph(Graph[NodeT, EdgeT], Generic[NodeT, EdgeT]):
         self._edges[t] = edge
         self._nodes[src][1][t] = edge
         self._nodes[dst][0][t] = edge
-        return self._nx.add_edge(src, dst, data=data)
+        self._structure_changed()
 
     def remove_node(self, node: NodeT):
         try:
             for edge in itertools.chain(self.in_edges(node), self.out_edges(node)):
                 self.remove_edge(edge)
             del self._nodes[node]
-            self._nx.remove_node(node)
+            same_type = self._type_index[type(node)]
+            del same_type[node]
+            if not same_type:
+                del self._type_index[type(node)]
+            self._node_index = None
+            self._structure_changed()
         except KeyError:
             pass
 
@@ -684,16 +750,16 @@ class OrderedDiGraph(Graph[NodeT, EdgeT], Generic[NodeT, EdgeT]):
         src = edge.src
         dst = edge.dst
         t = (src, dst)
-        self._nx.remove_edge(src, dst)
         del self._nodes[src][1][t]
         del self._nodes[dst][0][t]
         del self._edges[t]
+        self._structure_changed()
 
     def in_degree(self, node):
-        return self._nx.in_degree(node)
+        return len(self._nodes[node][0])
 
     def out_degree(self, node):
-        return self._nx.out_degree(node)
+        return len(self._nodes[node][1])
 
     def number_of_nodes(self):
         return len(self._nodes)
@@ -732,15 +798,30 @@ class OrderedMultiDiGraph(OrderedDiGraph[NodeT, EdgeT], Generic[NodeT, EdgeT]):
     """ Directed multigraph where nodes and edges are returned in the order
         they were added. """
     def __init__(self):
-        self._nx = nx.MultiDiGraph()
+        self._nx_view: Optional[nx.MultiDiGraph] = None
+        self._structure_version = 0
+        self._type_index: Dict[type, Dict[NodeT, None]] = {}
         # {node: ({in edge: edge}, {out edge: edge})}
         self._nodes = OrderedDict()
         # {edge: edge}
         self._edges = OrderedDict()
+        # Counter for unique multigraph edge keys
+        self._num_edge_keys = 0
+        self._reset_node_index()
+
+    def _build_nx(self) -> nx.MultiDiGraph:
+        result = nx.MultiDiGraph()
+        result.add_nodes_from(self._nodes.keys())
+        result.add_edges_from((e.src, e.dst, e.key, {'data': e.data}) for e in self._edges.values())
+        return result
+
+    def _new_edge_key(self) -> int:
+        key = self._num_edge_keys
+        self._num_edge_keys += 1
+        return key
 
     def add_edge(self, src: NodeT, dst: NodeT, data: EdgeT) -> MultiEdge[EdgeT]:
-        key = self._nx.add_edge(src, dst, data=data)
-        edge = MultiEdge(src, dst, data, key)
+        edge = MultiEdge(src, dst, data, self._new_edge_key())
         if src not in self._nodes:
             self.add_node(src)
         if dst not in self._nodes:
@@ -748,13 +829,14 @@ class OrderedMultiDiGraph(OrderedDiGraph[NodeT, EdgeT], Generic[NodeT, EdgeT]):
         self._nodes[src][1][edge] = edge
         self._nodes[dst][0][edge] = edge
         self._edges[edge] = edge
+        self._structure_changed()
         return edge
 
     def remove_edge(self, edge: MultiEdge[EdgeT]):
         del self._edges[edge]
         del self._nodes[edge.src][1][edge]
         del self._nodes[edge.dst][0][edge]
-        self._nx.remove_edge(edge.src, edge.dst, edge.key)
+        self._structure_changed()
 
     def in_edges(self, node) -> List[MultiEdge[EdgeT]]:
         return super().in_edges(node)
@@ -766,11 +848,11 @@ class OrderedMultiDiGraph(OrderedDiGraph[NodeT, EdgeT], Generic[NodeT, EdgeT]):
         return super().edges_between(source, destination)
 
     def reverse(self) -> None:
-        self._nx.reverse(False)
         for e in self._edges.keys():
             e.reverse()
         for n, (in_edges, out_edges) in self._nodes.items():
             self._nodes[n] = (out_edges, in_edges)
+        self._structure_changed()
 
     def is_multigraph(self) -> bool:
         return True
@@ -782,9 +864,18 @@ class OrderedMultiDiConnectorGraph(OrderedMultiDiGraph[NodeT, EdgeT], Generic[No
     def __init__(self):
         super().__init__()
 
+    def _build_nx(self) -> nx.MultiDiGraph:
+        result = nx.MultiDiGraph()
+        result.add_nodes_from(self._nodes.keys())
+        result.add_edges_from((e.src, e.dst, e.key, {
+            'data': e.data,
+            'src_conn': e.src_conn,
+            'dst_conn': e.dst_conn
+        }) for e in self._edges.values())
+        return result
+
     def add_edge(self, src: NodeT, src_conn: str, dst: NodeT, dst_conn: str, data: EdgeT) -> MultiConnectorEdge[EdgeT]:
-        key = self._nx.add_edge(src, dst, data=data, src_conn=src_conn, dst_conn=dst_conn)
-        edge = MultiConnectorEdge(src, src_conn, dst, dst_conn, data, key)
+        edge = MultiConnectorEdge(src, src_conn, dst, dst_conn, data, self._new_edge_key())
         if src not in self._nodes:
             self.add_node(src)
         if dst not in self._nodes:
@@ -792,6 +883,7 @@ class OrderedMultiDiConnectorGraph(OrderedMultiDiGraph[NodeT, EdgeT], Generic[No
         self._nodes[src][1][edge] = edge
         self._nodes[dst][0][edge] = edge
         self._edges[edge] = edge
+        self._structure_changed()
         return edge
 
     def add_nedge(self, src: NodeT, dst: NodeT, data: EdgeT) -> MultiConnectorEdge[EdgeT]:
@@ -802,14 +894,14 @@ class OrderedMultiDiConnectorGraph(OrderedMultiDiGraph[NodeT, EdgeT], Generic[No
         del self._edges[edge]
         del self._nodes[edge.src][1][edge]
         del self._nodes[edge.dst][0][edge]
-        self._nx.remove_edge(edge.src, edge.dst, edge.key)
+        self._structure_changed()
 
     def reverse(self) -> None:
-        self._nx.reverse(False)
         for e in self._edges.keys():
             e.reverse()
         for n, (in_edges, out_edges) in self._nodes.items():
             self._nodes[n] = (out_edges, in_edges)
+        self._structure_changed()
 
     def in_edges(self, node) -> List[MultiConnectorEdge[EdgeT]]:
         return super().in_edges(node)
@@ -4,12 +4,14 @@ Functionality relating to Memlet propagation (deducing external memlets
 from internal memory accesses and scope ranges).
 """
 
-from collections import deque
+from collections import deque, OrderedDict
 import copy
+from dataclasses import dataclass
 from dace.symbolic import issymbolic, pystr_to_symbolic, simplify
 import itertools
 import functools
 import sympy
+import time
 from sympy import ceiling
 from sympy.concrete.summations import Sum
 import warnings
@@ -18,7 +20,57 @@ import networkx as nx
 from dace import registry, subsets, symbolic, dtypes, data
 from dace.memlet import Memlet
 from dace.sdfg import nodes, graph as gr
-from typing import List, Set
+from typing import Any, Hashable, List, Optional, Set, Tuple
+
+
+@dataclass
+class PropagationStatistics:
+    """ Statistics on memlet propagation in this process (see ``get_propagation_statistics``). """
+    #: Total time spent in memlet and state propagation, in seconds
+    time: float = 0.0
+    #: Number of subsets propagated through scopes
+    subsets: int = 0
+    #: Number of propagated subsets that were reused from the propagation cache
+    cache_hits: int = 0
+
+
+_statistics = PropagationStatistics()
+_propagation_depth = 0
+
+#: Maximal number of propagation results kept in the cache
+PROPAGATION_CACHE_SIZE = 16384
+
+# Results of ``propagate_subset`` (subset, volume, dynamic), keyed by a snapshot of the inputs that determine them
+_propagation_cache: 'OrderedDict[Hashable, Tuple[subsets.Subset, Any, bool]]' = OrderedDict()
+
+
+def get_propagation_statistics() -> PropagationStatistics:
+    """ Returns the (cumulative) memlet propagation statistics of this process. """
+    return _statistics
+
+
+def clear_propagation_cache():
+    """ Clears the cache of propagated subsets. """
+    _propagation_cache.clear()
+
+
+def _timed(func):
+    """ Adds the time spent in an outermost call of a propagation function to the propagation statistics. """
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        global _propagation_depth
+        if _propagation_depth > 0:
+            return func(*args, **kwargs)
+        _propagation_depth += 1
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _statistics.time += time.perf_counter() - start
+            _propagation_depth -= 1
+
+    return timed
 
 
 @registry.make_registry
@@ -668,6 +720,7 @@ def _annotate_loop_ranges(sdfg, unannotated_cycle_states):
             unannotated_cycle_states.extend(cycle)
 
 
+@_timed
 def propagate_states(sdfg) -> None:
     """
     Annotate the states of an SDFG with the number of executions.
@@ -906,6 +959,7 @@ def propagate_states(sdfg) -> None:
         sdfg.remove_node(temp_exit_state)
 
 
+@_timed
 def propagate_memlets_nested_sdfg(parent_sdfg, parent_state, nsdfg_node):
     """
     Propagate memlets out of a nested sdfg.
@@ -1111,6 +1165,7 @@ def reset_state_annotations(sdfg):
         state.itervar = None
 
 
+@_timed
 def propagate_memlets_sdfg(sdfg):
     """ Propagates memlets throughout an entire given SDFG. 
     
@@ -1125,6 +1180,7 @@ def propagate_memlets_sdfg(sdfg):
     propagate_states(sdfg)
 
 
+@_timed
 def propagate_memlets_state(sdfg, state):
     """ Propagates memlets throughout one SDFG state.
 
@@ -1169,6 +1225,7 @@ def propagate_memlets_state(sdfg, state):
     propagate_memlets_scope(sdfg, state, state.scope_leaves())
 
 
+@_timed
 def propagate_memlets_scope(sdfg, state, scopes, propagate_entry=True, propagate_exit=True):
     """ 
     Propagate memlets from the given scopes outwards. 
@@ -1224,16 +1281,37 @@ def _propagate_node(dfg_state, node):
         geteconn = lambda e: e.src_conn[4:]
         use_dst = True
 
+    # Symbols defined at the scope are computed once for all of its edges
+    defined_vars = None
     for edge in external_edges:
         if edge.data.is_empty():
             new_memlet = Memlet()
         else:
+            if defined_vars is None:
+                entry_node = node if isinstance(node, nodes.EntryNode) else dfg_state.entry_node(node)
+                defined_vars = _defined_variables(dfg_state, entry_node)
             internal_edge = next(e for e in internal_edges if geticonn(e) == geteconn(edge))
             aligned_memlet = align_memlet(dfg_state, internal_edge, dst=use_dst)
-            new_memlet = propagate_memlet(dfg_state, aligned_memlet, node, True, connector=geteconn(edge))
+            new_memlet = propagate_memlet(dfg_state,
+                                          aligned_memlet,
+                                          node,
+                                          True,
+                                          connector=geteconn(edge),
+                                          defined_variables=defined_vars)
         edge.data = new_memlet
 
 
+def _defined_variables(dfg_state, entry_node: nodes.EntryNode) -> List[symbolic.SymbolicType]:
+    """ Returns the symbols that remain constant throughout the given scope (i.e., are not defined by it). """
+    sdfg = dfg_state.parent
+    scope_node_symbols = set(conn for conn in entry_node.in_connectors if not conn.startswith('IN_'))
+    return [
+        symbolic.pystr_to_symbolic(s)
+        for s in (dfg_state.symbols_defined_at(entry_node).keys() | sdfg.constants.keys())
+        if s not in scope_node_symbols
+    ]
+
+
 def align_memlet(state, e: gr.MultiConnectorEdge[Memlet], dst: bool) -> Memlet:
     is_src = e.data._is_data_src
     # Memlet is already aligned
@@ -1261,12 +1339,14 @@ def align_memlet(state, e: gr.MultiConnectorEdge[Memlet], dst: bool) -> Memlet:
 
 
 # External API
+@_timed
 def propagate_memlet(dfg_state,
                      memlet: Memlet,
                      scope_node: nodes.EntryNode,
                      union_inner_edges: bool,
                      arr=None,
-                     connector=None):
+                     connector=None,
+                     defined_variables: Optional[List[symbolic.SymbolicType]] = None):
     """ Tries to propagate a memlet through a scope (computes the image of 
         the memlet function applied on an integer set of, e.g., a map range) 
         and returns a new memlet object.
@@ -1277,6 +1357,8 @@ def propagate_memlet(dfg_state,
         :param union_inner_edges: True if the propagation should take other
                                   neighboring internal memlets within the same
                                   scope into account.
+        :param defined_variables: The symbols that remain constant throughout
+                                  the scope, if already known.
     """
     use_dst = False
     if isinstance(scope_node, nodes.EntryNode):
@@ -1297,11 +1379,10 @@ def propagate_memlet(dfg_state,
         return Memlet()
 
     sdfg = dfg_state.parent
-    scope_node_symbols = set(conn for conn in entry_node.in_connectors if not conn.startswith('IN_'))
-    defined_vars = [
-        symbolic.pystr_to_symbolic(s) for s in (dfg_state.symbols_defined_at(entry_node).keys()
-                                                | sdfg.constants.keys()) if s not in scope_node_symbols
-    ]
+    if defined_variables is not None:
+        defined_vars = defined_variables
+    else:
+        defined_vars = _defined_variables(dfg_state, entry_node)
 
     # Find other adjacent edges within the connected to the scope node
     # and union their subsets
@@ -1345,6 +1426,7 @@ def propagate_memlet(dfg_state,
 
 
 # External API
+@_timed
 def propagate_subset(memlets: List[Memlet],
                      arr: data.Data,
                      params: List[str],
@@ -1367,6 +1449,10 @@ def propagate_subset(memlets: List[Memlet],
         :param use_dst: Whether to propagate the memlets' dst subset or use the
                         src instead, depending on propagation direction.
         :return: Memlet with propagated subset and volume.
+        :note: Results are cached by the propagated subsets, volumes, array
+               extents, range and defined variables, such that propagating
+               the same memlets through the same range again (e.g., after a
+               change elsewhere in the SDFG) does not recompute them.
     """
     # Argument handling
     if defined_variables is None:
@@ -1378,6 +1464,77 @@ def propagate_subset(memlets: List[Memlet],
         defined_variables -= set(params)
         defined_variables = set(symbolic.pystr_to_symbolic(p) for p in defined_variables)
 
+    _statistics.subsets += 1
+    key = _propagation_key(memlets, arr, params, rng, defined_variables, use_dst)
+    cached = _propagation_cache.get(key) if key is not None else None
+    if cached is not None:
+        _propagation_cache.move_to_end(key)
+        _statistics.cache_hits += 1
+        new_subset, volume, dynamic = cached
+        new_memlet = copy.copy(memlets[0])
+        new_memlet.subset = _copy_subset(new_subset)
+        new_memlet.other_subset = None
+        new_memlet.volume = volume
+        new_memlet.dynamic = dynamic
+        return new_memlet
+
+    new_memlet = _propagate_subset(memlets, arr, params, rng, defined_variables, use_dst)
+
+    if key is not None:
+        _propagation_cache[key] = (_copy_subset(new_memlet.subset), new_memlet.volume, new_memlet.dynamic)
+        if len(_propagation_cache) > PROPAGATION_CACHE_SIZE:
+            _propagation_cache.popitem(last=False)
+
+    return new_memlet
+
+
+def _memlet_subset(md: Memlet, use_dst: bool) -> subsets.Subset:
+    """ Returns the subset of a memlet that is propagated. """
+    if use_dst and md.dst_subset is not None:
+        return md.dst_subset
+    elif not use_dst and md.src_subset is not None:
+        return md.src_subset
+    return md.subset
+
+
+def _subset_key(subset: Optional[subsets.Subset]) -> Hashable:
+    """ Returns an immutable snapshot of a subset, or raises a TypeError if the subset type is not supported. """
+    if subset is None:
+        return None
+    if isinstance(subset, subsets.Range):
+        return (subsets.Range, tuple(tuple(r) for r in subset.ranges), tuple(subset.tile_sizes))
+    if isinstance(subset, subsets.Indices):
+        return (subsets.Indices, tuple(subset.indices))
+    raise TypeError(f'Unsupported subset type {type(subset).__name__}')
+
+
+def _propagation_key(memlets: List[Memlet], arr: data.Data, params: List[str], rng: subsets.Subset,
+                     defined_variables: Set[symbolic.SymbolicType], use_dst: bool) -> Optional[Hashable]:
+    """ Returns the key of a propagation in the cache, or None if it cannot be cached. """
+    try:
+        key = (tuple((md.is_empty(), None if md.is_empty() else _subset_key(_memlet_subset(md, use_dst)), md.volume,
+                      md.dynamic) for md in memlets), type(arr), tuple(arr.shape), tuple(arr.offset),
+               tuple(str(p) for p in params), _subset_key(rng), frozenset(defined_variables), use_dst,
+               len(MemletPattern.extensions()), len(SeparableMemletPattern.extensions()))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _copy_subset(subset: subsets.Subset) -> subsets.Subset:
+    """ Copies a subset such that modifying the copy in-place does not modify the original. """
+    if isinstance(subset, subsets.Range):
+        result = copy.copy(subset)
+        result.ranges = list(subset.ranges)
+        result.tile_sizes = list(subset.tile_sizes)
+        return result
+    return copy.deepcopy(subset)
+
+
+def _propagate_subset(memlets: List[Memlet], arr: data.Data, params: List[str], rng: subsets.Subset,
+                      defined_variables: Set[symbolic.SymbolicType], use_dst: bool) -> Memlet:
+    """ Uncached implementation of ``propagate_subset``. """
     # Propagate subset
     variable_context = [defined_variables, [symbolic.pystr_to_symbolic(p) for p in params]]
 
@@ -1388,13 +1545,7 @@ def propagate_subset(memlets: List[Memlet],
 
         tmp_subset = None
 
-        subset = None
-        if use_dst and md.dst_subset is not None:
-            subset = md.dst_subset
-        elif not use_dst and md.src_subset is not None:
-            subset = md.src_subset
-        else:
-            subset = md.subset
+        subset = _memlet_subset(md, use_dst)
 
         for pclass in MemletPattern.extensions():
             pattern = pclass()
@@ -1,6 +1,7 @@
 # Copyright 2019-2021 ETH Zurich and the DaCe authors. All rights reserved.
 import ast
 import collections
+import concurrent.futures
 import copy
 import ctypes
 import itertools
@@ -30,7 +31,7 @@ from dace.config import Config
 from dace.frontend.python import astutils, wrappers
 from dace.sdfg import nodes as nd
 from dace.sdfg.graph import OrderedDiGraph, Edge, SubgraphView
-from dace.sdfg.state import SDFGState
+from dace.sdfg.state import SDFGState, _remove_hash_keywords
 from dace.sdfg.propagation import propagate_memlets_sdfg
 from dace.distr_types import ProcessGrid, SubArray, RedistrArray
 from dace.dtypes import validate_name
@@ -356,6 +357,10 @@ class SDFG(OrderedDiGraph[SDFGState, InterstateEdge]):
     openmp_sections = Property(dtype=bool,
                                default=Config.get_bool('compiler', 'cpu', 'openmp_sections'),
                                desc='Whether to generate OpenMP sections in code')
+    pool_transients = Property(dtype=bool,
+                               default=Config.get_bool('compiler', 'cpu', 'pool_transients'),
+                               desc='Whether to allocate CPU heap transients from a memory pool that persists '
+                               'across invocations')
 
     debuginfo = DebugInfoProperty(allow_none=True)
 
@@ -466,7 +471,7 @@ class SDFG(OrderedDiGraph[SDFGState, InterstateEdge]):
 
         tmp['attributes']['name'] = self.name
         if hash:
-            tmp['attributes']['hash'] = self.hash_sdfg(tmp)
+            tmp['attributes']['hash'] = self.hash_sdfg()
 
         if int(self.sdfg_id) == 0:
             tmp['dace_version'] = dace.__version__
@@ -514,46 +519,47 @@ class SDFG(OrderedDiGraph[SDFGState, InterstateEdge]):
         """
         Returns a hash of the current SDFG, without considering IDs and attribute names.
 
+        Unless a JSON dictionary is given, the hash is computed in a Merkle-tree fashion from the SDFG attributes,
+        its state machine, and the hashes of its states (see ``SDFGState.hash_state``). Since the hashes of nodes and
+        edges are cached until they are modified, rehashing an SDFG after a local change only reserializes the
+        modified nodes and edges.
+
         :param jsondict: If not None, uses given JSON dictionary as input.
         :return: The hash (in SHA-256 format).
         """
+        if jsondict is not None:
+            # Clean SDFG of nonstandard objects
+            jsondict = json.loads(json.dumps(jsondict))
+            _remove_hash_keywords(jsondict)  # Make non-unique in SDFG hierarchy
+            string_representation = json.dumps(jsondict)  # dict->str
+            return sha256(string_representation.encode('utf-8')).hexdigest()
+
+        # Skip serializing properties that are removed for hashing anyway
+        attributes = {
+            prop.attr_name: prop.to_json(value)
+            for prop, value in self.properties() if prop.attr_name not in ('orig_sdfg', 'transformation_hist')
+            and not (prop.optional and not prop.optional_condition(self))
+        }
+        attributes['constants_prop'] = json.loads(dace.serialize.dumps(attributes['constants_prop']))
+        jsondict = {
+            'type': type(self).__name__,
+            'attributes': attributes,
+            'nodes': [state.hash_state() for state in self.nodes()],
+            'edges': [e.to_json(self) for e in self.edges()],
+            'start_state': self._start_state,
+        }
+        _remove_hash_keywords(jsondict)
+        string_representation = json.dumps(jsondict)
+        return sha256(string_representation.encode('utf-8')).hexdigest()
 
-        def keyword_remover(json_obj: Any, last_keyword=""):
-            # Makes non-unique in SDFG hierarchy v2
-            # Recursively remove attributes from the SDFG which are not used in
-            # uniquely representing the SDFG. This, among other things, includes
-            # the hash, name, transformation history, and meta attributes.
-            if isinstance(json_obj, dict):
-                if 'sdfg_list_id' in json_obj:
-                    del json_obj['sdfg_list_id']
-
-                keys_to_delete = []
-                kv_to_recurse = []
-                for key, value in json_obj.items():
-                    if (isinstance(key, str)
-                            and (key.startswith('_meta_')
-                                 or key in ['name', 'hash', 'orig_sdfg', 'transformation_hist', 'instrument'])):
-                        keys_to_delete.append(key)
-                    else:
-                        kv_to_recurse.append((key, value))
-
-                for key in keys_to_delete:
-                    del json_obj[key]
-
-                for key, value in kv_to_recurse:
-                    keyword_remover(value, last_keyword=key)
-            elif isinstance(json_obj, (list, tuple)):
-                for value in json_obj:
-                    keyword_remover(value)
-
-        # Clean SDFG of nonstandard objects
-        jsondict = (json.loads(json.dumps(jsondict)) if jsondict is not None else self.to_json())
-
-        keyword_remover(jsondict)  # Make non-unique in SDFG hierarchy
+    def invalidate_hash(self):
+        """
+        Clears the cached structural hashes of all states in this SDFG and its nested SDFGs.
 
-        string_representation = json.dumps(jsondict)  # dict->str
-        hsh = sha256(string_representation.encode('utf-8'))
-        return hsh.hexdigest()
+        :see: SDFGState.invalidate_hash
+        """
+        for state in self.nodes():
+            state.invalidate_hash()
 
     @property
     def arrays(self):
@@ -1435,7 +1441,13 @@ class SDFG(OrderedDiGraph[SDFGState, InterstateEdge]):
 
         return dtypes.deduplicate(shared)
 
-    def save(self, filename: str, use_pickle=False, hash=None, exception=None, compress=False) -> Optional[str]:
+    def save(self,
+             filename: str,
+             use_pickle=False,
+             hash=None,
+             exception=None,
+             compress=False,
+             binary=False) -> Optional[str]:
         """ Save this SDFG to a file.
 
             :param filename: File name to save to.
@@ -1446,6 +1458,8 @@ class SDFG(OrderedDiGraph[SDFGState, InterstateEdge]):
             :param exception: If not None, stores error information along with
                               SDFG.
             :param compress: If True, uses gzip to compress the file upon saving.
+            :param binary: Use the compact binary SDFG format, which supports
+                           lazy loading (see ``dace.sdfg.binary``).
             :return: The hash of the SDFG, or None if failed/not requested.
         """
         if compress:
@@ -1463,6 +1477,12 @@ class SDFG(OrderedDiGraph[SDFGState, InterstateEdge]):
                 symbolic.SympyAwarePickler(fp).dump(self)
             if hash is True:
                 return self.hash_sdfg()
+        elif binary:
+            from dace.sdfg import binary as sdfg_binary  # Avoid import loop
+            with fileopen(filename, "wb") as fp:
+                sdfg_binary.dump(self, fp)
+            if hash is True:
+                return self.hash_sdfg()
         else:
             hash = True if hash is None else hash
             with fileopen(filename, "w") as fp:
@@ -1485,12 +1505,16 @@ class SDFG(OrderedDiGraph[SDFGState, InterstateEdge]):
         view(self, filename=filename)
 
     @staticmethod
-    def _from_file(fp: BinaryIO) -> 'SDFG':
-        firstbyte = fp.read(1)
+    def _from_file(fp: BinaryIO, lazy: bool = True) -> 'SDFG':
+        from dace.sdfg import binary as sdfg_binary  # Avoid import loop
+
+        header = fp.read(len(sdfg_binary.MAGIC))
         fp.seek(0)
-        if firstbyte == b'{':  # JSON file
+        if header[:1] == b'{':  # JSON file
             sdfg_json = json.load(fp)
             sdfg = SDFG.from_json(sdfg_json)
+        elif header == sdfg_binary.MAGIC:  # Binary SDFG file
+            sdfg = sdfg_binary.load(fp, lazy=lazy)
         else:  # Pickle
             sdfg = symbolic.SympyAwareUnpickler(fp).load()
 
@@ -1499,20 +1523,23 @@ class SDFG(OrderedDiGraph[SDFGState, InterstateEdge]):
         return sdfg
 
     @staticmethod
-    def from_file(filename: str) -> 'SDFG':
+    def from_file(filename: str, lazy: bool = True) -> 'SDFG':
         """ Constructs an SDFG from a file.
 
             :param filename: File name to load SDFG from.
+            :param lazy: If True and the file is in the binary SDFG format,
+                         the contents of each state are only loaded when
+                         the state is first accessed.
             :return: An SDFG.
         """
         # Try compressed first. If fails, try uncompressed
         try:
             with gzip.open(filename, 'rb') as fp:
-                return SDFG._from_file(fp)
+                return SDFG._from_file(fp, lazy)
         except OSError:
             pass
         with open(filename, "rb") as fp:
-            return SDFG._from_file(fp)
+            return SDFG._from_file(fp, lazy)
 
     # Dynamic SDFG creation API
     ##############################
@@ -2166,28 +2193,35 @@ class SDFG(OrderedDiGraph[SDFGState, InterstateEdge]):
         dll = cs.ReloadableDLL(binary_filename, self.name)
         return dll.is_loaded()
 
-    def compile(self, output_file=None, validate=True) -> \
-            'dace.codegen.compiler.CompiledSDFG':
-        """ Compiles a runnable binary from this SDFG.
+    def _load_cached_binary(self, build_folder: str) -> Optional['dace.codegen.compiled_sdfg.CompiledSDFG']:
+        """ Loads the existing binary of this SDFG from the given build folder, unless recompilation is required.
+            Holds the build folder lock (see ``compiler.get_build_folder_lock``) while checking and loading.
 
-            :param output_file: If not None, copies the output library file to
-                                the specified path.
-            :param validate: If True, validates the SDFG prior to generating
-                             code.
-            :return: A callable CompiledSDFG object.
+            :param build_folder: The build folder to load the binary from.
+            :return: The loaded CompiledSDFG object, or None if no binary can be reused.
         """
-
         # Importing these outside creates an import loop
-        from dace.codegen import codegen, compiler
+        from dace.codegen import compiler
+
+        with compiler.get_build_folder_lock(build_folder):
+            if not self._recompile or Config.get_bool('compiler', 'use_cache'):
+                # Try to see if a cached version of the binary exists
+                binary_filename = compiler.get_binary_name(build_folder, self.name)
+                if os.path.isfile(binary_filename):
+                    return compiler.load_from_file(self, binary_filename)
+        return None
 
-        # Compute build folder path before running codegen
-        build_folder = self.build_folder
+    def _generate_program_folder(self, build_folder: str, validate: bool = True) -> Tuple['SDFG', str]:
+        """ Generates code for this SDFG and writes the program folder to build, unless code regeneration is
+            disabled and the folder already exists.
 
-        if not self._recompile or Config.get_bool('compiler', 'use_cache'):
-            # Try to see if a cached version of the binary exists
-            binary_filename = compiler.get_binary_name(build_folder, self.name)
-            if os.path.isfile(binary_filename):
-                return compiler.load_from_file(self, binary_filename)
+            :param build_folder: The folder to write the program to.
+            :param validate: If True, validates the SDFG prior to generating code.
+            :return: A 2-tuple of the SDFG the code was generated from (potentially a renamed copy of this SDFG) and
+                     the program folder.
+        """
+        # Importing these outside creates an import loop
+        from dace.codegen import codegen, compiler
 
         ############################
         # DaCe Compilation Process #
@@ -2208,34 +2242,84 @@ class SDFG(OrderedDiGraph[SDFGState, InterstateEdge]):
                 warnings.warn('SDFG "%s" is already loaded by another object, '
                             'recompiling under a different name.' % self.name)
 
-            try:
-                # Fill in scope entry/exit connectors
-                sdfg.fill_scope_connectors()
+            # Code generation is not thread-safe, serialize it with background compilations
+            with compiler.codegen_lock:
+                try:
+                    # Fill in scope entry/exit connectors
+                    sdfg.fill_scope_connectors()
 
-                # Generate code for the program by traversing the SDFG state by state
-                program_objects = codegen.generate_code(sdfg, validate=validate)
-            except Exception:
-                self.save(os.path.join('_dacegraphs', 'failing.sdfg'))
-                raise
+                    # Generate code for the program by traversing the SDFG state by state
+                    program_objects = codegen.generate_code(sdfg, validate=validate)
+                except Exception:
+                    self.save(os.path.join('_dacegraphs', 'failing.sdfg'))
+                    raise
 
-            # Generate the program folder and write the source files
-            program_folder = compiler.generate_program_folder(sdfg, program_objects, build_folder)
+                # Generate the program folder and write the source files
+                program_folder = compiler.generate_program_folder(sdfg, program_objects, build_folder)
         else:
             # The code was already generated, just load the program folder
             program_folder = build_folder
             sdfg = self
 
-        # Compile the code and get the shared library path
-        shared_library = compiler.configure_and_compile(program_folder, sdfg.name)
+        return sdfg, program_folder
+
+    def compile(self, output_file=None, validate=True) -> \
+            'dace.codegen.compiler.CompiledSDFG':
+        """ Compiles a runnable binary from this SDFG.
+
+            :param output_file: If not None, copies the output library file to
+                                the specified path.
+            :param validate: If True, validates the SDFG prior to generating
+                             code.
+            :return: A callable CompiledSDFG object.
+        """
 
-        # If provided, save output to path or filename
-        if output_file is not None:
-            if os.path.isdir(output_file):
-                output_file = os.path.join(output_file, os.path.basename(shared_library))
-            shutil.copyfile(shared_library, output_file)
+        # Importing these outside creates an import loop
+        from dace.codegen import compiler
 
-        # Get the function handle
-        return compiler.get_program_handle(shared_library, sdfg)
+        # Compute build folder path before running codegen
+        build_folder = self.build_folder
+
+        # Concurrent compilations into the same folder (e.g., in the background) run one after the other. Once a
+        # program is loaded, subsequent compilations in the folder rename their SDFG and library
+        with compiler.get_build_folder_lock(build_folder):
+            cached = self._load_cached_binary(build_folder)
+            if cached is not None:
+                return cached
+
+            sdfg, program_folder = self._generate_program_folder(build_folder, validate)
+
+            # Compile the code and get the shared library path
+            shared_library = compiler.configure_and_compile(program_folder, sdfg.name)
+
+            # If provided, save output to path or filename
+            if output_file is not None:
+                if os.path.isdir(output_file):
+                    output_file = os.path.join(output_file, os.path.basename(shared_library))
+                shutil.copyfile(shared_library, output_file)
+
+            # Get the function handle
+            return compiler.get_program_handle(shared_library, sdfg)
+
+    def compile_async(self, output_file=None, validate=True) -> 'concurrent.futures.Future':
+        """ Compiles a runnable binary from this SDFG in a background thread.
+            The SDFG is copied before returning, such that it can be modified
+            while compiling. Compilations of SDFGs that share a build folder
+            are serialized.
+
+            :param output_file: If not None, copies the output library file to
+                                the specified path.
+            :param validate: If True, validates the SDFG prior to generating
+                             code.
+            :return: A future that resolves to a callable CompiledSDFG object.
+            :see: SDFG.compile
+        """
+        # Importing these outside creates an import loop
+        from dace.codegen import compiler
+
+        sdfg = copy.deepcopy(self)
+        sdfg.build_folder = self.build_folder
+        return compiler.get_background_executor().submit(sdfg.compile, output_file, validate)
 
     def argument_typecheck(self, args, kwargs, types_only=False):
         """ Checks if arguments and keyword arguments match the SDFG
@@ -4,10 +4,15 @@
 import ast
 import collections
 import copy
+import enum
+import functools
+import hashlib
 import inspect
 import itertools
+import json
 import warnings
-from typing import Any, AnyStr, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union, overload
+import sympy
+from typing import Any, AnyStr, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union, overload
 
 import dace
 from dace import data as dt
@@ -63,6 +68,63 @@ def _make_iterators(ndrange):
     return params, map_range
 
 
+def _remove_hash_keywords(json_obj: Any):
+    """
+    Recursively removes attributes from a JSON-serialized SDFG element that are not used in uniquely representing it
+    for hashing purposes. This, among other things, includes the hash, name, transformation history, and meta
+    attributes.
+    """
+    if isinstance(json_obj, dict):
+        if 'sdfg_list_id' in json_obj:
+            del json_obj['sdfg_list_id']
+
+        keys_to_delete = []
+        values_to_recurse = []
+        for key, value in json_obj.items():
+            if (isinstance(key, str) and (key.startswith('_meta_') or key
+                                          in ['name', 'hash', 'orig_sdfg', 'transformation_hist', 'instrument'])):
+                keys_to_delete.append(key)
+            else:
+                values_to_recurse.append(value)
+
+        for key in keys_to_delete:
+            del json_obj[key]
+
+        for value in values_to_recurse:
+            _remove_hash_keywords(value)
+    elif isinstance(json_obj, (list, tuple)):
+        for value in json_obj:
+            _remove_hash_keywords(value)
+
+
+def _hash_snapshot(value: Any) -> Any:
+    """
+    Returns a comparable snapshot of a property value, which is used to detect modifications of nodes and memlets
+    without serializing them. Subsets, code blocks and containers are copied element by element, such that in-place
+    modifications are detected as well. Values of other types are serialized.
+    """
+    if value is None or isinstance(value, (str, int, float, bool, enum.Enum, sympy.Basic, dtypes.typeclass)):
+        return value
+    if isinstance(value, symbolic.SymExpr):
+        return (symbolic.SymExpr, value.expr, value.approx)
+    if isinstance(value, sbs.Range):
+        return (sbs.Range, _hash_snapshot(value.ranges), _hash_snapshot(value.tile_sizes))
+    if isinstance(value, sbs.Indices):
+        return (sbs.Indices, _hash_snapshot(value.indices))
+    if isinstance(value, CodeBlock):
+        code = value.code
+        if code is not None and not isinstance(code, str):
+            code = tuple(ast.dump(stmt) for stmt in code)
+        return (CodeBlock, value.language, code)
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_hash_snapshot(v) for v in value))
+    if isinstance(value, dict):
+        return (dict, tuple((k, _hash_snapshot(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return (set, frozenset(value))
+    return (type(value), json.dumps(serialize.to_json(value), default=str))
+
+
 class StateGraphView(object):
     """
     Read-only view interface of an SDFG state, containing methods for memlet
@@ -710,6 +772,14 @@ class StateGraphView(object):
         replace_dict(self, repl, symrepl)
 
 
+#: Attributes holding the graph structure of a state, which are missing until a lazily-loaded state is accessed
+_GRAPH_ATTRIBUTES = frozenset(vars(OrderedMultiDiConnectorGraph()))
+
+
+def _load_lazy_contents(contents: Callable[[], Dict[str, Any]], context: Dict[str, Any], state: 'SDFGState'):
+    state._add_contents_from_json(contents(), context)
+
+
 @make_properties
 class SDFGState(OrderedMultiDiConnectorGraph[nd.Node, mm.Memlet], StateGraphView):
     """ An acyclic dataflow multigraph in an SDFG, corresponding to a
@@ -759,6 +829,9 @@ class SDFGState(OrderedMultiDiConnectorGraph[nd.Node, mm.Memlet], StateGraphView
         self.nosync = False
         self.location = location if location is not None else {}
         self._default_lineinfo = None
+        # Cached structural hashes of nodes and edges (see ``hash_state``)
+        self._element_hashes: Dict[Any, Tuple[Any, str]] = {}
+        self._element_hashes_version = -1
 
     @property
     def parent(self):
@@ -799,6 +872,101 @@ class SDFGState(OrderedMultiDiConnectorGraph[nd.Node, mm.Memlet], StateGraphView
     def nodes(self) -> List[nd.Node]:  # Added for type hints
         return super().nodes()
 
+    def invalidate_hash(self):
+        """
+        Clears the cached structural hashes of this state and of all SDFGs nested in it. Modifications of nodes and
+        memlets are detected automatically (see ``hash_state``), this method only releases the cached values.
+        """
+        self._element_hashes = {}
+        for node in self.nodes():
+            if isinstance(node, nd.NestedSDFG) and node.sdfg is not None:
+                node.sdfg.invalidate_hash()
+
+    @staticmethod
+    def _hash_key(element: Union[nd.Node, MultiConnectorEdge]) -> Any:
+        """
+        Returns a snapshot of the values that determine the serialized form of a node or an edge (besides the state
+        structure), see ``_hash_snapshot``.
+        """
+        if isinstance(element, MultiConnectorEdge):
+            memlet = element.data
+            return (element.src_conn, element.dst_conn, memlet._is_data_src,
+                    tuple(_hash_snapshot(value) for _, value in memlet.properties()))
+        return tuple(_hash_snapshot(value) for prop, value in element.properties()
+                     if not (isinstance(element, nd.NestedSDFG) and prop.attr_name == 'sdfg'))
+
+    def _element_hash(self, element: Union[nd.Node, MultiConnectorEdge]) -> str:
+        """
+        Returns the (cached) hash of a single node or edge in this state. The cached value is reused as long as the
+        state structure and the snapshot of the element (see ``_hash_key``) did not change.
+        """
+        key = self._hash_key(element)
+        cached = self._element_hashes.get(element)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        if isinstance(element, nd.NestedSDFG):
+            # Nested SDFG contents are hashed separately (see ``hash_state``)
+            jsondict = {
+                'type': type(element).__name__,
+                'attributes': {
+                    prop.attr_name: prop.to_json(value)
+                    for prop, value in element.properties()
+                    if prop.attr_name != 'sdfg' and not (prop.optional and not prop.optional_condition(element))
+                },
+            }
+        else:
+            jsondict = element.to_json(self)
+        _remove_hash_keywords(jsondict)
+        result = hashlib.sha256(json.dumps(jsondict).encode('utf-8')).hexdigest()
+        self._element_hashes[element] = (key, result)
+        return result
+
+    def _local_hash(self) -> str:
+        """
+        Returns the hash of the contents of this state, excluding the contents of nested SDFGs.
+        The hash is combined from the (cached) hashes of individual nodes and edges, such that only modified elements
+        are reserialized.
+        """
+        # Node and edge serializations refer to node IDs and scopes, which change with the state structure
+        if self._element_hashes_version != self._structure_version:
+            self._element_hashes = {}
+            self._element_hashes_version = self._structure_version
+
+        # Try to initialize edges before serialization
+        for edge in self.edges():
+            edge.data.try_initialize(self.parent, self, edge)
+
+        jsondict = {
+            'type': type(self).__name__,
+            'label': self.name,
+            'nodes': [self._element_hash(node) for node in self.nodes()],
+            'edges': [
+                self._element_hash(e)
+                for e in sorted(self.edges(), key=lambda e: (e.src_conn or '', e.dst_conn or ''))
+            ],
+            'attributes': serialize.all_properties_to_json(self),
+        }
+        _remove_hash_keywords(jsondict)
+        return hashlib.sha256(json.dumps(jsondict).encode('utf-8')).hexdigest()
+
+    def hash_state(self) -> str:
+        """
+        Returns a hash of the current state, without considering IDs and attribute names.
+        Nodes and edges are only reserialized if their properties (including subsets and code) changed since they
+        were last hashed. Nested SDFGs contribute their own hash (see ``SDFG.hash_sdfg``), such that hashing an SDFG
+        hierarchy after a local modification only reserializes the modified nodes and edges.
+
+        :return: The hash (in SHA-256 format).
+        """
+        nested_hashes = [
+            node.sdfg.hash_sdfg() if node.sdfg is not None else None for node in self.nodes()
+            if isinstance(node, nd.NestedSDFG)
+        ]
+        if not nested_hashes:
+            return self._local_hash()
+        return hashlib.sha256(json.dumps([self._local_hash(), nested_hashes]).encode('utf-8')).hexdigest()
+
     def all_edges_and_connectors(self, *nodes):
         """
         Returns an iterable to incoming and outgoing Edge objects, along
@@ -893,8 +1061,6 @@ class SDFGState(OrderedMultiDiConnectorGraph[nd.Node, mm.Memlet], StateGraphView
             raise Exception("Class type mismatch")
 
         attrs = json_obj['attributes']
-        nodes = json_obj['nodes']
-        edges = json_obj['edges']
 
         ret = SDFGState(label=json_obj['label'], sdfg=context['sdfg'], debuginfo=None)
 
@@ -905,28 +1071,63 @@ class SDFGState(OrderedMultiDiConnectorGraph[nd.Node, mm.Memlet], StateGraphView
         }
         serialize.set_properties_from_json(ret, json_obj, rec_ci)
 
+        if 'contents' in json_obj:
+            # Nodes and edges are stored separately (see ``dace.sdfg.binary``), either as a dictionary or as a
+            # callable that loads the dictionary on demand
+            contents = json_obj['contents']
+            if callable(contents):
+                ret._set_lazy_contents(functools.partial(_load_lazy_contents, contents, rec_ci))
+            else:
+                ret._add_contents_from_json(contents, rec_ci)
+        else:
+            ret._add_contents_from_json(json_obj, rec_ci)
+
+        return ret
+
+    def _add_contents_from_json(self, json_obj: Dict[str, Any], context: Dict[str, Any]):
+        """ Adds the nodes and edges of a JSON-serialized state to this state. """
+        nodes = json_obj['nodes']
+        edges = json_obj['edges']
+
         for n in nodes:
-            nret = serialize.from_json(n, context=rec_ci)
-            ret.add_node(nret)
+            nret = serialize.from_json(n, context=context)
+            self.add_node(nret)
 
         # Connect using the edges
         for e in edges:
-            eret = serialize.from_json(e, context=rec_ci)
+            eret = serialize.from_json(e, context=context)
 
-            ret.add_edge(eret.src, eret.src_conn, eret.dst, eret.dst_conn, eret.data)
+            self.add_edge(eret.src, eret.src_conn, eret.dst, eret.dst_conn, eret.data)
 
         # Fix potentially broken scopes
         for n in nodes:
             if isinstance(n, nd.MapExit):
-                n.map = ret.entry_node(n).map
+                n.map = self.entry_node(n).map
             elif isinstance(n, nd.ConsumeExit):
-                n.consume = ret.entry_node(n).consume
+                n.consume = self.entry_node(n).consume
 
         # Reinitialize memlets
-        for edge in ret.edges():
-            edge.data.try_initialize(context['sdfg'], ret, edge)
+        for edge in self.edges():
+            edge.data.try_initialize(context['sdfg'], self, edge)
 
-        return ret
+    def _set_lazy_contents(self, loader: Callable[['SDFGState'], None]):
+        """
+        Defers loading the nodes and edges of this state until its graph is first accessed.
+
+        :param loader: A function that adds the nodes and edges to the (empty) state.
+        """
+        self.__dict__['_lazy_contents'] = (loader, {k: self.__dict__.pop(k) for k in _GRAPH_ATTRIBUTES})
+
+    def __getattr__(self, name: str):
+        # Only called if the attribute was not found, which happens for graph attributes of lazily-loaded states
+        lazy = self.__dict__.get('_lazy_contents')
+        if lazy is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        loader, attributes = lazy
+        self.__dict__['_lazy_contents'] = None
+        self.__dict__.update(attributes)
+        loader(self)
+        return getattr(self, name)
 
     def _repr_html_(self):
         """ HTML representation of a state, used mainly for Jupyter
@@ -1,3 +1,4 @@
 from .transformation import (PatternTransformation, SingleStateTransformation, MultiStateTransformation,
                              SubgraphTransformation, ExpandTransformation)
 from .pass_pipeline import Pass, Pipeline, FixedPointPipeline
+from .pass_profiling import PassProfiler
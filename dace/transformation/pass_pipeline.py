@@ -4,10 +4,11 @@ API for SDFG analysis and manipulation Passes, as well as Pipelines that contain
 """
 from dace import properties, serialize
 from dace.sdfg import SDFG, SDFGState, graph as gr, nodes, utils as sdutil
+from dace.transformation import pass_profiling
 
 from enum import Flag, auto
-from typing import Any, Dict, Iterator, List, Optional, Set, Type, Union
-from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Type, Union
+from dataclasses import dataclass, field
 
 
 class Modifies(Flag):
@@ -31,6 +32,76 @@ class Modifies(Flag):
     Everything = Descriptors | Symbols | States | InterstateEdges | Nodes | Memlets  #: Modification to arbitrary parts of SDFGs (nodes, edges, or properties)
 
 
+@dataclass
+class ChangeSet:
+    """
+    The precise set of SDFG elements changed by one or more Passes, as reported by ``report_changes``. Analysis passes
+    can use change sets to update their previous results instead of recomputing them (see
+    ``Pass.apply_pass_incremental``).
+    """
+    #: States whose contents (nodes, memlets, and their properties) were modified
+    states: Set[SDFGState] = field(default_factory=set)
+    #: SDFGs that were otherwise modified (e.g., states or inter-state edges added, removed or modified, symbols)
+    sdfgs: Set[SDFG] = field(default_factory=set)
+    #: Names of data descriptors that were added, removed or modified (in any SDFG)
+    descriptors: Set[str] = field(default_factory=set)
+
+    def update(self, other: 'ChangeSet'):
+        """ Adds the changes in another change set to this one. """
+        self.states |= other.states
+        self.sdfgs |= other.sdfgs
+        self.descriptors |= other.descriptors
+
+    def __bool__(self) -> bool:
+        return bool(self.states or self.sdfgs or self.descriptors)
+
+
+class _ChangeTracker:
+    """ Changes reported during the application of a pass. """
+
+    def __init__(self):
+        self.changes: Optional[ChangeSet] = None
+        self.unknown = False
+
+    def result(self, modified: bool) -> Optional[ChangeSet]:
+        """ Returns the changes made by the pass, or None if they are unknown. """
+        if self.unknown or (modified and self.changes is None):
+            return None
+        return self.changes or ChangeSet()
+
+
+# Stack of change trackers of the passes currently being applied in pipelines
+_change_trackers: List[_ChangeTracker] = []
+
+
+def report_changes(states: Iterable[SDFGState] = (), sdfgs: Iterable[SDFG] = (), descriptors: Iterable[str] = ()):
+    """
+    Reports SDFG elements changed by the pass that is currently being applied in a ``Pipeline``. Passes that report
+    changes must report all of the changes they make (potentially over multiple calls), otherwise the Pipeline
+    considers every element as changed. Outside of a pipeline, this function does nothing.
+
+    :param states: States whose contents were modified.
+    :param sdfgs: SDFGs that were otherwise modified (e.g., states, inter-state edges or symbols).
+    :param descriptors: Names of data descriptors that were added, removed or modified.
+    """
+    if not _change_trackers:
+        return
+    tracker = _change_trackers[-1]
+    if tracker.changes is None:
+        tracker.changes = ChangeSet()
+    tracker.changes.update(ChangeSet(set(states), set(sdfgs), set(descriptors)))
+
+
+def _merge_changes(a: Optional[ChangeSet], b: Optional[ChangeSet]) -> Optional[ChangeSet]:
+    """ Merges two change sets into a new one, where None (unknown changes) absorbs all other changes. """
+    if a is None or b is None:
+        return None
+    result = ChangeSet()
+    result.update(a)
+    result.update(b)
+    return result
+
+
 @properties.make_properties
 class Pass:
     """
@@ -90,6 +161,23 @@ class Pass:
         """
         raise NotImplementedError
 
+    def apply_pass_incremental(self, sdfg: SDFG, pipeline_results: Dict[str, Any], previous_result: Any,
+                               changes: ChangeSet) -> Optional[Any]:
+        """
+        In the context of a ``Pipeline``, reapplies the pass by updating the result of its previous application on the
+        same SDFG, given the elements that were changed since (as reported by the other passes through
+        ``report_changes``). Analysis passes may override this method to avoid recomputing their entire result.
+        By default, reapplies the pass from scratch.
+
+        :param sdfg: The SDFG to apply the pass to.
+        :param pipeline_results: A dictionary that is populated with prior Pass results as
+                                 ``{Pass subclass name: returned object from pass}``.
+        :param previous_result: The return value of the previous application of this pass.
+        :param changes: The SDFG elements changed since the previous application of this pass.
+        :return: Some object if pass was applied, or None if nothing changed.
+        """
+        return self.apply_pass(sdfg, pipeline_results)
+
     def report(self, pass_retval: Any) -> Optional[str]:
         """
         Returns a user-readable string report based on the results of this pass.
@@ -307,6 +395,17 @@ class ScopePass(Pass):
         raise NotImplementedError
 
 
+@dataclass
+class PassTiming:
+    """ Timing of a pass in a pipeline, accumulated over all of its applications. """
+    #: Number of times the pass was applied
+    applications: int = 0
+    #: Total wall time of the pass, in seconds
+    time: float = 0.0
+    #: Time spent in memlet and state propagation (see ``dace.sdfg.propagation``) during the pass, in seconds
+    propagation_time: float = 0.0
+
+
 @dataclass
 @properties.make_properties
 class Pipeline(Pass):
@@ -330,6 +429,11 @@ class Pipeline(Pass):
         results = my_simplify.apply_pass(sdfg, {})
         print('Promoted scalars:', results['ScalarToSymbolPromotion'])
 
+    Passes may additionally report the precise elements they changed through ``report_changes``. Passes are not
+    reapplied if the passes that ran since their last application reported no changes, and passes that implement
+    ``apply_pass_incremental`` (e.g., analysis passes) update their previous results with the reported changes instead
+    of recomputing them.
+
     """
 
     CATEGORY: str = 'Helper'
@@ -352,6 +456,14 @@ class Pipeline(Pass):
         # Keep track of what is modified as the pipeline is executing
         self._modified: Modifies = Modifies.Nothing
 
+        # Timing of each pass, accumulated over all applications of the pipeline
+        self._timings: Dict[str, PassTiming] = {}
+
+        # Changes made to the SDFG since the last application of each pass (or None if unknown), and the results of
+        # these applications, used to skip or incrementally reapply passes
+        self._changes_since: Dict[Pass, Optional[ChangeSet]] = {}
+        self._last_results: Dict[Pass, Any] = {}
+
     def _add_dependencies(self, passes: List[Pass]):
         """
         Verifies pass uniqueness in pipeline and adds missing dependencies from ``depends_on`` of each pass. 
@@ -456,9 +568,14 @@ class Pipeline(Pass):
 
         def reapply_recursive(p: Pass):
             """ Reapply pass dependencies in a recursive fashion. """
-            # If pass should not reapply, skip
-            if p in applied_passes and not p.should_reapply(applied_passes[p]):
-                return
+            if p in applied_passes:
+                # If pass should not reapply, skip
+                if not p.should_reapply(applied_passes[p]):
+                    return
+                # If the passes applied since reported that they did not change anything, skip
+                changes = self._changes_since.get(p)
+                if changes is not None and not changes:
+                    return
 
             # Check dependencies first
             for dep in self._depgraph.predecessors(p):
@@ -494,13 +611,82 @@ class Pipeline(Pass):
         """
         return p.apply_pass(sdfg, state)
 
+    @property
+    def timings(self) -> Dict[str, PassTiming]:
+        """
+        Returns the timing of each pass in this pipeline (by pass name), accumulated over all applications of the
+        pipeline.
+        """
+        if not hasattr(self, '_timings'):  # Subclasses may not call the constructor
+            self._timings = {}
+        return self._timings
+
+    def _record_timing(self, event: pass_profiling.PassEvent):
+        timing = self.timings.setdefault(event.name, PassTiming())
+        timing.applications += 1
+        timing.time += event.duration
+        timing.propagation_time += event.propagation_time
+
+    def _reset_changes(self):
+        """ Resets the changes tracked since the last application of each pass. """
+        self._changes_since = {}
+        self._last_results = {}
+
+    def _record_changes(self, p: Pass, result: Any, tracker: _ChangeTracker):
+        """
+        Records the changes reported by an applied pass for the other passes in the pipeline, and reports them to the
+        pipeline this pipeline is applied in, if any.
+        """
+        changes = tracker.result(result is not None and p.modifies() != Modifies.Nothing)
+        if _change_trackers:
+            if changes is None:
+                _change_trackers[-1].unknown = True
+            elif changes:
+                report_changes(changes.states, changes.sdfgs, changes.descriptors)
+
+        for other, other_changes in self._changes_since.items():
+            self._changes_since[other] = _merge_changes(other_changes, changes)
+        self._changes_since[p] = ChangeSet()
+        if result is not None:
+            self._last_results[p] = result
+        else:
+            self._last_results.pop(p, None)
+
+    def _apply_tracked_subpass(self, sdfg: SDFG, p: Pass, state: Dict[str, Any]) -> Optional[Any]:
+        """
+        Applies a pass from the pipeline while tracking the changes it reports. If the pass supports it and all the
+        changes since its last application in this pipeline are known, the pass is reapplied incrementally.
+        """
+        changes = self._changes_since.get(p)
+        tracker = _ChangeTracker()
+        _change_trackers.append(tracker)
+        try:
+            if (changes is not None and p in self._last_results
+                    and type(p).apply_pass_incremental is not Pass.apply_pass_incremental):
+                r = p.apply_pass_incremental(sdfg, state, self._last_results[p], changes)
+            else:
+                r = self.apply_subpass(sdfg, p, state)
+        finally:
+            _change_trackers.pop()
+        self._record_changes(p, r, tracker)
+        return r
+
     def apply_pass(self, sdfg: SDFG, pipeline_results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        self._reset_changes()
+        return self._apply_passes(sdfg, pipeline_results)
+
+    def _apply_passes(self, sdfg: SDFG, pipeline_results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         state = pipeline_results
         retval = {}
         self._modified = Modifies.Nothing
         for p in self.iterate_over_passes(sdfg):
-            r = self.apply_subpass(sdfg, p, state)
+            with pass_profiling.record(type(p).__name__, 'pass') as event:
+                r = self._apply_tracked_subpass(sdfg, p, state)
+                event.modified = p.modifies() if r is not None else Modifies.Nothing
+            self._record_timing(event)
             if r is not None:
+                # Passes may modify nodes and memlets in-place, clear cached hashes
+                sdfg.invalidate_hash()
                 state[type(p).__name__] = r
                 retval[type(p).__name__] = r
                 self._modified = p.modifies()
@@ -543,9 +729,14 @@ class FixedPointPipeline(Pipeline):
         """
         state = pipeline_results
         retval = {}
+        iteration = 0
+        # Changes are tracked across iterations, so that analysis passes can be reapplied incrementally
+        self._reset_changes()
         while True:
-            newret = super().apply_pass(sdfg, state)
-            
+            with pass_profiling.record(type(self).__name__, 'iteration', iteration=iteration):
+                newret = self._apply_passes(sdfg, state)
+            iteration += 1
+
             # Remove dependencies from pipeline
             if newret:
                 newret = {k: v for k, v in newret.items() if k in self._pass_names}
@@ -0,0 +1,263 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+"""
+Profiling of SDFG passes, pipelines and pattern-matching transformations. Use a ``PassProfiler`` as a context manager
+to record the wall time, peak Python memory, iterations and modified SDFG elements of every pass that runs within it:
+
+.. code-block:: python
+
+    with PassProfiler() as profiler:
+        sdfg.simplify()
+        auto_optimize(sdfg, dace.DeviceType.CPU)
+    print(profiler)
+    profiler.save_chrome_trace('passes.json')  # Open in chrome://tracing or https://ui.perfetto.dev
+
+"""
+import contextlib
+from dataclasses import dataclass, field
+import json
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional
+
+from dace.sdfg import propagation
+
+
+@dataclass
+class PassEvent:
+    """ A single application of a pass, pipeline iteration, pattern matching or transformation application. """
+    #: Name of the pass or transformation
+    name: str
+    #: Event category: ``pass``, ``iteration`` (of a fixed-point pipeline), ``match`` or ``transformation``
+    category: str
+    #: Start time (``time.perf_counter``), in seconds
+    start: float = 0.0
+    #: Wall time, in seconds
+    duration: float = 0.0
+    #: Time spent in memlet and state propagation during the event, in seconds
+    propagation_time: float = 0.0
+    #: Peak Python memory allocated during the event (relative to its start), in bytes, or None if not traced
+    peak_memory: Optional[int] = None
+    #: Nesting depth of the event
+    depth: int = 0
+    #: The SDFG elements modified by the event (a ``Modifies`` flag set), if known
+    modified: Any = None
+    #: Additional event information (e.g., fixed-point iteration number)
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class PassStatistics:
+    """ Statistics of a pass or transformation, accumulated over all of its events. """
+    category: str
+    #: Number of events (applications, iterations or pattern matching calls)
+    count: int = 0
+    #: Total wall time, in seconds
+    time: float = 0.0
+    #: Total time spent in memlet and state propagation, in seconds
+    propagation_time: float = 0.0
+    #: Maximal peak Python memory of a single event, in bytes, or None if not traced
+    peak_memory: Optional[int] = None
+    #: Number of events that modified the SDFG
+    modifications: int = 0
+    #: Union of all modified SDFG elements
+    modified: Any = None
+
+
+# Stack of active profilers, and the currently open events with their memory tracing frames
+# (``[memory at start, peak memory]``)
+_active_profilers: List['PassProfiler'] = []
+_open_events: List[List[int]] = []
+
+
+def _modified_names(modified) -> List[str]:
+    if modified is None:
+        return []
+    return [m.name for m in type(modified) if m.value and (m.value & (m.value - 1)) == 0 and m in modified]
+
+
+@contextlib.contextmanager
+def record(name: str, category: str, **args) -> Iterator[PassEvent]:
+    """
+    Records an event in the active pass profilers. The event is timed even if no profiler is active, so that callers
+    can use its duration.
+
+    :param name: The name of the pass or transformation.
+    :param category: The event category (see ``PassEvent.category``).
+    :param args: Additional event information.
+    :return: A context manager yielding the event, whose ``modified`` field may be set within the context.
+    """
+    event = PassEvent(name, category, args=args)
+    profilers = list(_active_profilers)
+    trace_memory = bool(profilers) and tracemalloc.is_tracing() and any(p.memory for p in profilers)
+    if profilers:
+        frame = [0, 0]
+        if trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if _open_events:
+                _open_events[-1][1] = max(_open_events[-1][1], peak)
+            if hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+, otherwise peaks are relative to the outermost event
+                tracemalloc.reset_peak()
+            frame = [current, current]
+        event.depth = len(_open_events)
+        _open_events.append(frame)
+
+    propagation_start = propagation.get_propagation_statistics().time
+    event.start = time.perf_counter()
+    try:
+        yield event
+    finally:
+        event.duration = time.perf_counter() - event.start
+        event.propagation_time = propagation.get_propagation_statistics().time - propagation_start
+        if profilers:
+            _open_events.pop()
+            if trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                frame[1] = max(frame[1], peak)
+                if _open_events:
+                    _open_events[-1][1] = max(_open_events[-1][1], frame[1])
+                event.peak_memory = frame[1] - frame[0]
+        for profiler in profilers:
+            profiler.events.append(event)
+
+
+class PassProfiler:
+    """
+    Records the passes, pipeline iterations and pattern-matching transformations applied while the profiler is active
+    (as a context manager). The recorded events can be summarized per pass or transformation, printed, and exported
+    as JSON or as a Chrome trace (in the same format as SDFG instrumentation reports).
+    """
+
+    def __init__(self, memory: bool = True):
+        """
+        Creates a pass profiler.
+
+        :param memory: If True, also records the peak Python memory of every event via ``tracemalloc``. Note that
+                       tracing memory allocations slows down Python code considerably.
+        """
+        self.memory = memory
+        self.events: List[PassEvent] = []
+        self._start = None
+        self._started_tracing = False
+
+    def __enter__(self) -> 'PassProfiler':
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._start = time.perf_counter()
+        _active_profilers.append(self)
+        return self
+
+    def __exit__(self, *args):
+        _active_profilers.remove(self)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def summary(self) -> Dict[str, PassStatistics]:
+        """
+        Returns statistics per pass, pipeline and transformation. Pattern matching events are keyed as
+        ``<transformation> (match)``, and iterations of fixed-point pipelines as ``<pipeline> (iteration)``.
+        """
+        result: Dict[str, PassStatistics] = {}
+        for event in sorted(self.events, key=lambda e: e.start):
+            key = event.name if event.category in ('pass', 'transformation') else f'{event.name} ({event.category})'
+            stats = result.setdefault(key, PassStatistics(event.category))
+            stats.count += 1
+            stats.time += event.duration
+            stats.propagation_time += event.propagation_time
+            if event.peak_memory is not None:
+                stats.peak_memory = max(stats.peak_memory or 0, event.peak_memory)
+            if event.modified:
+                stats.modifications += 1
+                stats.modified = event.modified if stats.modified is None else (stats.modified | event.modified)
+        return result
+
+    def to_json(self) -> Dict[str, Any]:
+        """ Returns the summary and the recorded events as a JSON-compatible dictionary. """
+        return {
+            'summary': {
+                name: {
+                    'category': stats.category,
+                    'count': stats.count,
+                    'time': stats.time,
+                    'propagation_time': stats.propagation_time,
+                    'peak_memory': stats.peak_memory,
+                    'modifications': stats.modifications,
+                    'modified': _modified_names(stats.modified),
+                }
+                for name, stats in self.summary().items()
+            },
+            'events': [{
+                'name': event.name,
+                'category': event.category,
+                'start': event.start - self._start,
+                'duration': event.duration,
+                'propagation_time': event.propagation_time,
+                'peak_memory': event.peak_memory,
+                'depth': event.depth,
+                'modified': _modified_names(event.modified),
+                'args': event.args,
+            } for event in sorted(self.events, key=lambda e: e.start)],
+        }
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Returns the recorded events as a Chrome trace (``chrome://tracing``) dictionary, with complete events for
+        every pass and counter events for peak memory.
+        """
+        events = []
+        for event in sorted(self.events, key=lambda e: e.start):
+            ts = (event.start - self._start) * 1e6
+            args = dict(event.args)
+            args['propagation_time_ms'] = event.propagation_time * 1e3
+            if event.modified is not None:
+                args['modified'] = _modified_names(event.modified)
+            if event.peak_memory is not None:
+                args['peak_memory_bytes'] = event.peak_memory
+            events.append({
+                'name': event.name,
+                'cat': event.category,
+                'ph': 'X',
+                'ts': ts,
+                'dur': event.duration * 1e6,
+                'pid': 0,
+                'tid': 0,
+                'args': args,
+            })
+            if event.peak_memory is not None and event.category == 'pass':
+                events.append({
+                    'name': 'peak_memory_bytes',
+                    'ph': 'C',
+                    'ts': ts,
+                    'pid': 0,
+                    'tid': 0,
+                    'args': {
+                        'peak_memory_bytes': event.peak_memory
+                    },
+                })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save(self, filename: str):
+        """ Saves the summary and recorded events as a JSON file. """
+        with open(filename, 'w') as fp:
+            json.dump(self.to_json(), fp, indent=1)
+
+    def save_chrome_trace(self, filename: str):
+        """ Saves the recorded events as a Chrome trace JSON file. """
+        with open(filename, 'w') as fp:
+            json.dump(self.to_chrome_trace(), fp)
+
+    def __str__(self) -> str:
+        summary = sorted(self.summary().items(), key=lambda kv: kv[1].time, reverse=True)
+        width = max([len(name) for name, _ in summary] + [4])
+        lines = [
+            'Pass profile (%d events):' % len(self.events),
+            '%-*s  %8s  %12s  %12s  %12s  %s' % (width, 'Name', 'Count', 'Time (ms)', 'Prop. (ms)', 'Peak (KiB)',
+                                              'Modified'),
+        ]
+        for name, stats in summary:
+            peak = '-' if stats.peak_memory is None else '%.1f' % (stats.peak_memory / 1024)
+            modified = ', '.join(_modified_names(stats.modified)) or '-'
+            lines.append('%-*s  %8d  %12.3f  %12.3f  %12s  %s' %
+                         (width, name, stats.count, stats.time * 1e3, stats.propagation_time * 1e3, peak, modified))
+        return '\n'.join(lines)
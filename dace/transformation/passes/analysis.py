@@ -33,12 +33,28 @@ class StateReachability(ppl.Pass):
         """
         reachable: Dict[int, Dict[SDFGState, Set[SDFGState]]] = {}
         for sdfg in top_sdfg.all_sdfgs_recursive():
-            reachable[sdfg.sdfg_id] = {}
-            tc: nx.DiGraph = nx.transitive_closure(sdfg.nx)
-            for state in sdfg.nodes():
-                reachable[sdfg.sdfg_id][state] = set(tc.successors(state))
+            reachable[sdfg.sdfg_id] = self._reachability(sdfg)
         return reachable
 
+    def apply_pass_incremental(self, top_sdfg: SDFG, _, previous_result: Dict[int, Dict[SDFGState, Set[SDFGState]]],
+                               changes: ppl.ChangeSet) -> Dict[int, Dict[SDFGState, Set[SDFGState]]]:
+        """
+        Recomputes state reachability only in SDFGs whose state machine may have changed.
+        """
+        reachable: Dict[int, Dict[SDFGState, Set[SDFGState]]] = {}
+        for sdfg in top_sdfg.all_sdfgs_recursive():
+            previous = previous_result.get(sdfg.sdfg_id)
+            if sdfg in changes.sdfgs or not _is_result_of(previous, sdfg):
+                reachable[sdfg.sdfg_id] = self._reachability(sdfg)
+            else:
+                reachable[sdfg.sdfg_id] = previous
+        return reachable
+
+    @staticmethod
+    def _reachability(sdfg: SDFG) -> Dict[SDFGState, Set[SDFGState]]:
+        tc: nx.DiGraph = nx.transitive_closure(sdfg.nx)
+        return {state: set(tc.successors(state)) for state in sdfg.nodes()}
+
 
 @properties.make_properties
 class AccessSets(ppl.Pass):
@@ -61,28 +77,54 @@ class AccessSets(ppl.Pass):
         """
         top_result: Dict[int, Dict[SDFGState, Tuple[Set[str], Set[str]]]] = {}
         for sdfg in top_sdfg.all_sdfgs_recursive():
-            result: Dict[SDFGState, Tuple[Set[str], Set[str]]] = {}
-            for state in sdfg.nodes():
-                readset, writeset = set(), set()
-                for anode in state.data_nodes():
-                    if state.in_degree(anode) > 0:
-                        writeset.add(anode.data)
-                    if state.out_degree(anode) > 0:
-                        readset.add(anode.data)
+            top_result[sdfg.sdfg_id] = self._access_sets(sdfg)
+        return top_result
 
+    def apply_pass_incremental(self, top_sdfg: SDFG, pipeline_results: Dict[str, Any],
+                               previous_result: Dict[int, Dict[SDFGState, Tuple[Set[str], Set[str]]]],
+                               changes: ppl.ChangeSet) -> Dict[int, Dict[SDFGState, Tuple[Set[str], Set[str]]]]:
+        """
+        Recomputes access sets only for changed states, and SDFGs whose state machine may have changed.
+        """
+        top_result: Dict[int, Dict[SDFGState, Tuple[Set[str], Set[str]]]] = {}
+        for sdfg in top_sdfg.all_sdfgs_recursive():
+            previous = previous_result.get(sdfg.sdfg_id)
+            if sdfg in changes.sdfgs or not _is_result_of(previous, sdfg):
+                top_result[sdfg.sdfg_id] = self._access_sets(sdfg)
+                continue
+            result = dict(previous)
+            for state in _dirty_states(sdfg, changes):
+                readset, writeset = self._state_access_sets(state)
+                readset |= _interstate_accesses(sdfg, state)
                 result[state] = (readset, writeset)
-
-            # Edges that read from arrays add to both ends' access sets
-            anames = sdfg.arrays.keys()
-            for e in sdfg.edges():
-                fsyms = e.data.free_symbols & anames
-                if fsyms:
-                    result[e.src][0].update(fsyms)
-                    result[e.dst][0].update(fsyms)
-
             top_result[sdfg.sdfg_id] = result
         return top_result
 
+    @staticmethod
+    def _access_sets(sdfg: SDFG) -> Dict[SDFGState, Tuple[Set[str], Set[str]]]:
+        result: Dict[SDFGState, Tuple[Set[str], Set[str]]] = {}
+        for state in sdfg.nodes():
+            result[state] = AccessSets._state_access_sets(state)
+
+        # Edges that read from arrays add to both ends' access sets
+        anames = sdfg.arrays.keys()
+        for e in sdfg.edges():
+            fsyms = e.data.free_symbols & anames
+            if fsyms:
+                result[e.src][0].update(fsyms)
+                result[e.dst][0].update(fsyms)
+        return result
+
+    @staticmethod
+    def _state_access_sets(state: SDFGState) -> Tuple[Set[str], Set[str]]:
+        readset, writeset = set(), set()
+        for anode in state.data_nodes():
+            if state.in_degree(anode) > 0:
+                writeset.add(anode.data)
+            if state.out_degree(anode) > 0:
+                readset.add(anode.data)
+        return readset, writeset
+
 
 @properties.make_properties
 class FindAccessStates(ppl.Pass):
@@ -106,21 +148,52 @@ class FindAccessStates(ppl.Pass):
         top_result: Dict[int, Dict[str, Set[SDFGState]]] = {}
 
         for sdfg in top_sdfg.all_sdfgs_recursive():
+            top_result[sdfg.sdfg_id] = self._access_states(sdfg)
+        return top_result
+
+    def apply_pass_incremental(self, top_sdfg: SDFG, pipeline_results: Dict[str, Any],
+                               previous_result: Dict[int, Dict[str, Set[SDFGState]]],
+                               changes: ppl.ChangeSet) -> Dict[int, Dict[str, Set[SDFGState]]]:
+        """
+        Recomputes the accesses only in changed states, and SDFGs whose state machine may have changed.
+        """
+        top_result: Dict[int, Dict[str, Set[SDFGState]]] = {}
+        for sdfg in top_sdfg.all_sdfgs_recursive():
+            previous = previous_result.get(sdfg.sdfg_id)
+            states = set().union(*previous.values()) if previous is not None else None
+            if sdfg in changes.sdfgs or not states or any(state.parent is not sdfg for state in states):
+                top_result[sdfg.sdfg_id] = self._access_states(sdfg)
+                continue
+
+            dirty = _dirty_states(sdfg, changes)
             result: Dict[str, Set[SDFGState]] = defaultdict(set)
-            for state in sdfg.nodes():
+            for aname, access_states in previous.items():
+                remaining = access_states - dirty
+                if remaining:
+                    result[aname] = set(remaining)
+            for state in dirty:
                 for anode in state.data_nodes():
                     result[anode.data].add(state)
-
-            # Edges that read from arrays add to both ends' access sets
-            anames = sdfg.arrays.keys()
-            for e in sdfg.edges():
-                fsyms = e.data.free_symbols & anames
-                for access in fsyms:
-                    result[access].update({e.src, e.dst})
-
+                for aname in _interstate_accesses(sdfg, state):
+                    result[aname].add(state)
             top_result[sdfg.sdfg_id] = result
         return top_result
 
+    @staticmethod
+    def _access_states(sdfg: SDFG) -> Dict[str, Set[SDFGState]]:
+        result: Dict[str, Set[SDFGState]] = defaultdict(set)
+        for state in sdfg.nodes():
+            for anode in state.data_nodes():
+                result[anode.data].add(state)
+
+        # Edges that read from arrays add to both ends' access sets
+        anames = sdfg.arrays.keys()
+        for e in sdfg.edges():
+            fsyms = e.data.free_symbols & anames
+            for access in fsyms:
+                result[access].update({e.src, e.dst})
+        return result
+
 
 @properties.make_properties
 class FindAccessNodes(ppl.Pass):
@@ -262,3 +335,36 @@ class ScalarWriteShadowScopes(ppl.Pass):
                                 result[desc][write].add((state, oedge.data))
             top_result[sdfg.sdfg_id] = result
         return top_result
+
+
+def _is_result_of(state_dict: Optional[Dict[SDFGState, Any]], sdfg: SDFG) -> bool:
+    """
+    Returns True if a previous per-state analysis result was computed on the states of the given SDFG (SDFG IDs may
+    be reassigned when nested SDFGs are added or removed).
+    """
+    if state_dict is None or len(state_dict) != sdfg.number_of_nodes():
+        return False
+    return all(state.parent is sdfg for state in state_dict)
+
+
+def _dirty_states(sdfg: SDFG, changes: ppl.ChangeSet) -> Set[SDFGState]:
+    """
+    Returns the states of an SDFG whose access sets may have changed: modified states, and states adjacent to
+    inter-state edges that refer to added or removed data descriptors.
+    """
+    result = set(state for state in changes.states if state.parent is sdfg)
+    if changes.descriptors:
+        for e in sdfg.edges():
+            if e.data.free_symbols & changes.descriptors:
+                result.add(e.src)
+                result.add(e.dst)
+    return result
+
+
+def _interstate_accesses(sdfg: SDFG, state: SDFGState) -> Set[str]:
+    """ Returns the data descriptors read on inter-state edges adjacent to a state. """
+    anames = sdfg.arrays.keys()
+    result = set()
+    for e in sdfg.all_edges(state):
+        result |= e.data.free_symbols & anames
+    return result
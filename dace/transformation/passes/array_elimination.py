@@ -81,6 +81,7 @@ class ArrayElimination(ppl.Pass):
 
             if removed_nodes:
                 result.update({n.data for n in removed_nodes})
+                ppl.report_changes(states=[state])
 
         # If node is completely removed from graph, erase data descriptor
         for aname, desc in list(sdfg.arrays.items()):
@@ -90,6 +91,7 @@ class ArrayElimination(ppl.Pass):
                 sdfg.remove_data(aname, validate=False)
                 result.add(aname)
 
+        ppl.report_changes(descriptors=result)
         return result or None
 
     def report(self, pass_retval: Set[str]) -> str:
@@ -183,6 +185,7 @@ class ArrayElimination(ppl.Pass):
                                 if xform.can_be_applied(state, 0, sdfg):
                                     ret = xform.apply(state, sdfg)
                                     if ret is not None:  # A view was created
+                                        ppl.report_changes(states=[state], descriptors=[anode.data, succ.data])
                                         continue
                                     removed_nodes.add(anode)
                                     removed.add(anode)
@@ -203,6 +206,7 @@ class ArrayElimination(ppl.Pass):
                                 if xform.can_be_applied(state, 0, sdfg):
                                     ret = xform.apply(state, sdfg)
                                     if ret is not None:  # A view was created
+                                        ppl.report_changes(states=[state], descriptors=[pred.data, anode.data])
                                         continue
                                     removed_nodes.add(anode)
                                     removed.add(anode)
@@ -34,9 +34,11 @@ class ConsolidateEdges(ppl.Pass):
                                  pipeline, an empty dictionary is expected.
         :return: Number of edges removed, or None if nothing was performed.
         """
+        versions = {state: state.structure_version for state in sdfg.nodes()}
         edges_removed = sdutil.consolidate_edges(sdfg)
         if edges_removed == 0:
             return None
+        ppl.report_changes(states=[state for state, version in versions.items() if state.structure_version != version])
         return edges_removed
 
     def report(self, pass_retval: int) -> str:
@@ -59,6 +59,7 @@ class DeadDataflowElimination(ppl.Pass):
         reachable: Dict[SDFGState, Set[SDFGState]] = pipeline_results['StateReachability'][sdfg.sdfg_id]
         access_sets: Dict[SDFGState, Tuple[Set[str], Set[str]]] = pipeline_results['AccessSets'][sdfg.sdfg_id]
         result: Dict[SDFGState, Set[str]] = defaultdict(set)
+        transient_connectors: Set[str] = set()
 
         # Traverse SDFG backwards
         try:
@@ -173,6 +174,7 @@ class DeadDataflowElimination(ppl.Pass):
                     # make nested data transient (dead dataflow elimination would remove internally as necessary)
                     if conn not in node.in_connectors:
                         node.sdfg.arrays[conn].transient = True
+                        transient_connectors.add(conn)
 
             # Update read sets for the predecessor states to reuse
             remaining_access_nodes = set(n for n in (access_nodes - result[state]) if state.out_degree(n) > 0)
@@ -180,6 +182,7 @@ class DeadDataflowElimination(ppl.Pass):
                                           if isinstance(n, nodes.AccessNode) and n not in remaining_access_nodes)
             access_sets[state] = (access_sets[state][0] - removed_data_containers, access_sets[state][1])
 
+        ppl.report_changes(states=result.keys(), descriptors=transient_connectors)
         return result or None
 
     def report(self, pass_retval: Dict[SDFGState, Set[str]]) -> str:
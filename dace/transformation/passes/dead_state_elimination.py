@@ -45,6 +45,8 @@ class DeadStateElimination(ppl.Pass):
         sdfg.remove_nodes_from(dead_states)
 
         result = dead_states | dead_edges
+        if result or annotated:
+            ppl.report_changes(sdfgs=[sdfg])
 
         if not annotated:
             return result or None
@@ -0,0 +1,321 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+import networkx as nx
+
+from dace import SDFG, SDFGState, data, dtypes, properties, subsets, symbolic
+from dace.sdfg import infer_types, nodes
+from dace.transformation import pass_pipeline as ppl
+
+#: Storage types whose transients can be placed in arenas
+ARENA_STORAGES = (dtypes.StorageType.CPU_Heap, dtypes.StorageType.GPU_Global)
+
+#: Allocation lifetimes of transients that can be placed in arenas
+_ARENA_LIFETIMES = (dtypes.AllocationLifetime.Scope, dtypes.AllocationLifetime.State, dtypes.AllocationLifetime.SDFG)
+
+
+@dataclass
+class MemoryPlan:
+    """ The result of memory planning on a single SDFG. """
+
+    #: Maps each arena buffer to its size in bytes
+    arenas: Dict[str, int] = field(default_factory=dict)
+    #: Maps each planned transient to its arena buffer and offset (in bytes)
+    placement: Dict[str, Tuple[str, int]] = field(default_factory=dict)
+    #: Total size of the planned transients when allocated separately
+    bytes_before: int = 0
+    #: Largest total size of planned transients that are live at the same time (lower bound for ``bytes_after``)
+    peak_live_bytes: int = 0
+    #: Total size of the arena buffers
+    bytes_after: int = 0
+
+
+@properties.make_properties
+class MemoryPlanning(ppl.Pass):
+    """
+    Plans the memory of transient arrays across the whole state machine of each SDFG. The lifetime of every transient
+    is computed as an interval over the states in topological order, where states in loops extend the lifetimes of
+    the transients they access to the entire loop. Transients with non-overlapping lifetimes are then placed at
+    offsets in one arena buffer per storage type, using greedy interval coloring (largest transients first).
+
+    Transients that are placed in an arena are not allocated separately, but point into the arena buffer, which is
+    allocated once per SDFG invocation (see ``data.Array.arena``). Since the placement relies on the access nodes
+    present in the SDFG, this pass should be applied after all other transformations, before code generation.
+    """
+
+    CATEGORY: str = 'Memory Footprint Reduction'
+
+    alignment = properties.Property(dtype=int, default=64, desc='Minimum alignment (in bytes) of arrays in arenas')
+    verbose = properties.Property(dtype=bool, default=False, desc='Print the memory footprint before and after')
+
+    def modifies(self) -> ppl.Modifies:
+        return ppl.Modifies.Descriptors
+
+    def should_reapply(self, modified: ppl.Modifies) -> bool:
+        return modified & (ppl.Modifies.Descriptors | ppl.Modifies.AccessNodes | ppl.Modifies.States
+                           | ppl.Modifies.InterstateEdges)
+
+    def apply_pass(self, top_sdfg: SDFG, _) -> Optional[Dict[int, MemoryPlan]]:
+        """
+        :return: A dictionary mapping SDFG IDs to their memory plan, or None if no arenas were created.
+        """
+        # Storage types must be known to group transients
+        infer_types.set_default_schedule_and_storage_types(top_sdfg, None)
+
+        result: Dict[int, MemoryPlan] = {}
+        for sdfg in top_sdfg.all_sdfgs_recursive():
+            if _in_scope(sdfg):
+                # Nested SDFGs in scopes may run concurrently, and thus cannot share buffers
+                continue
+            plan = self._plan_sdfg(sdfg)
+            if plan is not None:
+                result[sdfg.sdfg_id] = plan
+                if self.verbose:
+                    print(f'SDFG {sdfg.name}: {len(plan.placement)} transients in {len(plan.arenas)} arenas, memory '
+                          f'before: {plan.bytes_before} B, after: {plan.bytes_after} B '
+                          f'(peak live: {plan.peak_live_bytes} B)')
+
+        return result or None
+
+    def _plan_sdfg(self, sdfg: SDFG) -> Optional[MemoryPlan]:
+        sizes = _candidate_sizes(sdfg)
+        if not sizes:
+            return None
+        intervals = _live_intervals(sdfg, set(sizes.keys()))
+
+        # Group by storage type
+        groups: Dict[dtypes.StorageType, List[str]] = defaultdict(list)
+        for name in sorted(intervals.keys()):
+            groups[sdfg.arrays[name].storage].append(name)
+
+        plan = MemoryPlan()
+        for storage, names in groups.items():
+            if len(names) < 2:
+                continue
+            alignments = {name: max(self.alignment, sdfg.arrays[name].alignment) for name in names}
+            offsets, arena_size = _place(names, sizes, alignments, intervals)
+
+            total = sum(sizes[name] for name in names)
+            if arena_size >= total:  # No reuse possible
+                continue
+
+            arena, _ = sdfg.add_array(f'arena_{storage.name}', [arena_size],
+                                      dtypes.uint8,
+                                      storage=storage,
+                                      transient=True,
+                                      lifetime=dtypes.AllocationLifetime.SDFG,
+                                      alignment=max(alignments.values()),
+                                      find_new_name=True)
+            for name in names:
+                desc = sdfg.arrays[name]
+                desc.arena = arena
+                desc.arena_offset = offsets[name]
+                plan.placement[name] = (arena, offsets[name])
+
+            plan.arenas[arena] = arena_size
+            plan.bytes_before += total
+            plan.bytes_after += arena_size
+            plan.peak_live_bytes += _peak_live_bytes(names, sizes, intervals)
+
+        if not plan.arenas:
+            return None
+        return plan
+
+
+def _in_scope(sdfg: SDFG) -> bool:
+    """ Returns True if the given SDFG is nested (at any level) in a scope, such as a map. """
+    while sdfg.parent_nsdfg_node is not None:
+        if sdfg.parent.entry_node(sdfg.parent_nsdfg_node) is not None:
+            return True
+        sdfg = sdfg.parent_sdfg
+    return False
+
+
+def _candidate_sizes(sdfg: SDFG) -> Dict[str, int]:
+    """ Returns the transients of an SDFG that can be placed in an arena, mapped to their size in bytes. """
+    result: Dict[str, int] = {}
+    for name, desc in sdfg.arrays.items():
+        if type(desc) is not data.Array or not desc.transient or desc.arena is not None:
+            continue
+        if desc.storage not in ARENA_STORAGES or desc.lifetime not in _ARENA_LIFETIMES:
+            continue
+        if desc.pool or name in sdfg.constants_prop or isinstance(desc.dtype, dtypes.opaque):
+            continue
+        if symbolic.issymbolic(desc.total_size, sdfg.constants):
+            continue
+        size = int(symbolic.evaluate(desc.total_size, sdfg.constants)) * desc.dtype.bytes
+        if size > 0:
+            result[name] = size
+
+    # Transients that are accessed within scopes may be allocated in each (concurrent) scope instance
+    for state in sdfg.nodes():
+        sdict = state.scope_dict()
+        for node in state.data_nodes():
+            if node.data in result and sdict[node] is not None:
+                del result[node.data]
+    return result
+
+
+class _StateOrder:
+    """
+    A topological order of the states of an SDFG, in which the states of every loop (strongly connected component)
+    are contiguous. The states of loops without nested loops are ordered by their execution order within an
+    iteration.
+    """
+
+    def __init__(self, sdfg: SDFG):
+        graph = sdfg.nx
+        condensed = nx.condensation(graph)
+
+        #: The position of every state in the order
+        self.position: Dict[SDFGState, int] = {}
+        #: The range of positions of the loop that contains each state in a loop
+        self.loop: Dict[SDFGState, Tuple[int, int]] = {}
+        #: Immediate dominators of states in loops without nested loops, starting from the loop header
+        self.idom: Dict[SDFGState, SDFGState] = {}
+
+        for component in nx.lexicographical_topological_sort(
+                condensed, key=lambda c: min(sdfg.node_id(s) for s in condensed.nodes[c]['members'])):
+            members = sorted(condensed.nodes[component]['members'], key=sdfg.node_id)
+            is_loop = len(members) > 1 or graph.has_edge(members[0], members[0])
+            if is_loop:
+                body = _loop_body(graph, members, sdfg.start_state)
+                if body is not None:
+                    header, dag = body
+                    members = list(nx.lexicographical_topological_sort(dag, key=sdfg.node_id))
+                    self.idom.update(nx.immediate_dominators(dag, header))
+                    self.idom[header] = header
+
+            start = len(self.position)
+            for state in members:
+                self.position[state] = len(self.position)
+            if is_loop:
+                for state in members:
+                    self.loop[state] = (start, len(self.position) - 1)
+
+    def dominates(self, dominator: SDFGState, state: SDFGState) -> bool:
+        """ Returns True if every path from the loop header to ``state`` passes through ``dominator``. """
+        while state is not dominator:
+            if self.idom[state] is state:
+                return False
+            state = self.idom[state]
+        return True
+
+
+def _loop_body(graph: nx.MultiDiGraph, members: List[SDFGState],
+               start_state: SDFGState) -> Optional[Tuple[SDFGState, nx.DiGraph]]:
+    """
+    Returns the header and the acyclic body (without back edges) of a loop given by its states, or None if the loop
+    has multiple entry states or nested loops.
+    """
+    entries = [s for s in members if s is start_state or any(p not in members for p in graph.predecessors(s))]
+    if len(entries) != 1:
+        return None
+    header = entries[0]
+    dag = nx.DiGraph(graph.subgraph(members))
+    dag.remove_edges_from(list(dag.in_edges(header)))
+    if not nx.is_directed_acyclic_graph(dag):
+        return None
+    return header, dag
+
+
+def _writes_before_reads(sdfg: SDFG, state: SDFGState, name: str) -> bool:
+    """
+    Returns True if the state writes to the whole container, and every read of the container in the state is
+    preceded by such a write, i.e., no values are read from previous executions of the state.
+    """
+    full = subsets.Range.from_array(sdfg.arrays[name])
+    graph = state.nx
+    writes = set()
+    # Access nodes are visited in dataflow order, regardless of the order in which they were added to the state
+    for node in nx.topological_sort(graph):
+        if not isinstance(node, nodes.AccessNode) or node.data != name:
+            continue
+        covered = False
+        for edge in state.in_edges(node):
+            subset = edge.data.get_dst_subset(edge, state)
+            try:
+                if subset is not None and subset.covers(full):
+                    covered = True
+                    break
+            except TypeError:
+                pass
+        if covered:
+            writes.add(node)
+        elif state.out_degree(node) > 0 and writes.isdisjoint(nx.ancestors(graph, node)):
+            # Read that does not depend on a write of the whole container
+            return False
+    return len(writes) > 0
+
+
+def _live_intervals(sdfg: SDFG, names: Set[str]) -> Dict[str, Tuple[int, int]]:
+    """ Computes the live intervals of the given transients, in terms of state positions (see ``_StateOrder``). """
+    order = _StateOrder(sdfg)
+
+    uses: Dict[str, Set[SDFGState]] = defaultdict(set)
+    edge_uses: Set[str] = set()
+    for state in sdfg.nodes():
+        for node in state.data_nodes():
+            if node.data in names:
+                uses[node.data].add(state)
+    for edge in sdfg.edges():
+        for name in edge.data.free_symbols & names:
+            uses[name].add(edge.src)
+            uses[name].add(edge.dst)
+            edge_uses.add(name)
+
+    intervals: Dict[str, Tuple[int, int]] = {}
+    for name, states in uses.items():
+        start = min(order.position[s] for s in states)
+        end = max(order.position[s] for s in states)
+        loops = {order.loop.get(s) for s in states}
+        if None not in loops:
+            if (len(loops) == 1 and name not in edge_uses and all(s in order.idom for s in states)
+                    and any(_writes_before_reads(sdfg, w, name) and all(order.dominates(w, s) for s in states)
+                            for w in states)):
+                # Overwritten before use in every iteration, thus not live across loop iterations
+                intervals[name] = (start, end)
+                continue
+        # Data accessed in loops is otherwise live throughout the loop
+        for state in states:
+            if state in order.loop:
+                start = min(start, order.loop[state][0])
+                end = max(end, order.loop[state][1])
+        intervals[name] = (start, end)
+    return intervals
+
+
+def _align(offset: int, alignment: int) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _place(names: List[str], sizes: Dict[str, int], alignments: Dict[str, int],
+           intervals: Dict[str, Tuple[int, int]]) -> Tuple[Dict[str, int], int]:
+    """
+    Places buffers in an arena such that buffers with overlapping live intervals do not overlap in memory. Buffers
+    are placed from largest to smallest, each at the lowest aligned offset that does not conflict with an already
+    placed buffer.
+
+    :return: A tuple of the offset of every buffer, and the total arena size.
+    """
+    offsets: Dict[str, int] = {}
+    arena_size = 0
+    for name in sorted(names, key=lambda n: (-sizes[n], n)):
+        start, end = intervals[name]
+        conflicts = sorted((offsets[other], offsets[other] + sizes[other]) for other in offsets
+                           if intervals[other][0] <= end and start <= intervals[other][1])
+        offset = 0
+        for begin, finish in conflicts:
+            if offset + sizes[name] <= begin:
+                break
+            offset = max(offset, _align(finish, alignments[name]))
+        offsets[name] = offset
+        arena_size = max(arena_size, offset + sizes[name])
+    return offsets, arena_size
+
+
+def _peak_live_bytes(names: List[str], sizes: Dict[str, int], intervals: Dict[str, Tuple[int, int]]) -> int:
+    positions = {p for name in names for p in intervals[name]}
+    return max(sum(sizes[n] for n in names if intervals[n][0] <= p <= intervals[n][1]) for p in positions)
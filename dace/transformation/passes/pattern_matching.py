@@ -2,7 +2,10 @@
 """ Contains functions related to pattern matching in transformations. """
 
 import collections
+import concurrent.futures
 from dataclasses import dataclass
+import itertools
+import os
 import time
 
 from dace import properties
@@ -13,7 +16,12 @@ import networkx as nx
 from networkx.algorithms import isomorphism as iso
 from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type, Union
 from dace.sdfg.validation import InvalidSDFGError
-from dace.transformation import transformation as xf, pass_pipeline as ppl
+from dace.transformation import transformation as xf, pass_pipeline as ppl, pass_profiling
+
+
+def _transformation_name(xform: Union[xf.PatternTransformation, Type[xf.PatternTransformation]]) -> str:
+    """ Returns the name of a transformation given as a class or as an instance. """
+    return (xform if isinstance(xform, type) else type(xform)).__name__
 
 
 @dataclass
@@ -93,14 +101,18 @@ class PatternMatchAndApply(ppl.Pass):
 
     def apply_pass(self, sdfg: SDFG, pipeline_results: Dict[str, Any]) -> Dict[str, List[Any]]:
         applied_transformations = collections.defaultdict(list)
+        cache = MatchCache()
 
         # For every transformation in the list, find first match and apply
         for xform in self.transformations:
             # Find only the first match
-            try:
-                match = next(m for m in match_patterns(
-                    sdfg, [xform], metadata=self._metadata, permissive=self.permissive, states=self.states))
-            except StopIteration:
+            with pass_profiling.record(_transformation_name(xform), 'match'):
+                match = next(match_patterns(sdfg, [xform],
+                                            metadata=self._metadata,
+                                            permissive=self.permissive,
+                                            states=self.states,
+                                            cache=cache), None)
+            if match is None:
                 continue
 
             tsdfg = sdfg.sdfg_list[match.sdfg_id]
@@ -109,7 +121,9 @@ class PatternMatchAndApply(ppl.Pass):
             # Set previous pipeline results
             match._pipeline_results = pipeline_results
 
-            result = match.apply(graph, tsdfg)
+            with pass_profiling.record(type(match).__name__, 'transformation') as event:
+                result = match.apply(graph, tsdfg)
+                event.modified = match.modifies()
             applied_transformations[type(match).__name__].append(result)
             if self.validate_all:
                 sdfg.validate()
@@ -165,7 +179,9 @@ class PatternMatchAndApplyRepeated(PatternMatchAndApply):
         if self.validate_all:
             match_name = match.print_match(tsdfg)
 
-        applied_transformations[type(match).__name__].append(match.apply(graph, tsdfg))
+        with pass_profiling.record(type(match).__name__, 'transformation') as event:
+            applied_transformations[type(match).__name__].append(match.apply(graph, tsdfg))
+            event.modified = match.modifies()
         if self.progress or (self.progress is None and (time.time() - start) > 5):
             print('Applied {}.\r'.format(', '.join(['%d %s' % (len(v), k)
                                                     for k, v in applied_transformations.items()])),
@@ -191,6 +207,9 @@ class PatternMatchAndApplyRepeated(PatternMatchAndApply):
         xforms = self.transformations
         match: Optional[xf.PatternTransformation] = None
 
+        # Graphs that were not modified by a transformation are not collapsed and matched again
+        cache = MatchCache()
+
         # Ensure transformations are unique
         if len(xforms) != len(set(xforms)):
             raise ValueError('Transformation set must be unique')
@@ -203,15 +222,18 @@ class PatternMatchAndApplyRepeated(PatternMatchAndApply):
                     applied = True
                     while applied:
                         applied = False
-                        for match in match_patterns(sdfg,
-                                                    permissive=self.permissive,
-                                                    patterns=[xform],
-                                                    states=self.states,
-                                                    metadata=self._metadata):
+                        with pass_profiling.record(_transformation_name(xform), 'match'):
+                            found = next(match_patterns(sdfg,
+                                                        permissive=self.permissive,
+                                                        patterns=[xform],
+                                                        states=self.states,
+                                                        metadata=self._metadata,
+                                                        cache=cache), None)
+                        if found is not None:
+                            match = found
                             self._apply_and_validate(match, sdfg, start, pipeline_results, applied_transformations)
                             applied = True
                             applied_anything = True
-                            break
                 if apply_once:
                     break
         else:
@@ -219,14 +241,17 @@ class PatternMatchAndApplyRepeated(PatternMatchAndApply):
             while applied:
                 applied = False
                 # Find and apply one of the chosen transformations
-                for match in match_patterns(sdfg,
-                                            permissive=self.permissive,
-                                            patterns=xforms,
-                                            states=self.states,
-                                            metadata=self._metadata):
+                with pass_profiling.record(type(self).__name__, 'match'):
+                    found = next(match_patterns(sdfg,
+                                                permissive=self.permissive,
+                                                patterns=xforms,
+                                                states=self.states,
+                                                metadata=self._metadata,
+                                                cache=cache), None)
+                if found is not None:
+                    match = found
                     self._apply_and_validate(match, sdfg, start, pipeline_results, applied_transformations)
                     applied = True
-                    break
                 if apply_once:
                     break
 
@@ -438,9 +463,130 @@ def get_transformation_metadata(patterns: List[Type[xf.PatternTransformation]],
     return interstate_transformations, singlestate_transformations
 
 
+def _node_class(node: Any) -> type:
+    """
+    Returns the class of a node in a collapsed graph or pattern, or in a graph structure (where nodes are classes).
+    Nodes that ``type_match`` accepts for a pattern node are always instances of this class.
+    """
+    if isinstance(node, xf.PatternNode):
+        return node.node
+    if isinstance(node, type):
+        return node
+    return type(node)
+
+
+def _pattern_class_counts(nxpattern: nx.DiGraph) -> Dict[type, int]:
+    """ Returns the number of nodes of each class in a collapsed pattern graph (cached on the pattern). """
+    result = nxpattern.graph.get('node_classes')
+    if result is None:
+        result = collections.Counter(_node_class(nxpattern.nodes[pnid]['node']) for pnid in nxpattern.nodes)
+        nxpattern.graph['node_classes'] = result
+    return result
+
+
+def _can_match(graph: Union[SDFG, SDFGState], nxpattern: nx.DiGraph) -> bool:
+    """
+    Returns False if a pattern cannot match in the given graph with ``type_match``, because the graph does not contain
+    enough nodes of one of the pattern's node classes. Uses the node type index of the graph, so it does not require
+    collapsing it.
+    """
+    return all(graph.number_of_nodes_of_type(cls) >= count for cls, count in _pattern_class_counts(nxpattern).items())
+
+
+def _nodes_by_class(digraph: nx.DiGraph) -> Dict[type, List[int]]:
+    """ Returns the IDs of the nodes of a collapsed graph, grouped by node class in graph order (cached on the graph). """
+    result = digraph.graph.get('nodes_by_class')
+    if result is None:
+        result = {}
+        for nid, node in digraph.nodes(data='node'):
+            result.setdefault(_node_class(node), []).append(nid)
+        digraph.graph['nodes_by_class'] = result
+    return result
+
+
+def _class_candidates(digraph: nx.DiGraph, pattern_node: Dict[str, Any]) -> List[int]:
+    """
+    Returns the IDs of the nodes of a collapsed graph that may match the given pattern node with a type-based
+    predicate (``type_match`` or ``_class_match``), in graph order.
+    """
+    cls = _node_class(pattern_node['node'])
+    groups = [nids for ncls, nids in _nodes_by_class(digraph).items() if issubclass(ncls, cls)]
+    if len(groups) == 1:
+        return groups[0]
+    return sorted(nid for nids in groups for nid in nids)
+
+
+class _SeededDiGraphMatcher(iso.DiGraphMatcher):
+    """
+    VF2 matcher that only tries the given seed nodes for the first pattern node, and skips candidate pairs whose graph
+    node is not among the candidates of the pattern node before testing their feasibility. As long as all skipped pairs
+    would fail the semantic feasibility test, matches are yielded in the same order as with ``iso.DiGraphMatcher``.
+    """
+
+    def __init__(self, G1: nx.DiGraph, G2: nx.DiGraph, seeds: List[int], candidates: Dict[int, Set[int]],
+                 node_match: Callable, edge_match: Optional[Callable]):
+        super().__init__(G1, G2, node_match=node_match, edge_match=edge_match)
+        self.seeds = seeds
+        self.candidates = candidates
+
+    def candidate_pairs_iter(self):
+        if not self.core_1:
+            first = min(self.G2_nodes, key=self.G2_node_order.__getitem__)
+            for node_1 in self.seeds:
+                yield node_1, first
+            return
+        for node_1, node_2 in super().candidate_pairs_iter():
+            if node_1 in self.candidates[node_2]:
+                yield node_1, node_2
+
+
+def _seed_nodes(digraph: nx.DiGraph, nxpattern: nx.DiGraph, candidates: Dict[int, List[int]]) -> List[int]:
+    """
+    Returns the graph nodes to try for the first pattern node. Matching is seeded from the candidates of the rarest
+    pattern node: only candidates of the first pattern node that are within the (undirected) pattern distance of one of
+    them can be part of a match.
+    """
+    first = next(iter(nxpattern))
+    seeds = candidates[first]
+    rarest = min(nxpattern, key=lambda pnid: len(candidates[pnid]))
+    if len(candidates[rarest]) >= len(seeds):
+        return seeds
+    try:
+        distance = nx.shortest_path_length(nxpattern.to_undirected(as_view=True), rarest, first)
+    except nx.NetworkXNoPath:
+        return seeds
+
+    # Expand from the rarest candidates along local edges
+    reachable = set(candidates[rarest])
+    frontier = reachable
+    for _ in range(distance):
+        frontier = {
+            neighbor
+            for nid in frontier for neighbor in itertools.chain(digraph.successors(nid), digraph.predecessors(nid))
+        } - reachable
+        reachable |= frontier
+    return [nid for nid in seeds if nid in reachable]
+
+
 def _subgraph_isomorphism_matcher(digraph, nxpattern, node_pred, edge_pred):
     """ Match based on the VF2 algorithm for general SI. """
-    graph_matcher = iso.DiGraphMatcher(digraph, nxpattern, node_match=node_pred, edge_match=edge_pred)
+    if node_pred is not type_match and node_pred is not _class_match:
+        graph_matcher = iso.DiGraphMatcher(digraph, nxpattern, node_match=node_pred, edge_match=edge_pred)
+        yield from graph_matcher.subgraph_isomorphisms_iter()
+        return
+
+    # An empty pattern matches once, with an empty mapping (as in networkx)
+    if nxpattern.number_of_nodes() == 0:
+        yield {}
+        return
+
+    # With type-based predicates, restrict candidates using the node classes of the graph
+    candidates = {pnid: _class_candidates(digraph, nxpattern.nodes[pnid]) for pnid in nxpattern}
+    if any(len(c) == 0 for c in candidates.values()):
+        return
+    seeds = _seed_nodes(digraph, nxpattern, candidates)
+    candidate_sets = {pnid: set(nids) for pnid, nids in candidates.items()}
+    graph_matcher = _SeededDiGraphMatcher(digraph, nxpattern, seeds, candidate_sets, node_pred, edge_pred)
     yield from graph_matcher.subgraph_isomorphisms_iter()
 
 
@@ -449,7 +595,11 @@ def _node_matcher(digraph, nxpattern, node_pred, edge_pred):
     pnid = next(iter(nxpattern))
     pnode = nxpattern.nodes[pnid]
 
-    for nid in digraph:
+    if node_pred is type_match or node_pred is _class_match:
+        nids = _class_candidates(digraph, pnode)
+    else:
+        nids = digraph
+    for nid in nids:
         if node_pred(digraph.nodes[nid], pnode):
             yield {nid: pnid}
 
@@ -460,14 +610,24 @@ def _edge_matcher(digraph, nxpattern, node_pred, edge_pred):
     pu = nxpattern.nodes[pedge[0]]
     pv = nxpattern.nodes[pedge[1]]
 
+    if node_pred is type_match or node_pred is _class_match:
+        # Skip edges whose endpoints cannot match before calling the predicates
+        ucandidates = set(_class_candidates(digraph, pu))
+        vcandidates = set(_class_candidates(digraph, pv))
+        if not ucandidates or not vcandidates:
+            return
+        edges = ((u, v) for u, v in digraph.edges if u in ucandidates and v in vcandidates)
+    else:
+        edges = digraph.edges
+
     if edge_pred is None:
-        for u, v in digraph.edges:
+        for u, v in edges:
             if (node_pred(digraph.nodes[u], pu) and node_pred(digraph.nodes[v], pv)):
                 if u is v:  # Skip self-edges
                     continue
                 yield {u: pedge[0], v: pedge[1]}
     else:
-        for u, v in digraph.edges:
+        for u, v in edges:
             if (node_pred(digraph.nodes[u], pu) and node_pred(digraph.nodes[v], pv)
                     and edge_pred(digraph.edges[u, v], nxpattern.edges[pedge])):
                 if u is v:  # Skip self-edges
@@ -475,6 +635,231 @@ def _edge_matcher(digraph, nxpattern, node_pred, edge_pred):
                 yield {u: pedge[0], v: pedge[1]}
 
 
+class _LazyMatches:
+    """ Subgraph matches of one pattern in one graph, enumerated on demand and memoized for subsequent iterations. """
+
+    def __init__(self, matches: Iterable[Dict[int, int]]):
+        if isinstance(matches, list):
+            self._matches = matches
+            self._pending = None
+        else:
+            self._matches: List[Dict[int, int]] = []
+            self._pending: Optional[Iterator[Dict[int, int]]] = iter(matches)
+
+    @property
+    def complete(self) -> bool:
+        return self._pending is None
+
+    def __iter__(self) -> Iterator[Dict[int, int]]:
+        i = 0
+        while True:
+            if i == len(self._matches):
+                if self._pending is None:
+                    return
+                try:
+                    self._matches.append(next(self._pending))
+                except StopIteration:
+                    self._pending = None
+                    return
+            yield self._matches[i]
+            i += 1
+
+
+class _CachedGraph:
+    """ Collapsed graph and structural pattern matches of a graph at a specific structure version. """
+
+    __slots__ = ('graph', 'version', 'digraph', 'matches')
+
+    def __init__(self, graph: Union[SDFG, SDFGState]):
+        self.graph = graph
+        self.version = graph.structure_version
+        self.digraph: nx.DiGraph = collapse_multigraph_to_nx(graph)
+        self.matches: Dict[nx.DiGraph, _LazyMatches] = {}
+
+
+class MatchCache:
+    """
+    Caches the collapsed graphs and structural pattern matches (candidates for ``can_be_applied``) of the graphs in an
+    SDFG hierarchy across calls to ``match_patterns``. An entry is discarded once the structure of its graph changes
+    (see ``OrderedDiGraph.structure_version``), so repeatedly matching and applying transformations only collapses and
+    matches the states and SDFGs that the applied transformations modified. Candidates are enumerated lazily, i.e., only
+    as far as a consumer iterated over them.
+
+    Since ``can_be_applied`` may depend on other parts of the SDFG, it is evaluated anew on every call. The cache is
+    only used with the default ``type_match`` node predicate and no edge predicate, which depend solely on the graph
+    structure.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, _CachedGraph] = {}
+
+    def _entry(self, graph: Union[SDFG, SDFGState]) -> _CachedGraph:
+        entry = self._entries.get(id(graph))
+        if entry is None or entry.graph is not graph or entry.version != graph.structure_version:
+            entry = _CachedGraph(graph)
+            self._entries[id(graph)] = entry
+        return entry
+
+    def digraph(self, graph: Union[SDFG, SDFGState]) -> nx.DiGraph:
+        """ Returns the collapsed version of the given graph (see ``collapse_multigraph_to_nx``). """
+        return self._entry(graph).digraph
+
+    def matches(self, graph: Union[SDFG, SDFGState], nxpattern: nx.DiGraph, matcher: Callable) -> Iterable[Dict[int, int]]:
+        """ Returns the structural matches of a collapsed pattern in the given graph. """
+        entry = self._entry(graph)
+        result = entry.matches.get(nxpattern)
+        if result is None:
+            result = _LazyMatches(matcher(entry.digraph, nxpattern, type_match, None))
+            entry.matches[nxpattern] = result
+        return result
+
+    def has_matches(self, graph: Union[SDFG, SDFGState], nxpatterns: Iterable[nx.DiGraph]) -> bool:
+        """ Returns True if all structural matches of the given patterns in the graph are cached. """
+        entry = self._entries.get(id(graph))
+        if entry is None or entry.graph is not graph or entry.version != graph.structure_version:
+            return False
+        return all(p in entry.matches and entry.matches[p].complete for p in nxpatterns)
+
+    def set_matches(self, graph: Union[SDFG, SDFGState], nxpattern: nx.DiGraph, matches: List[Dict[int, int]]):
+        """ Stores all structural matches of a collapsed pattern in the given graph, e.g., as computed by workers. """
+        self._entry(graph).matches[nxpattern] = _LazyMatches(matches)
+
+
+#: A graph structure for matching in worker processes: node classes and unique edges (in collapsing order)
+GraphStructure = Tuple[Tuple[type, ...], Tuple[Tuple[int, int], ...]]
+
+_match_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_match_pool_workers = 0
+
+
+def _get_match_processes() -> int:
+    """ Returns the number of processes to use for pattern matching, as set in ``optimizer.match_processes``. """
+    processes = Config.get('optimizer', 'match_processes')
+    if processes <= 0:
+        processes = os.cpu_count() or 1
+    return processes
+
+
+def _get_match_pool(workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    """ Returns the process pool used for pattern matching, (re)creating it if necessary. """
+    global _match_pool, _match_pool_workers
+    if _match_pool is None or _match_pool_workers != workers:
+        if _match_pool is not None:
+            _match_pool.shutdown(wait=False)
+        _match_pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        _match_pool_workers = workers
+    return _match_pool
+
+
+def _graph_structure(graph: Union[SDFG, SDFGState]) -> GraphStructure:
+    """
+    Returns the structure of a graph, as collapsed by ``collapse_multigraph_to_nx``, with each node replaced by its
+    class. Matching on this structure with ``_class_match`` yields the same matches (in the same order) as matching on
+    the collapsed graph with ``type_match``.
+    """
+    node_id = {node: i for i, node in enumerate(graph.nodes())}
+    classes = tuple(type(node) for node in node_id)
+    edges = tuple(dict.fromkeys((node_id[e.src], node_id[e.dst]) for e in graph.edges()))
+    return classes, edges
+
+
+def _pattern_structure(nxpattern: nx.DiGraph) -> GraphStructure:
+    """ Returns the structure of a collapsed pattern graph, with each node replaced by the class it matches. """
+    classes = tuple(_node_class(nxpattern.nodes[nid]['node']) for nid in nxpattern.nodes)
+    return classes, tuple(nxpattern.edges)
+
+
+def _digraph_from_structure(structure: GraphStructure) -> nx.DiGraph:
+    classes, edges = structure
+    result = nx.DiGraph()
+    result.add_nodes_from((i, {'node': cls}) for i, cls in enumerate(classes))
+    result.add_edges_from(edges)
+    return result
+
+
+def _class_match(graph_node, pattern_node):
+    """ Node predicate for graph structures, equivalent to ``type_match``. """
+    return issubclass(graph_node['node'], pattern_node['node'])
+
+
+def _match_structures(graphs: List[Tuple[GraphStructure, int]],
+                      patterns: List[List[Tuple[Callable, GraphStructure]]]) -> List[List[List[Dict[int, int]]]]:
+    """
+    Enumerates structural pattern matches in a list of graphs. Runs in worker processes.
+
+    :param graphs: A list of graph structures, each with the index of the list of patterns to match in it.
+    :param patterns: Lists of patterns (matcher and pattern structure) to match.
+    :return: For each graph, a list of the subgraph matches of each of its patterns.
+    """
+    nxpatterns = [[(matcher, _digraph_from_structure(pattern)) for matcher, pattern in plist] for plist in patterns]
+    result = []
+    for structure, pattern_index in graphs:
+        digraph = _digraph_from_structure(structure)
+        result.append([
+            list(matcher(digraph, nxpattern, _class_match, None)) for matcher, nxpattern in nxpatterns[pattern_index]
+        ])
+    return result
+
+
+def _parallel_structural_matches(
+        graphs: List[Tuple[Union[SDFG, SDFGState], int]],
+        patterns: List[List[Tuple[Callable, nx.DiGraph]]]) -> Iterator[Optional[List[List[Dict[int, int]]]]]:
+    """
+    Enumerates structural pattern matches in a list of graphs using worker processes. Matching is read-only and runs
+    on snapshots of the graph structures, so that the results are yielded in graph order. If a graph was modified
+    since its snapshot was taken, or if the worker processes failed, yields None for that graph, in which case the
+    caller should match it locally.
+
+    :param graphs: A list of graphs, each with the index of the list of patterns to match in it.
+    :param patterns: Lists of patterns (matcher and collapsed pattern graph) to match.
+    :return: A generator yielding, for each graph, the subgraph matches of each of its patterns (or None).
+    """
+    workers = _get_match_processes()
+    structures = [_graph_structure(graph) for graph, _ in graphs]
+    pattern_structures = [[(matcher, _pattern_structure(nxpattern)) for matcher, nxpattern in plist]
+                          for plist in patterns]
+
+    # Split graphs into a few chunks per worker to balance load and amortize communication
+    chunk_size = max(1, -(-len(graphs) // (workers * 4)))
+    chunks = [range(i, min(i + chunk_size, len(graphs))) for i in range(0, len(graphs), chunk_size)]
+    try:
+        pool = _get_match_pool(workers)
+        futures = [
+            pool.submit(_match_structures, [(structures[i], graphs[i][1]) for i in chunk], pattern_structures)
+            for chunk in chunks
+        ]
+    except Exception:  # Pool could not be started (e.g., process creation is not allowed)
+        yield from (None for _ in graphs)
+        return
+
+    try:
+        for chunk, future in zip(chunks, futures):
+            try:
+                results = future.result()
+            except Exception:  # Worker failure (e.g., a node class cannot be transferred to the worker)
+                results = [None] * len(chunk)
+            for i, result in zip(chunk, results):
+                # Graph may have been modified by the consumer while iterating
+                if result is not None and _graph_structure(graphs[i][0]) != structures[i]:
+                    result = None
+                yield result
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _matchable_transformations(graph: Union[SDFG, SDFGState], transformations: TransformationData,
+                               node_match: Callable[[Any, Any], bool]) -> TransformationData:
+    """ Filters a list of transformations to those whose patterns may match in the given graph. """
+    if node_match is not type_match:
+        return transformations
+    return [t for t in transformations if _can_match(graph, t[2])]
+
+
+def _use_parallel_matching(num_graphs: int) -> bool:
+    return (_get_match_processes() > 1 and num_graphs >= Config.get('optimizer', 'match_parallel_threshold'))
+
+
 def match_patterns(sdfg: SDFG,
                    patterns: Union[Type[xf.PatternTransformation], List[Type[xf.PatternTransformation]]],
                    node_match: Callable[[Any, Any], bool] = type_match,
@@ -482,7 +867,8 @@ def match_patterns(sdfg: SDFG,
                    permissive: bool = False,
                    metadata: Optional[PatternMetadataType] = None,
                    states: Optional[List[SDFGState]] = None,
-                   options: Optional[List[Dict[str, Any]]] = None):
+                   options: Optional[List[Dict[str, Any]]] = None,
+                   cache: Optional[MatchCache] = None):
     """ Returns a generator of Transformations that match the input SDFG. 
         Ordered by SDFG ID.
 
@@ -496,6 +882,9 @@ def match_patterns(sdfg: SDFG,
                        transformations on this list.
         :param options: An optional iterable of transformation parameter
                         dictionaries.
+        :param cache: An optional cache of collapsed graphs and structural
+                      matches to reuse across calls. Only used with the
+                      default node and edge predicates.
         :return: A list of PatternTransformation objects that match.
     """
 
@@ -515,16 +904,31 @@ def match_patterns(sdfg: SDFG,
     # Collect SDFG and nested SDFGs
     sdfgs = sdfg.all_sdfgs_recursive()
 
+    # Structural matches can only be cached if they do not depend on node and edge contents
+    if node_match is not type_match or edge_match is not None:
+        cache = None
+
+    # If possible, enumerate structural matches in worker processes (matches are checked in order in this process)
+    if node_match is type_match and edge_match is None and _get_match_processes() > 1:
+        yield from _match_patterns_parallel(list(sdfgs), interstate_transformations, singlestate_transformations,
+                                            permissive, states, cache)
+        return
+
     # Try to find transformations on each SDFG
     for tsdfg in sdfgs:
         ###################################
         # Match inter-state transformations
-        if len(interstate_transformations) > 0:
+        xforms = _matchable_transformations(tsdfg, interstate_transformations, node_match)
+        if len(xforms) > 0:
             # Collapse multigraph into directed graph in order to use VF2
-            digraph = collapse_multigraph_to_nx(tsdfg)
+            digraph = cache.digraph(tsdfg) if cache is not None else collapse_multigraph_to_nx(tsdfg)
 
-        for xform, expr_idx, nxpattern, matcher, opts in interstate_transformations:
-            for subgraph in matcher(digraph, nxpattern, node_match, edge_match):
+        for xform, expr_idx, nxpattern, matcher, opts in xforms:
+            if cache is not None:
+                subgraphs = cache.matches(tsdfg, nxpattern, matcher)
+            else:
+                subgraphs = matcher(digraph, nxpattern, node_match, edge_match)
+            for subgraph in subgraphs:
                 match = _try_to_match_transformation(tsdfg, digraph, subgraph, tsdfg, xform, expr_idx, nxpattern, -1,
                                                      permissive, opts)
                 if match is not None:
@@ -538,17 +942,89 @@ def match_patterns(sdfg: SDFG,
             if states is not None and state not in states:
                 continue
 
+            # Skip states that do not contain the node types of any pattern without collapsing them
+            xforms = _matchable_transformations(state, singlestate_transformations, node_match)
+            if len(xforms) == 0:
+                continue
+
             # Collapse multigraph into directed graph in order to use VF2
-            digraph = collapse_multigraph_to_nx(state)
+            digraph = cache.digraph(state) if cache is not None else collapse_multigraph_to_nx(state)
 
-            for xform, expr_idx, nxpattern, matcher, opts in singlestate_transformations:
-                for subgraph in matcher(digraph, nxpattern, node_match, edge_match):
+            for xform, expr_idx, nxpattern, matcher, opts in xforms:
+                if cache is not None:
+                    subgraphs = cache.matches(state, nxpattern, matcher)
+                else:
+                    subgraphs = matcher(digraph, nxpattern, node_match, edge_match)
+                for subgraph in subgraphs:
                     match = _try_to_match_transformation(state, digraph, subgraph, tsdfg, xform, expr_idx, nxpattern,
                                                          state_id, permissive, opts)
                     if match is not None:
                         yield match
 
 
+def _match_patterns_parallel(sdfgs: List[SDFG], interstate_transformations: TransformationData,
+                             singlestate_transformations: TransformationData, permissive: bool,
+                             states: Optional[List[SDFGState]],
+                             cache: Optional[MatchCache] = None) -> Iterator[xf.PatternTransformation]:
+    """
+    Pattern matching with structural enumeration in worker processes. Yields the same transformations in the same
+    order as the serial path of ``match_patterns`` with the default node and edge predicates. If a cache is given,
+    only graphs without cached matches are sent to the workers.
+    """
+    # Collect graphs to match in, in serial matching order: (SDFG, state ID, graph, transformation list index)
+    transformations = [interstate_transformations, singlestate_transformations]
+    graphs: List[Tuple[SDFG, int, Union[SDFG, SDFGState], int]] = []
+    for tsdfg in sdfgs:
+        if len(_matchable_transformations(tsdfg, interstate_transformations, type_match)) > 0:
+            graphs.append((tsdfg, -1, tsdfg, 0))
+        if len(singlestate_transformations) > 0:
+            for state_id, state in enumerate(tsdfg.nodes()):
+                if states is not None and state not in states:
+                    continue
+                if len(_matchable_transformations(state, singlestate_transformations, type_match)) > 0:
+                    graphs.append((tsdfg, state_id, state, 1))
+
+    # Graphs whose matches are already cached do not need to be matched again
+    if cache is not None:
+        pending = [
+            i for i, (_, _, graph, tindex) in enumerate(graphs)
+            if not cache.has_matches(graph, (t[2] for t in transformations[tindex]))
+        ]
+    else:
+        pending = list(range(len(graphs)))
+
+    if _use_parallel_matching(len(pending)):
+        patterns = [[(matcher, nxpattern) for _, _, nxpattern, matcher, _ in tlist] for tlist in transformations]
+        pending_results = _parallel_structural_matches([(graphs[i][2], graphs[i][3]) for i in pending], patterns)
+    else:
+        pending_results = (None for _ in pending)
+    pending_results = iter(pending_results)
+    pending = set(pending)
+
+    for gid, (tsdfg, state_id, graph, tindex) in enumerate(graphs):
+        # Results are consumed in graph order, such that workers can be cancelled if the consumer stops early
+        result = next(pending_results) if gid in pending else None
+
+        # Collapse multigraph into directed graph in order to use VF2 (or map structural matches back to nodes)
+        digraph = cache.digraph(graph) if cache is not None else collapse_multigraph_to_nx(graph)
+        for i, (xform, expr_idx, nxpattern, matcher, opts) in enumerate(transformations[tindex]):
+            if not _can_match(graph, nxpattern):
+                continue
+            if result is not None:
+                subgraphs = result[i]
+                if cache is not None:
+                    cache.set_matches(graph, nxpattern, subgraphs)
+            elif cache is not None:
+                subgraphs = cache.matches(graph, nxpattern, matcher)
+            else:
+                subgraphs = matcher(digraph, nxpattern, type_match, None)
+            for subgraph in subgraphs:
+                match = _try_to_match_transformation(graph, digraph, subgraph, tsdfg, xform, expr_idx, nxpattern,
+                                                     state_id, permissive, opts)
+                if match is not None:
+                    yield match
+
+
 def enumerate_matches(sdfg: SDFG,
                       pattern: gr.Graph,
                       node_match=type_or_class_match,
@@ -573,6 +1049,24 @@ def enumerate_matches(sdfg: SDFG,
     pattern_digraph = collapse_multigraph_to_nx(pattern)
 
     # Find matches in all SDFGs and nested SDFGs
+    if node_match is type_or_class_match and edge_match is None and _get_match_processes() > 1:
+        if is_interstate:
+            graphs = list(sdfg.all_sdfgs_recursive())
+        else:
+            graphs = [state for graph in sdfg.all_sdfgs_recursive() for state in graph.nodes()]
+        if _use_parallel_matching(len(graphs)):
+            results = _parallel_structural_matches([(graph, 0) for graph in graphs],
+                                                   [[(_subgraph_isomorphism_matcher, pattern_digraph)]])
+            for graph, result in zip(graphs, results):
+                if result is not None:
+                    subgraphs = result[0]
+                else:
+                    subgraphs = _subgraph_isomorphism_matcher(collapse_multigraph_to_nx(graph), pattern_digraph,
+                                                              node_match, edge_match)
+                for subgraph in subgraphs:
+                    yield gr.SubgraphView(graph, [graph.node(i) for i in subgraph.keys()])
+            return
+
     for graph in sdfg.all_sdfgs_recursive():
         if is_interstate:
             graph_matcher = iso.DiGraphMatcher(collapse_multigraph_to_nx(graph),
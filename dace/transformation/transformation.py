@@ -227,6 +227,8 @@ class PatternTransformation(TransformationBase):
         tsdfg: SDFG = self._sdfg.sdfg_list[self.sdfg_id]
         tgraph = tsdfg.node(self.state_id) if self.state_id >= 0 else tsdfg
         retval = self.apply(tgraph, tsdfg)
+        # Transformations may modify nodes and memlets in-place, clear cached hashes of the transformed graph
+        tgraph.invalidate_hash()
         if annotate and not self.annotates_memlets():
             propagation.propagate_memlets_sdfg(tsdfg)
         return retval
@@ -773,7 +775,15 @@ class SubgraphTransformation(TransformationBase):
 
     def apply_pass(self, sdfg: SDFG, pipeline_results: Dict[str, Any]) -> Optional[Any]:
         self._pipeline_results = pipeline_results
-        return self.apply(sdfg)
+        retval = self.apply(sdfg)
+        self._invalidate_hash(sdfg)
+        return retval
+
+    def _invalidate_hash(self, sdfg: SDFG):
+        """ Clears the cached hashes of the graph this transformation was applied to. """
+        tsdfg: SDFG = sdfg.sdfg_list[self.sdfg_id]
+        tgraph = tsdfg.node(self.state_id) if self.state_id >= 0 else tsdfg
+        tgraph.invalidate_hash()
 
     @classmethod
     def apply_to(cls,
@@ -851,7 +861,9 @@ class SubgraphTransformation(TransformationBase):
                                  'given subgraph ("can_be_applied" failed)')
 
         # Apply to SDFG
-        return instance.apply(sdfg)
+        retval = instance.apply(sdfg)
+        instance._invalidate_hash(sdfg)
+        return retval
 
     def to_json(self, parent=None):
         props = serialize.all_properties_to_json(self)
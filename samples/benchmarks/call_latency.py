@@ -0,0 +1,43 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+""" 
+Measures the Python-side latency of calling a compiled SDFG with a trivial kernel, comparing regular calls (which use
+cached argument plans), calls that bypass argument construction (``fast_call``), and uncached argument construction.
+"""
+
+import argparse
+import time
+import dace
+import numpy as np
+
+N = dace.symbol('N')
+
+
+@dace.program
+def increment(A: dace.float64[N], alpha: dace.float64):
+    A[0] += alpha
+
+
+def per_call(func, iterations: int) -> float:
+    """ Returns the average time of calling ``func`` in microseconds. """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("iterations", type=int, nargs="?", default=10000)
+    args = parser.parse_args()
+
+    csdfg = increment.to_sdfg().compile()
+    A = np.zeros(16)
+    kwargs = dict(A=A, alpha=1.0, N=A.shape[0])
+
+    callargs, initargs = csdfg.construct_arguments(**kwargs)
+    print('Call latency (average over %d calls):' % args.iterations)
+    print('  __call__:                   %8.2f us' % per_call(lambda: csdfg(**kwargs), args.iterations))
+    print('  fast_call:                  %8.2f us' % per_call(lambda: csdfg.fast_call(callargs, initargs),
+                                                        args.iterations))
+    print('  uncached argument creation: %8.2f us' % per_call(lambda: csdfg._construct_args_generic(dict(kwargs)),
+                                                        args.iterations))
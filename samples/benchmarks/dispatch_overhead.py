@@ -0,0 +1,48 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+"""
+Measures the per-call overhead of calling a trivial ``@dace.program`` whose compiled version is already cached,
+comparing fast dispatch (by argument fingerprint) with dispatch by full program cache keys, and with calling the
+compiled SDFG directly.
+"""
+
+import argparse
+import time
+import dace
+import numpy as np
+
+N = dace.symbol('N')
+SCALE = 2.0
+
+
+def increment(A: dace.float64[N], alpha: dace.float64):
+    A[0] += alpha * SCALE
+
+
+def per_call(func, iterations: int) -> float:
+    """ Returns the average time of calling ``func`` in microseconds. """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("iterations", type=int, nargs="?", default=10000)
+    args = parser.parse_args()
+
+    A = np.zeros(16)
+    fast = dace.program(increment)
+    with dace.config.set_temporary('frontend', 'fast_dispatch', value=False):
+        slow = dace.program(increment)
+
+    # Compile both programs and fill their caches
+    fast(A, 1.0)
+    fast(A, 1.0)
+    slow(A, 1.0)
+    csdfg = fast._cache.get(next(iter(fast._cache.cache))).compiled_sdfg
+
+    print('Dispatch overhead (average over %d calls):' % args.iterations)
+    print('  fast dispatch:          %10.2f us' % per_call(lambda: fast(A, 1.0), args.iterations))
+    print('  full program cache key: %10.2f us' % per_call(lambda: slow(A, 1.0), args.iterations))
+    print('  compiled SDFG:          %10.2f us' % per_call(lambda: csdfg(A=A, alpha=1.0, N=16), args.iterations))
@@ -0,0 +1,45 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+""" 
+Measures memory and time of building and transforming large synthetic SDFGs. The networkx view of each graph is
+only built on demand, so the cost of creating it is reported separately.
+"""
+
+import argparse
+import time
+import tracemalloc
+import dace
+from node_ids import make_sdfg
+
+
+def measure(func, *args):
+    """ Returns the result, wall time (in seconds) and peak traced memory (in MiB) of a function call. """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, duration, peak / 2**20
+
+
+def build_nx_views(sdfg: dace.SDFG):
+    for state in sdfg.nodes():
+        state.nx
+    return sdfg.nx
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("sizes", type=int, nargs="*", default=[1000, 10000, 50000])
+    parser.add_argument("--simplify", action="store_true", help="Also measure simplification")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        sdfg, duration, peak = measure(make_sdfg, size)
+        print(f'SDFG with {sdfg.node(0).number_of_nodes()} nodes:')
+        print('  build:          %.4f s, %8.2f MiB' % (duration, peak))
+        _, duration, peak = measure(build_nx_views, sdfg)
+        print('  networkx views: %.4f s, %8.2f MiB' % (duration, peak))
+        if args.simplify:
+            _, duration, peak = measure(sdfg.simplify)
+            print('  simplify:       %.4f s, %8.2f MiB' % (duration, peak))
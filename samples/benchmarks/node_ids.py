@@ -0,0 +1,61 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+""" 
+Benchmarks node ID lookups on large synthetic SDFGs, timing validation, serialization and code generation.
+The indexed lookup (``OrderedDiGraph.node_id``) is compared against the previous linear-scan implementation.
+"""
+
+import argparse
+import time
+import dace
+from dace.sdfg import validation
+
+
+def make_sdfg(num_tasklets: int) -> dace.SDFG:
+    """ Creates an SDFG with one state that contains ``num_tasklets`` independent read-compute-write chains. """
+    sdfg = dace.SDFG('node_id_bench')
+    sdfg.add_array('A', [num_tasklets], dace.float64)
+    sdfg.add_array('B', [num_tasklets], dace.float64)
+    state = sdfg.add_state()
+    # Avoid inspecting the call stack for source line information on every node
+    state.set_default_lineinfo(dace.dtypes.DebugInfo(0))
+    for i in range(num_tasklets):
+        r = state.add_read('A')
+        w = state.add_write('B')
+        t = state.add_tasklet(f't{i}', {'a'}, {'b'}, 'b = a + 1')
+        state.add_edge(r, None, t, 'a', dace.Memlet(f'A[{i}]'))
+        state.add_edge(t, 'b', w, None, dace.Memlet(f'B[{i}]'))
+    return sdfg
+
+
+def linear_node_id(graph, node) -> int:
+    """ Reference implementation of the previous linear-scan lookup. """
+    return next(i for i, n in enumerate(graph.nodes()) if n is node)
+
+
+def timeit(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("sizes", type=int, nargs="*", default=[1000, 5000, 20000])
+    parser.add_argument("--codegen", action="store_true", help="Also time code generation")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        sdfg = make_sdfg(size)
+        state = sdfg.node(0)
+        nodes = state.nodes()
+        print(f'SDFG with {len(nodes)} nodes:')
+        print('  node_id (indexed):     %.4f s' % timeit(lambda: [state.node_id(n) for n in nodes]))
+        # Linear scan is quadratic, sample a subset and extrapolate
+        sample = nodes[::max(1, len(nodes) // 500)]
+        scan = timeit(lambda: [linear_node_id(state, n) for n in sample])
+        print('  node_id (linear scan): %.4f s (extrapolated)' % (scan * len(nodes) / len(sample)))
+        print('  validate_sdfg:         %.4f s' % timeit(validation.validate_sdfg, sdfg))
+        print('  to_json:               %.4f s' % timeit(sdfg.to_json))
+        if args.codegen:
+            from dace.codegen import codegen
+            print('  generate_code:         %.4f s' % timeit(codegen.generate_code, sdfg))
@@ -0,0 +1,71 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+"""
+Compares the runtime of multicore maps with write-conflict resolution outputs when compiled with OpenMP reduction
+clauses (the default for small outputs) and with atomic operations on every write, for a dot product and a histogram.
+"""
+
+import argparse
+import time
+import dace
+import numpy as np
+
+N = dace.symbol('N')
+BINS = 256
+
+
+@dace.program
+def dot(A: dace.float64[N], B: dace.float64[N], out: dace.float64[1]):
+    for i in dace.map[0:N]:
+        with dace.tasklet:
+            a << A[i]
+            b << B[i]
+            o >> out(1, lambda x, y: x + y)[0]
+            o = a * b
+
+
+@dace.program
+def histogram(A: dace.int32[N], hist: dace.int32[BINS]):
+    for i in dace.map[0:N]:
+        with dace.tasklet:
+            a << A[i]
+            h >> hist(-1, lambda x, y: x + y)[:]
+            h[a] = 1
+
+
+def compile_variant(program, suffix: str, reduction_size: int):
+    sdfg = program.to_sdfg()
+    sdfg.name = f'{sdfg.name}_{suffix}'
+    with dace.config.set_temporary('compiler', 'cpu', 'openmp_reduction_size', value=reduction_size):
+        return sdfg.compile()
+
+
+def median_time(func, repetitions: int) -> float:
+    """ Returns the median time of calling ``func`` in milliseconds. """
+    times = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1e3
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("size", type=int, nargs="?", default=2**24)
+    parser.add_argument("--repetitions", type=int, default=20)
+    args = parser.parse_args()
+
+    A = np.random.rand(args.size)
+    B = np.random.rand(args.size)
+    out = np.zeros([1])
+    data = np.random.randint(0, BINS, size=args.size, dtype=np.int32)
+    hist = np.zeros([BINS], dtype=np.int32)
+
+    print(f'Median runtime over {args.repetitions} runs, N = {args.size}:')
+    for name, program, kwargs in [('dot product', dot, dict(A=A, B=B, out=out, N=args.size)),
+                                  ('histogram', histogram, dict(A=data, hist=hist, N=args.size))]:
+        reduction = compile_variant(program, 'reduction', 4096)
+        atomic = compile_variant(program, 'atomic', 0)
+        print('  %-12s reduction clause: %8.3f ms, atomics: %8.3f ms' %
+              (name, median_time(lambda: reduction(**kwargs), args.repetitions),
+               median_time(lambda: atomic(**kwargs), args.repetitions)))
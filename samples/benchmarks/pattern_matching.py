@@ -0,0 +1,104 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+"""
+Benchmarks pattern matching of the transformations in ``dace.transformation.dataflow`` on large synthetic SDFGs.
+Candidate enumeration with the node type index (type pre-filtering and seeded VF2) is compared against plain VF2 on
+the whole (collapsed) state graph, and the results are checked to be identical.
+"""
+
+import argparse
+import time
+import dace
+from dace.transformation import dataflow, transformation as xf
+from dace.transformation.passes import pattern_matching as pm
+
+
+def make_sdfg(num_states: int, maps_per_state: int) -> dace.SDFG:
+    """ Creates an SDFG with a chain of states, each containing chains of two maps and a nested SDFG. """
+    sdfg = dace.SDFG('pattern_matching_bench')
+    sdfg.add_array('A', [128], dace.float64)
+    sdfg.add_array('B', [128], dace.float64)
+    sdfg.add_transient('tmp', [128], dace.float64)
+    prev = None
+    for i in range(num_states):
+        state = sdfg.add_state(f'state_{i}')
+        state.set_default_lineinfo(dace.dtypes.DebugInfo(0))
+        for j in range(maps_per_state):
+            tmp = state.add_access('tmp')
+            state.add_mapped_tasklet(f'first_{j}',
+                                     dict(i='0:128'),
+                                     dict(a=dace.Memlet('A[i]')),
+                                     f'b = a * {j}',
+                                     dict(b=dace.Memlet('tmp[i]')),
+                                     output_nodes=dict(tmp=tmp),
+                                     external_edges=True)
+            state.add_mapped_tasklet(f'second_{j}',
+                                     dict(i='0:128'),
+                                     dict(a=dace.Memlet('tmp[i]')),
+                                     'b = a + 1',
+                                     dict(b=dace.Memlet('B[i]')),
+                                     input_nodes=dict(tmp=tmp),
+                                     external_edges=True)
+        nsdfg = dace.SDFG(f'nested_{i}')
+        nsdfg.add_array('X', [128], dace.float64)
+        nsdfg.add_state()
+        nnode = state.add_nested_sdfg(nsdfg, sdfg, {'X'}, {'X'})
+        state.add_edge(state.add_read('A'), None, nnode, 'X', dace.Memlet('A'))
+        state.add_edge(nnode, 'X', state.add_write('A'), None, dace.Memlet('A'))
+        if prev is not None:
+            sdfg.add_edge(prev, state, dace.InterstateEdge())
+        prev = state
+    return sdfg
+
+
+def plain_type_match(graph_node, pattern_node) -> bool:
+    """ Same predicate as ``type_match``, which disables type-indexed candidate enumeration. """
+    return pm.type_match(graph_node, pattern_node)
+
+
+def enumerate_candidates(graphs, transformations, node_match):
+    """
+    Enumerates the structural candidates of all transformations in all (state, collapsed state) pairs, as
+    ``match_patterns`` does.
+    """
+    result = []
+    for state, digraph in graphs:
+        for _, _, nxpattern, matcher, _ in pm._matchable_transformations(state, transformations, node_match):
+            result.extend(matcher(digraph, nxpattern, node_match, None))
+    return result
+
+
+def timeit(func, *args, repetitions: int = 3):
+    times = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("maps", type=int, nargs="*", default=[10, 100, 500])
+    parser.add_argument("--states", type=int, default=20)
+    args = parser.parse_args()
+
+    xforms = sorted((x for x in xf.PatternTransformation.subclasses_recursive()
+                     if x.__module__.startswith(dataflow.__name__) and issubclass(x, xf.SingleStateTransformation)),
+                    key=lambda x: x.__name__)
+
+    for maps in args.maps:
+        sdfg = make_sdfg(args.states, maps)
+        graphs = [(state, pm.collapse_multigraph_to_nx(state)) for nsdfg in sdfg.all_sdfgs_recursive()
+                  for state in nsdfg.nodes()]
+        print(f'{args.states} states, {maps} map chains per state ({sdfg.node(0).number_of_nodes()} nodes):')
+        total_indexed = total_plain = 0
+        for xform in xforms:
+            _, transformations = pm.get_transformation_metadata([xform])
+            indexed, tindexed = timeit(enumerate_candidates, graphs, transformations, pm.type_match)
+            plain, tplain = timeit(enumerate_candidates, graphs, transformations, plain_type_match)
+            assert indexed == plain, xform.__name__
+            total_indexed += tindexed
+            total_plain += tplain
+            print('  %-32s %6d candidates, indexed: %8.2f ms, VF2: %8.2f ms' %
+                  (xform.__name__, len(indexed), tindexed * 1e3, tplain * 1e3))
+        print('  %-32s %18s indexed: %8.2f ms, VF2: %8.2f ms' % ('Total', '', total_indexed * 1e3, total_plain * 1e3))
@@ -0,0 +1,90 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+"""
+Compares saving and loading large synthetic SDFGs in the JSON and binary SDFG formats. For the binary format, both
+eager loading and lazy loading (followed by accessing a single state) are measured.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+import dace
+
+
+def make_sdfg(num_states: int, maps_per_state: int) -> dace.SDFG:
+    """ Creates an SDFG with a chain of states, each containing multiple maps and one nested SDFG. """
+    sdfg = dace.SDFG('serialization_benchmark')
+    sdfg.add_array('A', [128, 128], dace.float64)
+    sdfg.add_array('B', [128, 128], dace.float64)
+    prev = None
+    for i in range(num_states):
+        state = sdfg.add_state(f'state_{i}')
+        state.set_default_lineinfo(dace.dtypes.DebugInfo(0))
+        for j in range(maps_per_state):
+            state.add_mapped_tasklet(f'compute_{j}',
+                                     dict(i='0:128', j='0:128'),
+                                     dict(a=dace.Memlet('A[i, j]')),
+                                     f'b = a * {j}',
+                                     dict(b=dace.Memlet('B[i, j]')),
+                                     external_edges=True)
+        nsdfg = dace.SDFG(f'nested_{i}')
+        nsdfg.add_array('X', [128, 128], dace.float64)
+        nstate = nsdfg.add_state()
+        nstate.set_default_lineinfo(dace.dtypes.DebugInfo(0))
+        nstate.add_mapped_tasklet('nested',
+                                  dict(i='0:128', j='0:128'),
+                                  dict(a=dace.Memlet('X[i, j]')),
+                                  'b = a + 1',
+                                  dict(b=dace.Memlet('X[i, j]')),
+                                  external_edges=True)
+        nnode = state.add_nested_sdfg(nsdfg, sdfg, {'X'}, {'X'})
+        state.add_edge(state.add_read('A'), None, nnode, 'X', dace.Memlet('A'))
+        state.add_edge(nnode, 'X', state.add_write('A'), None, dace.Memlet('A'))
+        if prev is not None:
+            sdfg.add_edge(prev, state, dace.InterstateEdge())
+        prev = state
+    return sdfg
+
+
+def measure(func, *args, **kwargs):
+    """ Returns the result, wall time (in seconds) and peak traced memory (in MiB) of a function call. """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, duration, peak / 2**20
+
+
+def load_and_access(filename: str, state_id: int) -> int:
+    sdfg = dace.SDFG.from_file(filename, lazy=True)
+    return sdfg.node(state_id).number_of_nodes()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--states", type=int, default=200)
+    parser.add_argument("--maps", type=int, default=10, help="Maps per state")
+    args = parser.parse_args()
+
+    sdfg = make_sdfg(args.states, args.maps)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_file = os.path.join(tmpdir, 'program.sdfg')
+        binary_file = os.path.join(tmpdir, 'program.sdfgb')
+
+        print(f'SDFG with {args.states} states and {args.maps} maps per state:')
+        _, duration, peak = measure(sdfg.save, json_file, hash=False)
+        print('  JSON save:             %.4f s, %8.2f MiB, %8.2f MiB file' %
+              (duration, peak, os.path.getsize(json_file) / 2**20))
+        _, duration, peak = measure(sdfg.save, binary_file, hash=False, binary=True)
+        print('  binary save:           %.4f s, %8.2f MiB, %8.2f MiB file' %
+              (duration, peak, os.path.getsize(binary_file) / 2**20))
+
+        _, duration, peak = measure(dace.SDFG.from_file, json_file)
+        print('  JSON load:             %.4f s, %8.2f MiB' % (duration, peak))
+        _, duration, peak = measure(dace.SDFG.from_file, binary_file, lazy=False)
+        print('  binary load:           %.4f s, %8.2f MiB' % (duration, peak))
+        _, duration, peak = measure(load_and_access, binary_file, args.states // 2)
+        print('  binary lazy load+use:  %.4f s, %8.2f MiB' % (duration, peak))
@@ -0,0 +1,58 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+"""
+Compares the runtime of repeatedly calling a program with large intermediate arrays, when its CPU heap transients are
+allocated separately in every call and when they are served from the transient pool (``SDFG.pool_transients``).
+"""
+
+import argparse
+import time
+import dace
+import numpy as np
+
+N = dace.symbol('N')
+
+
+@dace.program
+def pipeline(A: dace.float64[N], B: dace.float64[N]):
+    tmp1 = A + 1
+    tmp2 = tmp1 * A
+    tmp3 = tmp2 - tmp1
+    B[:] = tmp3 / 2
+
+
+def compile_variant(suffix: str, pool: bool):
+    sdfg = pipeline.to_sdfg()
+    sdfg.name = f'{sdfg.name}_{suffix}'
+    for arr in sdfg.arrays.values():
+        if arr.transient and isinstance(arr, dace.data.Array):
+            arr.storage = dace.StorageType.CPU_Heap
+    sdfg.pool_transients = pool
+    return sdfg.compile()
+
+
+def median_time(func, repetitions: int) -> float:
+    """ Returns the median time of calling ``func`` in milliseconds. """
+    times = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1e3
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("sizes", type=int, nargs="*", default=[2**10, 2**16, 2**23])
+    parser.add_argument("--repetitions", type=int, default=50)
+    args = parser.parse_args()
+
+    separate = compile_variant('separate', False)
+    pooled = compile_variant('pooled', True)
+
+    print(f'Median runtime over {args.repetitions} calls:')
+    for size in args.sizes:
+        A = np.random.rand(size)
+        B = np.zeros(size)
+        print('  N = %-10d separate allocations: %8.3f ms, transient pool: %8.3f ms' %
+              (size, median_time(lambda: separate(A=A, B=B, N=size), args.repetitions),
+               median_time(lambda: pooled(A=A, B=B, N=size), args.repetitions)))
@@ -0,0 +1,78 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+import dace
+import numpy as np
+
+
+@dace.program
+def pipeline(A: dace.float64[200], B: dace.float64[200]):
+    tmp = A + 1
+    tmp2 = tmp * 2
+    for i in range(3):
+        tmp3 = tmp2 + i
+        B[:] = tmp3 - tmp
+
+
+def _set_heap(sdfg: dace.SDFG):
+    for arr in sdfg.arrays.values():
+        if arr.transient and isinstance(arr, dace.data.Array):
+            arr.storage = dace.StorageType.CPU_Heap
+
+
+def test_pool_transients():
+    sdfg = pipeline.to_sdfg()
+    _set_heap(sdfg)
+    sdfg.pool_transients = True
+
+    code = sdfg.generate_code()[0].clean_code
+    assert 'transient_pool.allocate' in code
+    assert 'delete[]' not in code
+    assert code.count('transient_pool.allocate') == code.count('transient_pool.deallocate')
+
+    A = np.random.rand(200)
+    B = np.zeros(200)
+    csdfg = sdfg.compile()
+    for _ in range(3):  # The pool is reset and reused across invocations
+        csdfg(A=A, B=B)
+        assert np.allclose(B, (A + 1) * 2 + 2 - (A + 1))
+
+
+def test_pool_hint():
+    sdfg = pipeline.to_sdfg()
+    _set_heap(sdfg)
+    pooled = next(name for name, arr in sdfg.arrays.items() if arr.transient)
+    sdfg.arrays[pooled].pool = True
+
+    code = sdfg.generate_code()[0].clean_code
+    assert code.count('transient_pool.allocate') == 1
+    assert code.count('transient_pool.deallocate') == 1
+
+    A = np.random.rand(200)
+    B = np.zeros(200)
+    sdfg(A=A, B=B)
+    assert np.allclose(B, (A + 1) * 2 + 2 - (A + 1))
+
+
+def test_pool_high_water_mark():
+    sdfg = pipeline.to_sdfg()
+    _set_heap(sdfg)
+    sdfg.pool_transients = True
+    sdfg.instrument = dace.InstrumentationType.Timer
+
+    A = np.random.rand(200)
+    B = np.zeros(200)
+    sdfg(A=A, B=B)
+
+    report = sdfg.get_latest_report()
+    values = [
+        value for events in report.counters.values() for counters in events.values()
+        for name, threads in counters.items() if name == 'high_water_mark_bytes' for tvalues in threads.values()
+        for value in tvalues
+    ]
+    assert len(values) == 1
+    assert values[0] >= 2 * 200 * 8
+
+
+if __name__ == '__main__':
+    test_pool_transients()
+    test_pool_hint()
+    test_pool_high_water_mark()
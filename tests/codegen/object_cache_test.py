@@ -0,0 +1,74 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+import os
+import pathlib
+import shutil
+import tempfile
+
+import pytest
+
+from dace.codegen.tools import object_cache
+
+
+def _write_sources(folder, value):
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, 'header.h'), 'w') as fp:
+        fp.write(f'#define VALUE {value}\n')
+    with open(os.path.join(folder, 'program.cpp'), 'w') as fp:
+        fp.write('#include "header.h"\nint get_value() { return VALUE; }\n')
+
+
+def _compile(cache, folder, size=None):
+    output = os.path.join(folder, 'program.o')
+    args = [f'-I{folder}', '-O2', '-o', output, '-c', os.path.join(folder, 'program.cpp')]
+    assert object_cache.cached_compile(str(cache), 'c++', args, size) == 0
+    with open(output, 'rb') as fp:
+        return fp.read()
+
+
+@pytest.mark.skipif(shutil.which('c++') is None, reason='No C++ compiler found')
+def test_object_cache(tmp_path):
+    cache = tmp_path / 'cache'
+    _write_sources(str(tmp_path / 'a'), 1)
+    _write_sources(str(tmp_path / 'b'), 1)
+    _write_sources(str(tmp_path / 'c'), 2)
+
+    obj_a = _compile(cache, str(tmp_path / 'a'))
+    num_entries = sum(len(files) for _, _, files in os.walk(cache))
+    assert num_entries == 1
+
+    # Same preprocessed source in a different folder reuses the cached object file
+    assert _compile(cache, str(tmp_path / 'b')) == obj_a
+    assert sum(len(files) for _, _, files in os.walk(cache)) == 1
+
+    # Different preprocessed source creates a new entry
+    _compile(cache, str(tmp_path / 'c'))
+    assert sum(len(files) for _, _, files in os.walk(cache)) == 2
+
+
+@pytest.mark.skipif(shutil.which('c++') is None, reason='No C++ compiler found')
+def test_object_cache_eviction(tmp_path):
+    cache = tmp_path / 'cache'
+    for i in range(3):
+        _write_sources(str(tmp_path / str(i)), i)
+
+    def entries():
+        return {os.path.join(root, f) for root, _, files in os.walk(cache) for f in files}
+
+    _compile(cache, str(tmp_path / '0'), size=2)
+    first = next(iter(entries()))
+    os.utime(first, ns=(0, 0))
+    _compile(cache, str(tmp_path / '1'), size=2)
+    assert len(entries()) == 2
+
+    # Using the first entry again makes the second one the least recently used
+    _compile(cache, str(tmp_path / '0'), size=2)
+    _compile(cache, str(tmp_path / '2'), size=2)
+    assert len(entries()) == 2
+    assert first in entries()
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_object_cache(pathlib.Path(tmpdir))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_object_cache_eviction(pathlib.Path(tmpdir))
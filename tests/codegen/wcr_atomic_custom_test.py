@@ -0,0 +1,62 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests conflicted write-conflict resolution with custom reductions and types without native atomics. """
+import dace
+import numpy as np
+
+N = dace.symbol('N')
+
+
+@dace.program
+def custom_sum(A: dace.float64[N], out: dace.float64[1]):
+    for i in dace.map[0:N]:
+        with dace.tasklet:
+            a << A[i]
+            o >> out(1, lambda x, y: x + 2 * y)[0]
+            o = a
+
+
+@dace.program
+def complex_histogram(A: dace.int32[N], B: dace.complex128[N], hist: dace.complex128[8]):
+    for i in dace.map[0:N]:
+        with dace.tasklet:
+            a << A[i]
+            b << B[i]
+            h >> hist(-1, lambda x, y: x + y)[:]
+            h[a] = b
+
+
+@dace.program
+def complex64_product(A: dace.complex64[N], out: dace.complex64[1]):
+    for i in dace.map[0:N]:
+        with dace.tasklet:
+            a << A[i]
+            o >> out(1, lambda x, y: x * y)[0]
+            o = a
+
+
+def test_custom_wcr():
+    A = np.random.rand(10000)
+    out = np.zeros([1])
+    custom_sum(A, out)
+    assert np.allclose(out[0], 2 * np.sum(A))
+
+
+def test_complex_wcr():
+    A = np.random.randint(0, 8, size=10000, dtype=np.int32)
+    B = np.random.rand(10000) + 1j * np.random.rand(10000)
+    hist = np.zeros([8], dtype=np.complex128)
+    complex_histogram(A, B, hist)
+    expected = np.zeros([8], dtype=np.complex128)
+    np.add.at(expected, A, B)
+    assert np.allclose(hist, expected)
+
+    # Unit-modulus values keep the product bounded
+    A = np.exp(1j * np.random.rand(1000)).astype(np.complex64)
+    out = np.ones([1], dtype=np.complex64)
+    complex64_product(A, out)
+    assert np.allclose(out[0], np.prod(A.astype(np.complex128)), rtol=1e-3)
+
+
+if __name__ == '__main__':
+    test_custom_wcr()
+    test_complex_wcr()
@@ -56,6 +56,152 @@ def test_bad_cast_csdfg():
     assert result.item() == 1
 
 
+def test_repeated_bad_cast_csdfg():
+    @dp.program
+    def tester(a: dp.int32, b: dp.float64):
+        return a + b
+
+    csdfg = tester.to_sdfg().compile()
+    for _ in range(2):  # The second call uses the cached argument construction plan
+        with pytest.warns(UserWarning, match='Casting scalar argument "b"'):
+            result = csdfg(1, 1)
+        assert result.item() == 2
+    for _ in range(2):
+        with pytest.warns(UserWarning, match='Casting scalar argument "a"'):
+            csdfg(-(1 << 31), 1.0)
+    assert csdfg(2, 1.0).item() == 3
+
+
+def test_repeated_calls_csdfg():
+    @dp.program
+    def tester(A: dp.float64[20], alpha: dp.float64, n: dp.int32):
+        A[n] += alpha
+
+    csdfg = tester.to_sdfg().compile()
+    A = np.zeros(20)
+    B = np.zeros(20)
+    for i in range(5):
+        csdfg(A, 1.0, i)  # Same argument signature, different values
+        csdfg(B, float(i), 0)
+    assert np.allclose(A[:5], 1) and np.allclose(A[5:], 0)
+    assert B[0] == 10
+
+    callargs, initargs = csdfg.construct_arguments(A, 2.0, 19)
+    for _ in range(3):
+        csdfg.fast_call(callargs, initargs)
+    assert A[19] == 6
+
+
+def test_compile_many():
+    from dace.codegen import compiler
+
+    @dp.program
+    def tester(A: dp.float64[20]):
+        A += 1
+
+    sdfgs = []
+    for i in range(3):
+        sdfg = tester.to_sdfg()
+        sdfg.name = f'compile_many_{i}'
+        sdfgs.append(sdfg)
+
+    compiled, times = compiler.compile_many(sdfgs, return_times=True)
+    assert len(compiled) == 3 and len(times) == 3
+    A = np.zeros(20)
+    for csdfg in compiled:
+        csdfg(A)
+    assert np.allclose(A, 3)
+
+
+def test_concurrent_calls_csdfg():
+    from concurrent.futures import ThreadPoolExecutor
+
+    @dp.program
+    def tester(A: dp.float64[1000], alpha: dp.float64):
+        return A * alpha
+
+    with dp.config.set_temporary('compiler', 'concurrent_states', value=4):
+        csdfg = tester.to_sdfg().compile()
+    assert csdfg.concurrent_states == 4
+
+    A = np.random.rand(1000)
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda i: csdfg(A, float(i)), range(100)))
+    for i, result in enumerate(results):
+        assert np.allclose(result, A * i)
+    # Every call returns a new array
+    assert len(set(id(r) for r in results)) == len(results)
+    assert 1 <= len(csdfg._pool) <= 4
+
+
+def test_buffer_arguments_csdfg():
+    import array
+
+    sdfg = SDFG('buffer_arguments')
+    sdfg.add_array('A', [20], dp.float64)
+    sdfg.add_array('B', [20], dp.float64)
+    state = sdfg.add_state()
+    state.add_mapped_tasklet('double',
+                             dict(i='0:20'),
+                             dict(a=Memlet('A[i]')),
+                             'b = a * 2',
+                             dict(b=Memlet('B[i]')),
+                             external_edges=True)
+    csdfg = sdfg.compile()
+
+    # Buffer-protocol objects are passed without copies
+    A = array.array('d', range(20))
+    out = bytearray(20 * 8)
+    csdfg(A=A, B=memoryview(out))
+    assert np.allclose(np.frombuffer(out), np.arange(20) * 2)
+
+    # Read-only inputs are allowed, read-only outputs are not
+    csdfg(A=np.arange(20, dtype=np.float64).tobytes(), B=out)
+    with pytest.raises(TypeError):
+        csdfg(A=A, B=bytes(out))
+
+    # Element types and strides are checked
+    with pytest.raises(TypeError):
+        csdfg(A=array.array('f', range(20)), B=out)
+    with pytest.raises(TypeError):
+        csdfg(A=memoryview(array.array('d', range(40)))[::2], B=out)
+
+    # Invalid arguments leave the program usable
+    out[:] = bytes(len(out))
+    csdfg(A=A, B=out)
+    assert np.allclose(np.frombuffer(out), np.arange(20) * 2)
+
+
+def test_build_jobs_budget():
+    """ Concurrent builds share the compiler process budget. """
+    import threading
+    from dace.codegen import compiler
+
+    with dp.config.set_temporary('compiler', 'build_jobs', value=4):
+        first = compiler._acquire_build_jobs(2)
+        second = compiler._acquire_build_jobs(4)
+        assert (first, second) == (2, 2)
+
+        # No processes left, a third build waits for one of the others to finish
+        result = []
+        waiting = threading.Thread(target=lambda: result.append(compiler._acquire_build_jobs(4)))
+        waiting.start()
+        waiting.join(0.1)
+        assert not result
+        compiler._release_build_jobs(first)
+        waiting.join()
+        assert result == [2]
+
+        compiler._release_build_jobs(second)
+        compiler._release_build_jobs(result[0])
+
+
 if __name__ == "__main__":
     test()
     test_bad_cast_csdfg()
+    test_repeated_bad_cast_csdfg()
+    test_repeated_calls_csdfg()
+    test_compile_many()
+    test_concurrent_calls_csdfg()
+    test_buffer_arguments_csdfg()
+    test_build_jobs_budget()
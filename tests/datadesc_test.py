@@ -1,4 +1,9 @@
 # Copyright 2019-2021 ETH Zurich and the DaCe authors. All rights reserved.
+import array
+
+import numpy as np
+import pytest
+
 import dace
 
 
@@ -29,6 +34,21 @@ def test_strides_alignment():
     assert perm_strides == (4, 1, 8)
 
 
+def test_buffer_descriptor():
+    desc = dace.data.create_datadescriptor(array.array('d', range(6)))
+    assert desc.dtype == dace.float64 and desc.shape == (6, )
+    desc = dace.data.create_datadescriptor(memoryview(np.zeros((2, 3), dtype=np.int32)))
+    assert desc.dtype == dace.int32 and desc.shape == (2, 3)
+    desc = dace.data.create_datadescriptor(memoryview(bytearray(16)).cast('f'))
+    assert desc.dtype == dace.float32 and desc.shape == (4, )
+
+    # Raw bytes have no element type
+    for obj in (bytes(16), bytearray(16), memoryview(bytes(16))):
+        with pytest.raises(TypeError):
+            dace.data.create_datadescriptor(obj)
+
+
 if __name__ == '__main__':
     test_strides()
     test_strides_alignment()
+    test_buffer_descriptor()
@@ -106,6 +106,21 @@ class TestOrderedGraphs(unittest.TestCase):
         self.assertEqual(next(bfs_edges), e6)
         self.assertEqual(next(bfs_edges), e7)
 
+    def test_node_ids(self):
+        g = OrderedMultiDiGraph()
+        for i in range(10):
+            g.add_node(i)
+        self.assertEqual([g.node_id(n) for n in g.nodes()], list(range(10)))
+        self.assertEqual([g.node(i) for i in range(10)], list(range(10)))
+        g.remove_node(3)
+        g.remove_node(0)
+        g.add_edge(10, 11, None)
+        nodes = list(g.nodes())
+        self.assertEqual([g.node_id(n) for n in nodes], list(range(len(nodes))))
+        self.assertEqual([g.node(i) for i in range(len(nodes))], nodes)
+        self.assertRaises(NodeNotFoundError, g.node_id, 3)
+        self.assertRaises(NodeNotFoundError, g.node, len(nodes))
+
 
 if __name__ == "__main__":
     unittest.main()
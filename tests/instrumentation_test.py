@@ -63,6 +63,34 @@ def test_timer():
     onetest(dace.InstrumentationType.Timer)
 
 
+def test_timer_aggregated():
+    size = 16
+    N.set(size)
+    A = np.random.rand(size, size)
+    B = np.random.rand(size, size)
+    C = np.zeros([size, size], dtype=np.float64)
+
+    sdfg: dace.SDFG = slowmm.to_sdfg()
+    sdfg.name = "instrumentation_test_aggregated"
+    sdfg.simplify()
+    for node, _ in sdfg.all_nodes_recursive():
+        if isinstance(node, nodes.MapEntry) and node.map.label == 'mult':
+            node.map.instrument = dace.InstrumentationType.Timer
+
+    with dace.config.set_temporary('instrumentation', 'aggregate', value=True):
+        sdfg(A=A, B=B, C=C, N=N)
+    assert np.allclose(C, 20 * A @ B)
+
+    # The map runs once per loop iteration, but only one aggregate is stored
+    report = sdfg.get_latest_report()
+    assert len(report.durations) == 0
+    stats = [s for events in report.aggregates.values() for s in events.values()]
+    assert len(stats) == 1
+    assert stats[0]['count'] == 20
+    assert stats[0]['min'] <= stats[0]['p50'] <= stats[0]['max']
+    print(report)
+
+
 #@pytest.mark.papi
 @pytest.mark.skip
 def test_papi():
@@ -77,6 +105,7 @@ def test_gpu_events():
 
 if __name__ == '__main__':
     test_timer()
+    test_timer_aggregated()
     test_papi()
     if len(sys.argv) > 1 and sys.argv[1] == 'gpu':
         test_gpu_events()
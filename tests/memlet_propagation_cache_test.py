@@ -0,0 +1,98 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests memoization of memlet propagation results. """
+import dace
+from dace.sdfg import propagation
+
+N = dace.symbol('N')
+M = dace.symbol('M')
+
+
+def _make_sdfg(num_states: int) -> dace.SDFG:
+    sdfg = dace.SDFG('memlet_propagation_cache')
+    sdfg.add_array('A', [N, M], dace.float64)
+    sdfg.add_array('B', [N, M], dace.float64)
+    prev = None
+    for i in range(num_states):
+        state = sdfg.add_state(f's{i}')
+        state.add_mapped_tasklet('stencil',
+                                 dict(i='1:N-1', j='0:M'),
+                                 dict(a=dace.Memlet('A[i-1, j]'), b=dace.Memlet('A[i+1, j]')),
+                                 'o = a + b',
+                                 dict(o=dace.Memlet('B[i, j]')),
+                                 external_edges=True)
+        r = state.add_read('A')
+        w = state.add_write('B')
+        me1, mx1 = state.add_map('outer', dict(i='0:N'))
+        me2, mx2 = state.add_map('inner', dict(j='0:M'))
+        t = state.add_tasklet('t', {'a'}, {'b'}, 'b = a * 2')
+        state.add_memlet_path(r, me1, me2, t, dst_conn='a', memlet=dace.Memlet('A[i, M - j - 1]'))
+        state.add_memlet_path(t, mx2, mx1, w, src_conn='b', memlet=dace.Memlet('B[i, j]'))
+        if prev is not None:
+            sdfg.add_edge(prev, state, dace.InterstateEdge())
+        prev = state
+    return sdfg
+
+
+def _describe(sdfg: dace.SDFG):
+    return [(str(e.data.data), str(e.data.subset), str(e.data.other_subset), str(e.data.volume), e.data.dynamic)
+            for state in sdfg.nodes() for e in state.edges()]
+
+
+def test_cached_propagation():
+    propagation.clear_propagation_cache()
+    sdfg = _make_sdfg(4)
+    propagation.propagate_memlets_sdfg(sdfg)
+    first = _describe(sdfg)
+    assert ('A', '0:N, 0:M', 'None', 'M*N', False) in first
+    # Identical scopes in other states are served from the cache
+    hits = propagation.get_propagation_statistics().cache_hits
+    assert hits > 0
+
+    propagation.propagate_memlets_sdfg(sdfg)
+    assert _describe(sdfg) == first
+    assert propagation.get_propagation_statistics().cache_hits > hits
+
+
+def test_recompute_modified_memlet():
+    propagation.clear_propagation_cache()
+    sdfg = _make_sdfg(2)
+    propagation.propagate_memlets_sdfg(sdfg)
+
+    # Modifying an inner memlet in-place changes the result of the scopes around it
+    state = sdfg.node(1)
+    tasklet = next(n for n in state.nodes() if isinstance(n, dace.nodes.Tasklet) and n.label == 't')
+    state.in_edges(tasklet)[0].data.subset = dace.subsets.Range.from_string('i, 0')
+    propagation.propagate_memlets_sdfg(sdfg)
+
+    outer = next(n for n in state.nodes() if isinstance(n, dace.nodes.MapEntry) and n.map.label == 'outer')
+    assert str(state.in_edges(outer)[0].data.subset) == '0:N, 0'
+    assert str(state.in_edges(outer)[0].data.volume) == 'M*N'
+    unmodified = next(n for n in sdfg.node(0).nodes() if isinstance(n, dace.nodes.MapEntry) and n.map.label == 'outer')
+    assert str(sdfg.node(0).in_edges(unmodified)[0].data.subset) == '0:N, 0:M'
+
+
+def test_pipeline_timing():
+    from dace.transformation import pass_pipeline as ppl
+
+    class Propagate(ppl.Pass):
+        def modifies(self):
+            return ppl.Modifies.Memlets
+
+        def should_reapply(self, modified):
+            return False
+
+        def apply_pass(self, sdfg, _):
+            propagation.propagate_memlets_sdfg(sdfg)
+            return None
+
+    pipeline = ppl.Pipeline([Propagate()])
+    pipeline.apply_pass(_make_sdfg(2), {})
+    timing = pipeline.timings['Propagate']
+    assert timing.applications == 1
+    assert 0 < timing.propagation_time <= timing.time
+
+
+if __name__ == '__main__':
+    test_cached_propagation()
+    test_recompute_modified_memlet()
+    test_pipeline_timing()
@@ -46,8 +46,70 @@ def test_return_override():
     assert np.allclose(result2, A * 2)
 
 
+def test_out_buffers():
+    A = np.random.rand(20)
+    out = np.empty(20)
+    assert oneret(A, out=out) is out
+    assert np.allclose(out, A * 2)
+
+    outs = (np.empty(20), None, np.empty(20))
+    result = multiret(A, out=outs)
+    assert result[0] is outs[0] and result[2] is outs[2]
+    assert np.allclose(outs[0], A * 3) and np.allclose(result[1], A * 4) and np.allclose(outs[2], A)
+
+    csdfg = oneret.to_sdfg().compile()
+    assert csdfg(A, out=out) is out
+    # Output buffers are not reused by subsequent calls
+    assert csdfg(A * 2) is not out
+    assert np.allclose(out, A * 2)
+
+
+def test_reuse_return_values():
+    import tracemalloc
+
+    @dace.program(reuse_return_values=True)
+    def reused(A: dace.float64[1000]):
+        return A * 2
+
+    A = np.random.rand(1000)
+    first = reused(A)
+    assert reused(A) is first
+    assert np.allclose(first, A * 2)
+
+    # Steady-state calls do not allocate return values. Memory is traced separately for every call, since
+    # interpreter caches retain some small objects across calls
+    out = np.empty(1000)
+    oneret_large = dace.program(reused.f)
+    oneret_large(A, out=out)
+    for _ in range(10):
+        for call in (lambda: reused(A), lambda: oneret_large(A, out=out)):
+            tracemalloc.start()
+            try:
+                call()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            assert peak < A.nbytes
+
+
+def test_reuse_return_values_scalar_args():
+    @dace.program(reuse_return_values=True)
+    def scaled(A: dace.float64[1000], b: dace.float64):
+        return A * b
+
+    # Scalar arguments that do not determine the return value shapes do not cause reallocation
+    A = np.random.rand(1000)
+    first = scaled(A, 1.0)
+    second = scaled(A, 2.0)
+    assert second is first
+    assert np.allclose(second, A * 2)
+
+
 if __name__ == '__main__':
     test_oneret()
     test_multiret()
     test_nested_ret()
     test_return_override()
+    test_out_buffers()
+    test_reuse_return_values()
+    test_reuse_return_values_scalar_args()
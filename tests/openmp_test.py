@@ -73,6 +73,71 @@ def test_omp_props():
     assert ("#pragma omp parallel for schedule(guided, 5) num_threads(10)" in code)
 
 
+@dace.program
+def dot(A: dace.float64[N], B: dace.float64[N], out: dace.float64[1]):
+    for i in dace.map[0:N]:
+        with dace.tasklet:
+            a << A[i]
+            b << B[i]
+            o >> out(1, lambda x, y: x + y)[0]
+            o = a * b
+
+
+@dace.program
+def histogram(A: dace.int32[N], hist: dace.int32[16]):
+    for i in dace.map[0:N]:
+        with dace.tasklet:
+            a << A[i]
+            h >> hist(-1, lambda x, y: x + y)[:]
+            h[a] = 1
+
+
+@dace.program
+def accumulate_and_read(A: dace.float64[N], out: dace.float64[1]):
+    for i in dace.map[0:N]:
+        with dace.tasklet:
+            a << A[i]
+            oin << out[0]
+            o >> out(1, lambda x, y: x + y)[0]
+            o = a * oin
+
+
+def test_omp_reduction_clauses():
+    import numpy as np
+
+    sdfg = dot.to_sdfg()
+    code = sdfg.generate_code()[0].clean_code
+    assert 'reduction(+: out[0:1])' in code
+    assert 'reduce_atomic' not in code
+
+    with dace.config.set_temporary('compiler', 'cpu', 'openmp_reduction_size', value=0):
+        code = sdfg.generate_code()[0].clean_code
+    assert 'reduction(' not in code
+    assert 'reduce_atomic' in code
+
+    A = np.random.rand(1000)
+    B = np.random.rand(1000)
+    out = np.ones([1])
+    sdfg(A=A, B=B, out=out, N=1000)
+    assert np.allclose(out[0], 1 + np.dot(A, B))
+
+    sdfg = histogram.to_sdfg()
+    code = sdfg.generate_code()[0].clean_code
+    assert 'reduction(+: hist[0:16])' in code
+    A = np.random.randint(0, 16, size=1000, dtype=np.int32)
+    hist = np.zeros([16], dtype=np.int32)
+    sdfg(A=A, hist=hist, N=1000)
+    assert np.array_equal(hist, np.bincount(A, minlength=16))
+
+
+def test_omp_reduction_not_emitted_for_read_outputs():
+    code = accumulate_and_read.to_sdfg().generate_code()[0].clean_code
+    assert 'reduction(' not in code
+    assert 'reduce_atomic' in code
+
+
 if __name__ == "__main__":
     test_lack_of_omp_props()
     test_omp_props()
+    test_omp_reduction_clauses()
+    test_omp_reduction_not_emitted_for_read_outputs()
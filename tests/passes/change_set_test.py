@@ -0,0 +1,171 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests precise change reporting in pipelines and incremental reapplication of analysis passes. """
+import dace
+from dace.transformation import pass_pipeline as ppl
+from dace.transformation.passes import analysis as ap
+from dace.transformation.passes.dead_dataflow_elimination import DeadDataflowElimination
+from dace.transformation.passes.dead_state_elimination import DeadStateElimination
+
+
+class CountingAnalysis(ppl.Pass):
+
+    def __init__(self):
+        self.applied = 0
+        self.changes = []
+
+    def modifies(self):
+        return ppl.Modifies.Nothing
+
+    def should_reapply(self, modified):
+        return modified & ppl.Modifies.Nodes
+
+    def apply_pass(self, sdfg, _):
+        self.applied += 1
+        return self.applied
+
+    def apply_pass_incremental(self, sdfg, _, previous_result, changes):
+        self.changes.append(changes)
+        return previous_result
+
+
+class ReportingPass(ppl.Pass):
+
+    def __init__(self, report: bool, changed_states: bool):
+        self.report = report
+        self.changed_states = changed_states
+
+    def depends_on(self):
+        return {CountingAnalysis}
+
+    def modifies(self):
+        return ppl.Modifies.Nodes
+
+    def should_reapply(self, _):
+        return False
+
+    def apply_pass(self, sdfg, _):
+        if self.report:
+            ppl.report_changes(states=[sdfg.start_state] if self.changed_states else [])
+        return True
+
+
+class Consumer(ppl.Pass):
+
+    def depends_on(self):
+        return {CountingAnalysis}
+
+    def modifies(self):
+        return ppl.Modifies.Nothing
+
+    def should_reapply(self, _):
+        return False
+
+    def apply_pass(self, sdfg, pipeline_results):
+        return pipeline_results['CountingAnalysis']
+
+
+def test_change_reporting():
+    sdfg = dace.SDFG('change_reporting')
+    sdfg.add_state()
+
+    # Unknown changes: the analysis is recomputed
+    analysis = CountingAnalysis()
+    ppl.Pipeline([analysis, ReportingPass(False, False), Consumer()]).apply_pass(sdfg, {})
+    assert analysis.applied == 2 and analysis.changes == []
+
+    # No changes reported: the analysis is not reapplied
+    analysis = CountingAnalysis()
+    ppl.Pipeline([analysis, ReportingPass(True, False), Consumer()]).apply_pass(sdfg, {})
+    assert analysis.applied == 1 and analysis.changes == []
+
+    # Changed states reported: the analysis is updated incrementally
+    analysis = CountingAnalysis()
+    ppl.Pipeline([analysis, ReportingPass(True, True), Consumer()]).apply_pass(sdfg, {})
+    assert analysis.applied == 1
+    assert analysis.changes == [ppl.ChangeSet(states={sdfg.start_state})]
+
+
+def _make_sdfg() -> dace.SDFG:
+    sdfg = dace.SDFG('incremental_analysis')
+    sdfg.add_array('A', [20], dace.float64)
+    sdfg.add_array('B', [20], dace.float64)
+    sdfg.add_array('cond', [1], dace.int32)
+    prev = sdfg.add_state('init')
+    for i in range(4):
+        sdfg.add_transient(f'tmp{i}', [20], dace.float64)
+        state = sdfg.add_state(f's{i}')
+        # Writes a transient that is never read (dead dataflow)
+        state.add_mapped_tasklet('dead',
+                                 dict(j='0:20'),
+                                 dict(a=dace.Memlet('A[j]')),
+                                 'b = a + 1',
+                                 dict(b=dace.Memlet(f'tmp{i}[j]')),
+                                 external_edges=True)
+        state.add_mapped_tasklet('live',
+                                 dict(j='0:20'),
+                                 dict(a=dace.Memlet('A[j]')),
+                                 'b = a * 2',
+                                 dict(b=dace.Memlet('B[j]')),
+                                 external_edges=True)
+        # Inter-state edges may read arrays
+        sdfg.add_edge(prev, state, dace.InterstateEdge(assignments=dict(c='cond[0]') if i == 1 else None))
+        prev = state
+
+    # A dead branch
+    dead = sdfg.add_state('dead_state')
+    end = sdfg.add_state('end')
+    dead.add_mapped_tasklet('copy',
+                            dict(j='0:20'),
+                            dict(a=dace.Memlet('A[j]')),
+                            'b = a',
+                            dict(b=dace.Memlet('B[j]')),
+                            external_edges=True)
+    sdfg.add_edge(prev, dead, dace.InterstateEdge('1 == 0'))
+    sdfg.add_edge(prev, end, dace.InterstateEdge('1 == 1'))
+    sdfg.add_edge(dead, end, dace.InterstateEdge())
+    return sdfg
+
+
+class CheckAnalyses(ppl.Pass):
+    """
+    Checks that the (potentially incrementally updated) analyses match a recomputation. Access analyses are not
+    reapplied when only states are removed, so only existing states are compared.
+    """
+
+    def __init__(self):
+        self.checked = 0
+
+    def depends_on(self):
+        return {ap.StateReachability, ap.AccessSets, ap.FindAccessStates}
+
+    def modifies(self):
+        return ppl.Modifies.Nothing
+
+    def should_reapply(self, _):
+        return True
+
+    def apply_pass(self, sdfg, pipeline_results):
+        states = set(sdfg.nodes())
+        assert pipeline_results['StateReachability'] == ap.StateReachability().apply_pass(sdfg, {})
+        access_sets = pipeline_results['AccessSets'][0]
+        assert {s: access_sets[s] for s in states} == ap.AccessSets().apply_pass(sdfg, {})[0]
+        access_states = {k: v & states for k, v in pipeline_results['FindAccessStates'][0].items() if v & states}
+        assert access_states == ap.FindAccessStates().apply_pass(sdfg, {})[0]
+        self.checked += 1
+        return None
+
+
+def test_incremental_analyses():
+    sdfg = _make_sdfg()
+    checker = CheckAnalyses()
+    pipeline = ppl.FixedPointPipeline([DeadDataflowElimination(), DeadStateElimination(), checker])
+    pipeline.apply_pass(sdfg, {})
+
+    assert 'dead_state' not in [s.label for s in sdfg.nodes()]
+    assert not any(n.data.startswith('tmp') for s in sdfg.nodes() for n in s.data_nodes())
+    assert checker.checked >= 2
+
+
+if __name__ == '__main__':
+    test_change_reporting()
+    test_incremental_analyses()
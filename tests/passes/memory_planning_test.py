@@ -0,0 +1,141 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+import numpy as np
+
+import dace
+from dace.transformation.passes.memory_planning import MemoryPlanning, _writes_before_reads
+
+
+def _add_step(state: dace.SDFGState, src: str, dst: str):
+    state.add_mapped_tasklet('step',
+                             dict(j='0:64'),
+                             dict(a=dace.Memlet(f'{src}[j]')),
+                             'b = a + 1',
+                             dict(b=dace.Memlet(f'{dst}[j]')),
+                             external_edges=True)
+
+
+def _chain_sdfg(name: str, num_transients: int, loop: bool = False) -> dace.SDFG:
+    """ Creates a chain of states, each of which computes the next transient from the previous one. """
+    sdfg = dace.SDFG(name)
+    sdfg.add_array('A', [64], dace.float64)
+    sdfg.add_array('B', [64], dace.float64)
+    names = ['A'] + [f't{i}' for i in range(num_transients)] + ['B']
+    for tname in names[1:-1]:
+        sdfg.add_transient(tname, [64], dace.float64)
+
+    init = sdfg.add_state('init')
+    prev = init
+    states = []
+    for i in range(len(names) - 1):
+        state = sdfg.add_state(f'step_{i}')
+        _add_step(state, names[i], names[i + 1])
+        states.append(state)
+    if loop:
+        guard = sdfg.add_state('guard')
+        end = sdfg.add_state('end')
+        sdfg.add_edge(init, guard, dace.InterstateEdge(assignments=dict(i=0)))
+        sdfg.add_edge(guard, states[0], dace.InterstateEdge('i < 3'))
+        sdfg.add_edge(states[-1], guard, dace.InterstateEdge(assignments=dict(i='i + 1')))
+        sdfg.add_edge(guard, end, dace.InterstateEdge('i >= 3'))
+    else:
+        sdfg.add_edge(init, states[0], dace.InterstateEdge())
+    for a, b in zip(states, states[1:]):
+        sdfg.add_edge(a, b, dace.InterstateEdge())
+    return sdfg
+
+
+def test_chain():
+    sdfg = _chain_sdfg('memory_planning_chain', 6)
+    result = MemoryPlanning().apply_pass(sdfg, {})
+    plan = result[sdfg.sdfg_id]
+
+    # Only two consecutive transients are live at the same time
+    assert len(plan.arenas) == 1
+    assert len(plan.placement) == 6
+    assert plan.bytes_before == 6 * 64 * 8
+    assert plan.bytes_after == plan.peak_live_bytes == 2 * 64 * 8
+
+    A = np.random.rand(64)
+    B = np.zeros(64)
+    sdfg(A=A, B=B)
+    assert np.allclose(B, A + 7)
+
+
+def test_loop():
+    sdfg = _chain_sdfg('memory_planning_loop', 4, loop=True)
+    result = MemoryPlanning().apply_pass(sdfg, {})
+    plan = result[sdfg.sdfg_id]
+
+    # Every transient is overwritten before it is read in each iteration
+    assert plan.bytes_after == 2 * 64 * 8
+
+    A = np.random.rand(64)
+    B = np.zeros(64)
+    sdfg(A=A, B=B)
+    assert np.allclose(B, A + 5)
+
+
+def test_loop_carried():
+    sdfg = dace.SDFG('memory_planning_loop_carried')
+    sdfg.add_array('A', [64], dace.float64)
+    sdfg.add_array('B', [64], dace.float64)
+    sdfg.add_transient('t0', [64], dace.float64)
+    sdfg.add_transient('t1', [64], dace.float64)
+    init = sdfg.add_state('init')
+    guard = sdfg.add_state('guard')
+    body1 = sdfg.add_state('body1')
+    body2 = sdfg.add_state('body2')
+    end = sdfg.add_state('end')
+    _add_step(init, 'A', 't0')
+    _add_step(body1, 't0', 't1')
+    _add_step(body2, 't1', 't0')
+    _add_step(end, 't0', 'B')
+    sdfg.add_edge(init, guard, dace.InterstateEdge(assignments=dict(i=0)))
+    sdfg.add_edge(guard, body1, dace.InterstateEdge('i < 3'))
+    sdfg.add_edge(body1, body2, dace.InterstateEdge())
+    sdfg.add_edge(body2, guard, dace.InterstateEdge(assignments=dict(i='i + 1')))
+    sdfg.add_edge(guard, end, dace.InterstateEdge('i >= 3'))
+
+    # t0 is carried across iterations and t1 is live within each iteration, so they cannot share memory
+    assert MemoryPlanning().apply_pass(sdfg, {}) is None
+
+    A = np.random.rand(64)
+    B = np.zeros(64)
+    sdfg(A=A, B=B)
+    assert np.allclose(B, A + 8)
+
+
+def test_writes_before_reads_order():
+    sdfg = dace.SDFG('memory_planning_node_order')
+    sdfg.add_array('A', [64], dace.float64)
+    sdfg.add_array('B', [64], dace.float64)
+    sdfg.add_transient('t', [64], dace.float64)
+    state = sdfg.add_state()
+
+    # The read node is added to the state before the write node that precedes it
+    read = state.add_read('t')
+    write = state.add_write('t')
+    state.add_mapped_tasklet('produce',
+                             dict(j='0:64'),
+                             dict(a=dace.Memlet('A[j]')),
+                             'b = a + 1',
+                             dict(b=dace.Memlet('t[j]')),
+                             output_nodes={'t': write},
+                             external_edges=True)
+    state.add_mapped_tasklet('consume',
+                             dict(j='0:64'),
+                             dict(a=dace.Memlet('t[j]')),
+                             'b = a + 1',
+                             dict(b=dace.Memlet('B[j]')),
+                             input_nodes={'t': read},
+                             external_edges=True)
+    state.add_nedge(write, read, dace.Memlet())
+
+    assert _writes_before_reads(sdfg, state, 't')
+
+
+if __name__ == '__main__':
+    test_chain()
+    test_loop()
+    test_loop_carried()
+    test_writes_before_reads_order()
@@ -1,4 +1,7 @@
 # Copyright 2019-2021 ETH Zurich and the DaCe authors. All rights reserved.
+import concurrent.futures
+import json
+import os
 import dace
 import numpy as np
 
@@ -65,8 +68,153 @@ def test_cache_argument_names():
     assert np.allclose(a, rega) and np.allclose(c, regc)
 
 
+def test_persistent_cache(tmp_path):
+    """ Tests that a new program object (e.g., in a new process) loads a compiled program from the on-disk cache. """
+    def tester(x: dace.float64[20]):
+        return x * 2
+
+    with dace.config.temporary_config():
+        dace.Config.set('frontend', 'persistent_cache', value=True)
+        dace.Config.set('frontend', 'persistent_cache_folder', value=str(tmp_path))
+        cache = dace.frontend.python.cached_program.get_persistent_cache()
+        cache.clear()
+
+        a = np.random.rand(20)
+        assert np.allclose(dace.program(tester)(a), a * 2)
+        assert cache.statistics()['entries'] == 1
+        assert cache.misses == 1 and cache.hits == 0
+
+        # A new program object should not need to parse or compile the program
+        assert np.allclose(dace.program(tester)(a), a * 2)
+        assert cache.hits == 1
+
+
+def test_persistent_cache_eviction(tmp_path):
+    """ Tests that the persistent cache evicts the least recently used entries. """
+    def tester(x):
+        return x + 1
+
+    with dace.config.temporary_config():
+        dace.Config.set('frontend', 'persistent_cache', value=True)
+        dace.Config.set('frontend', 'persistent_cache_folder', value=str(tmp_path))
+        dace.Config.set('frontend', 'persistent_cache_size', value=1)
+        cache = dace.frontend.python.cached_program.get_persistent_cache()
+        cache.clear()
+
+        prog = dace.program(tester)
+        prog(np.random.rand(2))
+        prog(np.random.rand(3))
+        stats = cache.statistics()
+        assert stats['entries'] == 1 and stats['misses'] == 2
+
+
+def test_persistent_cache_deferred_index(tmp_path):
+    """ Tests that lookups in the persistent cache only update its index in batches. """
+    cache = dace.frontend.python.cached_program.PersistentProgramCache(str(tmp_path), size=0)
+    assert cache.size == 0
+    cache.clear()
+    cache.index_update_interval = float('inf')
+
+    def total_misses():
+        with open(os.path.join(str(tmp_path), 'index.json'), 'r') as fp:
+            return json.load(fp)['misses']
+
+    assert cache.load('0' * 64) is None
+    assert cache.load('1' * 64) is None
+    assert cache.misses == 2
+    assert total_misses() == 0
+
+    cache.flush()
+    assert total_misses() == 2
+
+
+def test_compile_async():
+    """ Tests that a program compiled in the background is used by subsequent calls. """
+    @dace.program
+    def tester(x: dace.float64[20]):
+        return x * 2
+
+    a = np.random.rand(20)
+    future = tester.compile_async(a)
+    # Waits for compilation to complete
+    assert np.allclose(tester(a), a * 2)
+    assert future.done()
+    assert len(tester._cache.cache) == 1
+
+
+def test_compile_async_specializations():
+    """ Tests that concurrent compilations of specializations of the same program do not interfere. """
+    @dace.program
+    def tester(x):
+        return x * 2
+
+    from dace.codegen import compiler
+
+    a = np.random.rand(20)
+    b = np.random.rand(20).astype(np.float32)
+    c = np.random.rand(30)
+
+    # Compile in parallel regardless of the number of cores
+    executor = compiler._background_executor
+    compiler._background_executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
+    try:
+        futures = [tester.compile_async(arg) for arg in (a, b, c)]
+        for future in futures:
+            future.result()
+    finally:
+        compiler._background_executor.shutdown()
+        compiler._background_executor = executor
+
+    for arg in (a, b, c):
+        result = tester(arg)
+        assert result.shape == arg.shape and np.allclose(result, arg * 2)
+    assert len(tester._cache.cache) == 3
+
+
+def test_background_compilation():
+    """ Tests that calls run in Python mode until background compilation completes. """
+    @dace.program(compile='background')
+    def tester(x: dace.float64[20]):
+        return x * 2
+
+    a = np.random.rand(20)
+    assert np.allclose(tester(a), a * 2)
+    for _, future in list(tester._pending.values()):
+        future.result()
+    assert np.allclose(tester(a), a * 2)
+    assert len(tester._cache.cache) == 1 and not tester._pending
+
+
+def test_fast_dispatch():
+    """ Tests that cached programs are dispatched by argument fingerprints, respecting closure constants. """
+    scale = 2
+
+    @dace.program
+    def tester(x: dace.float64[20], y):
+        return x * scale + y
+
+    a = np.random.rand(20)
+    assert np.allclose(tester(a, 1.0), a * 2 + 1)
+    assert len(tester._cache.dispatch) == 1
+    assert np.allclose(tester(a, 2.0), a * 2 + 2)
+    assert len(tester._cache.cache) == 1 and len(tester._cache.dispatch) == 1
+
+    # Different argument types and closure constants are different programs
+    assert np.allclose(tester(a, 1), a * 2 + 1)
+    scale = 3
+    assert np.allclose(tester(a, 1.0), a * 3 + 1)
+    assert len(tester._cache.cache) == 3 and len(tester._cache.dispatch) == 3
+
+    tester._cache.clear()
+    assert len(tester._cache.dispatch) == 0
+
+
 if __name__ == '__main__':
     test_cache_same_args()
     test_cache_different_args()
     test_cache_return_values()
     test_cache_argument_names()
+    test_compile_async()
+    test_compile_async_specializations()
+    test_background_compilation()
+    test_fast_dispatch()
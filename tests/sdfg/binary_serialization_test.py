@@ -0,0 +1,88 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+import io
+import os
+import pickle
+import tempfile
+
+import dace
+from dace.sdfg import binary
+
+
+def _make_sdfg() -> dace.SDFG:
+    sdfg = dace.SDFG('binarytest')
+    sdfg.add_array('A', [20], dace.float64)
+    sdfg.add_symbol('N', dace.int32)
+    prev = None
+    for i in range(3):
+        state = sdfg.add_state(f's{i}')
+        state.add_mapped_tasklet('compute',
+                                 dict(i='0:20'),
+                                 dict(a=dace.Memlet('A[i]')),
+                                 f'b = a * {i - 1.5}',
+                                 dict(b=dace.Memlet('A[i]')),
+                                 external_edges=True)
+        if prev is not None:
+            sdfg.add_edge(prev, state, dace.InterstateEdge(f'N > {-i}', assignments=dict(N='N - 1')))
+        prev = state
+
+    nsdfg = dace.SDFG('binarytest_nested')
+    nsdfg.add_array('X', [20], dace.float64)
+    nstate = nsdfg.add_state()
+    nstate.add_mapped_tasklet('nested',
+                              dict(i='0:20'),
+                              dict(a=dace.Memlet('X[i]')),
+                              'b = a + 1',
+                              dict(b=dace.Memlet('X[i]')),
+                              external_edges=True)
+    node = prev.add_nested_sdfg(nsdfg, sdfg, {'X'}, {'X'})
+    prev.add_edge(prev.add_read('A'), None, node, 'X', dace.Memlet('A'))
+    prev.add_edge(node, 'X', prev.add_write('A'), None, dace.Memlet('A'))
+    return sdfg
+
+
+def _roundtrip(sdfg: dace.SDFG, lazy: bool) -> dace.SDFG:
+    fp = io.BytesIO()
+    binary.dump(sdfg, fp)
+    return binary.loads(fp.getvalue(), lazy=lazy)
+
+
+def test_roundtrip():
+    sdfg = _make_sdfg()
+    for lazy in (False, True):
+        loaded = _roundtrip(sdfg, lazy)
+        assert loaded.to_json() == sdfg.to_json()
+        assert loaded.hash_sdfg() == sdfg.hash_sdfg()
+        assert len(list(loaded.all_sdfgs_recursive())) == 2
+
+
+def test_lazy_loading():
+    sdfg = _make_sdfg()
+    loaded = _roundtrip(sdfg, lazy=True)
+    assert all(state._lazy_contents is not None for state in loaded.nodes())
+
+    assert loaded.node(1).number_of_nodes() == sdfg.node(1).number_of_nodes()
+    assert loaded.node(1)._lazy_contents is None
+    assert loaded.node(0)._lazy_contents is not None
+
+    # Copying and pickling loads the contents
+    copied = pickle.loads(pickle.dumps(loaded))
+    assert copied.to_json() == sdfg.to_json()
+
+
+def test_save_and_load():
+    sdfg = _make_sdfg()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_file = os.path.join(tmpdir, 'program.sdfg')
+        binary_file = os.path.join(tmpdir, 'program.sdfgb')
+        sdfg.save(json_file)
+        sdfg.save(binary_file, binary=True)
+        assert os.path.getsize(binary_file) < os.path.getsize(json_file)
+
+        loaded = dace.SDFG.from_file(binary_file)
+        assert loaded.to_json() == dace.SDFG.from_file(json_file).to_json()
+
+
+if __name__ == '__main__':
+    test_roundtrip()
+    test_lazy_loading()
+    test_save_and_load()
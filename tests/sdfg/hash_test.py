@@ -0,0 +1,143 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+import copy
+import dace
+
+
+def _make_sdfg(name: str, num_states: int) -> dace.SDFG:
+    sdfg = dace.SDFG(name)
+    sdfg.add_array('A', [20], dace.float64)
+    prev = None
+    for i in range(num_states):
+        state = sdfg.add_state(f's{i}')
+        state.add_mapped_tasklet('compute',
+                                 dict(i='0:20'),
+                                 dict(a=dace.Memlet('A[i]')),
+                                 'b = a + 1',
+                                 dict(b=dace.Memlet('A[i]')),
+                                 external_edges=True)
+        if prev is not None:
+            sdfg.add_edge(prev, state, dace.InterstateEdge())
+        prev = state
+    return sdfg
+
+
+def test_hash_ignores_names():
+    sdfg = _make_sdfg('hashtest', 3)
+    other = _make_sdfg('hashtest_renamed', 3)
+    assert sdfg.hash_sdfg() == other.hash_sdfg()
+    assert sdfg.hash_sdfg() == copy.deepcopy(sdfg).hash_sdfg()
+
+
+def test_hash_changes_on_mutation():
+    sdfg = _make_sdfg('hashtest', 3)
+    hsh = sdfg.hash_sdfg()
+    assert sdfg.hash_sdfg() == hsh
+
+    sdfg.node(1).add_access('A')
+    new_hsh = sdfg.hash_sdfg()
+    assert new_hsh != hsh
+
+    # In-place modifications are reflected in the hash
+    mentry = next(n for n in sdfg.node(2).nodes() if isinstance(n, dace.nodes.MapEntry))
+    mentry.map.schedule = dace.ScheduleType.Sequential
+    newer_hsh = sdfg.hash_sdfg()
+    assert newer_hsh != new_hsh
+
+    tasklet = next(n for n in sdfg.node(0).nodes() if isinstance(n, dace.nodes.Tasklet))
+    tasklet.code = dace.properties.CodeBlock('b = a + 2')
+    assert sdfg.hash_sdfg() != newer_hsh
+
+
+
+def test_hash_changes_on_inplace_mutation():
+    sdfg = _make_sdfg('hashtest', 3)
+    hashes = {sdfg.hash_sdfg()}
+
+    def changed():
+        hsh = sdfg.hash_sdfg()
+        if hsh in hashes:
+            return False
+        hashes.add(hsh)
+        return True
+
+    # Map range
+    mentry = next(n for n in sdfg.node(2).nodes() if isinstance(n, dace.nodes.MapEntry))
+    mentry.map.range.ranges[0] = (0, 9, 1)
+    assert changed()
+
+    # Memlet subset
+    edge = next(e for e in sdfg.node(1).edges() if isinstance(e.dst, dace.nodes.Tasklet))
+    edge.data.subset.ranges[0] = (1, 1, 1)
+    assert changed()
+    edge.data.subset.offset([1], False)
+    assert changed()
+
+    # Tasklet code
+    tasklet = next(n for n in sdfg.node(0).nodes() if isinstance(n, dace.nodes.Tasklet))
+    tasklet.code.as_string = 'b = a + 3'
+    assert changed()
+    tasklet.code.code[0].value.right.value = 4
+    assert changed()
+
+
+def test_hash_reuses_unmodified_states():
+    sdfg = _make_sdfg('hashtest', 2)
+    hsh = sdfg.hash_sdfg()
+    modified = sdfg.node(0)
+
+    # Record the nodes and edges that are serialized for hashing
+    serialized = []
+    node_to_json = dace.nodes.Node.to_json
+    edge_to_json = dace.sdfg.graph.MultiConnectorEdge.to_json
+
+    def counting_node_to_json(self, parent):
+        serialized.append((parent, self))
+        return node_to_json(self, parent)
+
+    def counting_edge_to_json(self, parent):
+        serialized.append((parent, self))
+        return edge_to_json(self, parent)
+
+    dace.nodes.Node.to_json = counting_node_to_json
+    dace.sdfg.graph.MultiConnectorEdge.to_json = counting_edge_to_json
+    try:
+        # In-place property edit of a node in the first state
+        tasklet = next(n for n in modified.nodes() if isinstance(n, dace.nodes.Tasklet))
+        tasklet.code = dace.properties.CodeBlock('b = a + 2')
+        new_hsh = sdfg.hash_sdfg()
+        assert new_hsh != hsh
+
+        # Only the modified tasklet is reserialized, the hashes of the other state are reused
+        assert serialized == [(modified, tasklet)]
+
+        # Nothing is reserialized if the SDFG was not modified
+        serialized.clear()
+        assert sdfg.hash_sdfg() == new_hsh
+        assert not serialized
+    finally:
+        dace.nodes.Node.to_json = node_to_json
+        dace.sdfg.graph.MultiConnectorEdge.to_json = edge_to_json
+
+
+def test_hash_nested_sdfg():
+    sdfg = dace.SDFG('hashtest_outer')
+    sdfg.add_array('A', [20], dace.float64)
+    state = sdfg.add_state()
+    nsdfg = _make_sdfg('hashtest_inner', 2)
+    state.add_nested_sdfg(nsdfg, sdfg, {}, {})
+
+    hsh = sdfg.hash_sdfg()
+    nsdfg.node(0).add_access('A')
+    new_hsh = sdfg.hash_sdfg()
+    assert new_hsh != hsh
+
+    nsdfg.add_array('B', [5], dace.float64)
+    assert sdfg.hash_sdfg() != new_hsh
+
+
+if __name__ == '__main__':
+    test_hash_ignores_names()
+    test_hash_changes_on_mutation()
+    test_hash_changes_on_inplace_mutation()
+    test_hash_reuses_unmodified_states()
+    test_hash_nested_sdfg()
@@ -0,0 +1,98 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests caching of collapsed graphs and structural matches across pattern matching calls. """
+import dace
+from dace.sdfg import nodes, utils as sdutil
+from dace.transformation import transformation as xf
+from dace.transformation.passes import pattern_matching as pm
+
+
+class RemoveTasklet(xf.SingleStateTransformation):
+    """ Removes tasklets whose label starts with ``remove``. """
+    tasklet = xf.PatternNode(nodes.Tasklet)
+
+    @classmethod
+    def expressions(cls):
+        return [sdutil.node_path_graph(cls.tasklet)]
+
+    def can_be_applied(self, graph, expr_index, sdfg, permissive=False):
+        return self.tasklet.label.startswith('remove')
+
+    def apply(self, graph, sdfg):
+        graph.remove_node(self.tasklet)
+
+
+def _make_sdfg(num_states: int) -> dace.SDFG:
+    sdfg = dace.SDFG('match_cache')
+    sdfg.add_array('A', [20], dace.float64)
+    prev = None
+    for i in range(num_states):
+        state = sdfg.add_state(f's{i}')
+        state.add_mapped_tasklet('keep',
+                                 dict(i='0:20'),
+                                 dict(a=dace.Memlet('A[i]')),
+                                 'b = a + 1',
+                                 dict(b=dace.Memlet('A[i]')),
+                                 external_edges=True)
+        state.add_tasklet('remove_1', {}, {}, '')
+        state.add_tasklet('remove_2', {}, {}, '')
+        if prev is not None:
+            sdfg.add_edge(prev, state, dace.InterstateEdge())
+        prev = state
+    return sdfg
+
+
+METADATA = pm.get_transformation_metadata([RemoveTasklet])
+
+
+def _describe_matches(sdfg: dace.SDFG, cache=None):
+    return [(m.sdfg_id, m.state_id, tuple(m.subgraph.values()))
+            for m in pm.match_patterns(sdfg, [RemoveTasklet], metadata=METADATA, cache=cache)]
+
+
+def test_cached_matches():
+    sdfg = _make_sdfg(5)
+    cache = pm.MatchCache()
+    uncached = _describe_matches(sdfg)
+    assert len(uncached) == 10
+    assert _describe_matches(sdfg, cache) == uncached
+    assert _describe_matches(sdfg, cache) == uncached
+
+
+def test_invalidate_modified_state(monkeypatch):
+    sdfg = _make_sdfg(5)
+    cache = pm.MatchCache()
+    _describe_matches(sdfg, cache)
+
+    collapsed = []
+    collapse = pm.collapse_multigraph_to_nx
+
+    def counting_collapse(graph):
+        collapsed.append(graph)
+        return collapse(graph)
+
+    monkeypatch.setattr(pm, 'collapse_multigraph_to_nx', counting_collapse)
+
+    # Unmodified graphs are not collapsed again
+    _describe_matches(sdfg, cache)
+    assert collapsed == []
+
+    # Only the modified state is collapsed and matched again
+    state = sdfg.node(2)
+    state.remove_node(next(n for n in state.nodes() if isinstance(n, nodes.Tasklet) and n.label == 'remove_1'))
+    result = _describe_matches(sdfg, cache)
+    assert collapsed == [state]
+    assert result == _describe_matches(sdfg)
+    assert len(result) == 9
+
+
+def test_apply_repeated():
+    sdfg = _make_sdfg(10)
+    result = pm.PatternMatchAndApplyRepeated([RemoveTasklet]).apply_pass(sdfg, {})
+    assert len(result['RemoveTasklet']) == 20
+    for state in sdfg.nodes():
+        assert [n.label for n in state.nodes() if isinstance(n, nodes.Tasklet)] == ['keep']
+
+
+if __name__ == '__main__':
+    test_cached_matches()
+    test_apply_repeated()
@@ -0,0 +1,98 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests pattern matching with worker processes. """
+import collections
+import pytest
+
+import dace
+from dace.sdfg import utils as sdutil
+from dace.transformation.dataflow import MapFusion, TrivialMapElimination
+from dace.transformation.interstate import StateFusion
+from dace.transformation.passes.pattern_matching import enumerate_matches, match_patterns
+
+
+def _make_sdfg(num_states: int) -> dace.SDFG:
+    sdfg = dace.SDFG('parallel_matching')
+    sdfg.add_array('A', [20], dace.float64)
+    sdfg.add_array('B', [20], dace.float64)
+    sdfg.add_array('C', [1], dace.float64)
+    prev = None
+    for i in range(num_states):
+        # A separate transient per state, so that the maps can be fused
+        sdfg.add_transient(f'tmp{i}', [20], dace.float64)
+        state = sdfg.add_state(f's{i}')
+        tmp = state.add_access(f'tmp{i}')
+        state.add_mapped_tasklet('first',
+                                 dict(i='0:20'),
+                                 dict(a=dace.Memlet('A[i]')),
+                                 'b = a + 1',
+                                 dict(b=dace.Memlet(f'tmp{i}[i]')),
+                                 output_nodes={f'tmp{i}': tmp},
+                                 external_edges=True)
+        state.add_mapped_tasklet('second',
+                                 dict(i='0:20'),
+                                 dict(a=dace.Memlet(f'tmp{i}[i]')),
+                                 'b = a * 2',
+                                 dict(b=dace.Memlet('B[i]')),
+                                 input_nodes={f'tmp{i}': tmp},
+                                 external_edges=True)
+        # A single-iteration map
+        state.add_mapped_tasklet('trivial',
+                                 dict(j='0:1'),
+                                 dict(a=dace.Memlet('A[j]')),
+                                 'c = a',
+                                 dict(c=dace.Memlet('C[j]')),
+                                 external_edges=True)
+        if prev is not None:
+            sdfg.add_edge(prev, state, dace.InterstateEdge())
+        prev = state
+    return sdfg
+
+
+def _describe_matches(sdfg: dace.SDFG, permissive: bool):
+    return [(type(m).__name__, m.sdfg_id, m.state_id, m.expr_index, tuple(m.subgraph.values()))
+            for m in match_patterns(sdfg, [MapFusion, TrivialMapElimination, StateFusion], permissive=permissive)]
+
+
+@pytest.mark.parametrize('permissive', [False, True])
+def test_parallel_match_patterns(permissive):
+    sdfg = _make_sdfg(20)
+    with dace.config.set_temporary('optimizer', 'match_processes', value=1):
+        serial = _describe_matches(sdfg, permissive)
+    with dace.config.set_temporary('optimizer', 'match_processes', value=2):
+        with dace.config.set_temporary('optimizer', 'match_parallel_threshold', value=1):
+            parallel = _describe_matches(sdfg, permissive)
+    matched = collections.Counter(name for name, *_ in serial)
+    assert matched['MapFusion'] == 20
+    assert matched['TrivialMapElimination'] == 20
+    if permissive:
+        assert matched['StateFusion'] == 19
+    assert serial == parallel
+
+
+def test_parallel_enumerate_matches():
+    sdfg = _make_sdfg(20)
+    pattern = sdutil.node_path_graph(dace.nodes.MapExit, dace.nodes.AccessNode, dace.nodes.MapEntry)
+    with dace.config.set_temporary('optimizer', 'match_processes', value=1):
+        serial = [tuple(subgraph.nodes()) for subgraph in enumerate_matches(sdfg, pattern)]
+    with dace.config.set_temporary('optimizer', 'match_processes', value=2):
+        with dace.config.set_temporary('optimizer', 'match_parallel_threshold', value=1):
+            parallel = [tuple(subgraph.nodes()) for subgraph in enumerate_matches(sdfg, pattern)]
+    assert len(serial) == 20
+    assert serial == parallel
+
+
+def test_parallel_apply_repeated():
+    sdfg = _make_sdfg(20)
+    with dace.config.set_temporary('optimizer', 'match_processes', value=2):
+        with dace.config.set_temporary('optimizer', 'match_parallel_threshold', value=1):
+            sdfg.apply_transformations_repeated(MapFusion)
+    for state in sdfg.nodes():
+        # The fused map and the single-iteration map remain
+        assert len([n for n in state.nodes() if isinstance(n, dace.nodes.MapEntry)]) == 2
+
+
+if __name__ == '__main__':
+    test_parallel_match_patterns(False)
+    test_parallel_match_patterns(True)
+    test_parallel_enumerate_matches()
+    test_parallel_apply_repeated()
@@ -0,0 +1,137 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests profiling of passes, pipelines and pattern-matching transformations. """
+import json
+import dace
+from dace.sdfg import nodes, utils as sdutil
+from dace.transformation import pass_pipeline as ppl, transformation as xf
+from dace.transformation.pass_profiling import PassProfiler
+from dace.transformation.passes import pattern_matching as pm
+
+
+class RemoveTasklet(xf.SingleStateTransformation):
+    """ Removes tasklets whose label starts with ``remove``. """
+    tasklet = xf.PatternNode(nodes.Tasklet)
+
+    @classmethod
+    def expressions(cls):
+        return [sdutil.node_path_graph(cls.tasklet)]
+
+    def can_be_applied(self, graph, expr_index, sdfg, permissive=False):
+        return self.tasklet.label.startswith('remove')
+
+    def apply(self, graph, sdfg):
+        graph.remove_node(self.tasklet)
+
+    def modifies(self):
+        return ppl.Modifies.Tasklets
+
+
+class AddTasklet(ppl.Pass):
+    """ Adds a tasklet to remove to the first state, up to three times. """
+
+    def __init__(self):
+        self.added = 0
+
+    def modifies(self):
+        return ppl.Modifies.Tasklets
+
+    def should_reapply(self, modified):
+        return True
+
+    def apply_pass(self, sdfg, _):
+        if self.added == 3:
+            return None
+        self.added += 1
+        sdfg.node(0).add_tasklet('remove_me', {}, {}, '')
+        return self.added
+
+
+class RemoveTasklets(ppl.Pass):
+
+    def modifies(self):
+        return ppl.Modifies.Tasklets
+
+    def should_reapply(self, modified):
+        return True
+
+    def apply_pass(self, sdfg, _):
+        return pm.PatternMatchAndApplyRepeated([RemoveTasklet], validate=False).apply_pass(sdfg, {})
+
+
+def _make_sdfg() -> dace.SDFG:
+    sdfg = dace.SDFG('pass_profiling')
+    state = sdfg.add_state()
+    state.add_tasklet('remove_1', {}, {}, '')
+    state.add_tasklet('keep', {}, {}, '')
+    return sdfg
+
+
+def test_profile_pipeline(tmp_path):
+    sdfg = _make_sdfg()
+    pipeline = ppl.FixedPointPipeline([AddTasklet(), RemoveTasklets()])
+    with PassProfiler() as profiler:
+        pipeline.apply_pass(sdfg, {})
+    assert [n.label for n in sdfg.node(0).nodes()] == ['keep']
+
+    summary = profiler.summary()
+    # Three iterations add tasklets, the fourth does not modify the SDFG
+    assert summary['FixedPointPipeline (iteration)'].count == 4
+    assert summary['AddTasklet'].count == 4
+    assert summary['AddTasklet'].modifications == 3
+    assert summary['AddTasklet'].modified == ppl.Modifies.Tasklets
+    assert summary['RemoveTasklet'].count == 4
+    # One successful search per application, one failed search per repetition, and a final failed search per pass
+    assert summary['RemoveTasklet (match)'].count == 4 + 3 + 4
+    assert summary['RemoveTasklets'].peak_memory is not None
+    assert summary['RemoveTasklets'].time >= summary['RemoveTasklet'].time
+    assert pipeline.timings['AddTasklet'].applications == 4
+
+    # Events are nested
+    event = next(e for e in profiler.events if e.category == 'transformation')
+    assert event.depth == 2
+
+    profiler.save(str(tmp_path / 'passes.json'))
+    with open(tmp_path / 'passes.json') as fp:
+        report = json.load(fp)
+    assert report['summary']['AddTasklet']['modified'] == ['Tasklets']
+    assert len(report['events']) == len(profiler.events)
+
+    profiler.save_chrome_trace(str(tmp_path / 'trace.json'))
+    with open(tmp_path / 'trace.json') as fp:
+        trace = json.load(fp)
+    durations = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+    assert len(durations) == len(profiler.events)
+    assert all(e['dur'] >= 0 for e in durations)
+    assert 'RemoveTasklet' in str(profiler)
+
+
+def test_profile_apply_transformations():
+    sdfg = _make_sdfg()
+    sdfg.node(0).add_tasklet('remove_2', {}, {}, '')
+    with PassProfiler(memory=False) as profiler:
+        assert sdfg.apply_transformations(RemoveTasklet, validate=False) == 1
+        assert sdfg.apply_transformations_repeated(RemoveTasklet, validate=False) == 1
+    assert [n.label for n in sdfg.node(0).nodes()] == ['keep']
+
+    summary = profiler.summary()
+    assert summary['RemoveTasklet'].count == 2
+    # One search for the first call. The second call searches once per application, once after it and once more
+    # in a final pass over all transformations
+    assert summary['RemoveTasklet (match)'].count == 1 + 3
+
+
+def test_no_profiler():
+    sdfg = _make_sdfg()
+    with PassProfiler(memory=False) as profiler:
+        pass
+    ppl.Pipeline([RemoveTasklets()]).apply_pass(sdfg, {})
+    assert profiler.events == []
+
+
+if __name__ == '__main__':
+    import pathlib
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_profile_pipeline(pathlib.Path(tmp))
+    test_profile_apply_transformations()
+    test_no_profiler()
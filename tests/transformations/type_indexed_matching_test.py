@@ -0,0 +1,142 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests type-indexed candidate enumeration in pattern matching. """
+import dace
+from dace.sdfg import nodes, utils as sdutil
+from dace.sdfg.graph import OrderedDiGraph
+from dace.transformation import transformation as xf
+from dace.transformation.passes import pattern_matching as pm
+
+
+class MapChain(xf.SingleStateTransformation):
+    map_exit = xf.PatternNode(nodes.MapExit)
+    access = xf.PatternNode(nodes.AccessNode)
+    map_entry = xf.PatternNode(nodes.MapEntry)
+
+    @classmethod
+    def expressions(cls):
+        return [sdutil.node_path_graph(cls.map_exit, cls.access, cls.map_entry)]
+
+    def can_be_applied(self, graph, expr_index, sdfg, permissive=False):
+        return True
+
+
+class MapBody(xf.SingleStateTransformation):
+    access = xf.PatternNode(nodes.AccessNode)
+    map_entry = xf.PatternNode(nodes.MapEntry)
+    tasklet = xf.PatternNode(nodes.Tasklet)
+    map_exit = xf.PatternNode(nodes.MapExit)
+
+    @classmethod
+    def expressions(cls):
+        return [sdutil.node_path_graph(cls.access, cls.map_entry, cls.tasklet, cls.map_exit)]
+
+    def can_be_applied(self, graph, expr_index, sdfg, permissive=False):
+        return True
+
+
+class NestedInOut(xf.SingleStateTransformation):
+    """ A non-path pattern, seeded from its rarest node (the nested SDFG). """
+    src = xf.PatternNode(nodes.AccessNode)
+    nsdfg = xf.PatternNode(nodes.NestedSDFG)
+    dst = xf.PatternNode(nodes.AccessNode)
+
+    @classmethod
+    def expressions(cls):
+        pattern = OrderedDiGraph()
+        pattern.add_edge(cls.src, cls.nsdfg, None)
+        pattern.add_edge(cls.nsdfg, cls.dst, None)
+        pattern.add_edge(cls.src, cls.dst, None)
+        return [pattern, sdutil.node_path_graph(cls.src, cls.nsdfg, cls.dst)]
+
+    def can_be_applied(self, graph, expr_index, sdfg, permissive=False):
+        return True
+
+
+class AnyNode(xf.SingleStateTransformation):
+    node = xf.PatternNode(nodes.Node)
+
+    @classmethod
+    def expressions(cls):
+        return [sdutil.node_path_graph(cls.node)]
+
+    def can_be_applied(self, graph, expr_index, sdfg, permissive=False):
+        return True
+
+
+def _make_sdfg() -> dace.SDFG:
+    sdfg = dace.SDFG('type_indexed_matching')
+    sdfg.add_array('A', [20], dace.float64)
+    sdfg.add_array('B', [20], dace.float64)
+    sdfg.add_transient('tmp', [20], dace.float64)
+    for i in range(3):
+        state = sdfg.add_state(f's{i}')
+        for j in range(i + 1):
+            tmp = state.add_access('tmp')
+            state.add_mapped_tasklet('first',
+                                     dict(i='0:20'),
+                                     dict(a=dace.Memlet('A[i]')),
+                                     'b = a + 1',
+                                     dict(b=dace.Memlet('tmp[i]')),
+                                     output_nodes=dict(tmp=tmp),
+                                     external_edges=True)
+            state.add_mapped_tasklet('second',
+                                     dict(i='0:20'),
+                                     dict(a=dace.Memlet('tmp[i]')),
+                                     'b = a * 2',
+                                     dict(b=dace.Memlet('B[i]')),
+                                     input_nodes=dict(tmp=tmp),
+                                     external_edges=True)
+        if i == 1:
+            nsdfg = dace.SDFG('nested')
+            nsdfg.add_array('X', [20], dace.float64)
+            nsdfg.add_state()
+            nnode = state.add_nested_sdfg(nsdfg, sdfg, {'X'}, {'X'})
+            state.add_edge(state.add_read('A'), None, nnode, 'X', dace.Memlet('A'))
+            state.add_edge(nnode, 'X', state.add_write('A'), None, dace.Memlet('A'))
+    return sdfg
+
+
+def _plain_type_match(graph_node, pattern_node):
+    """ Same as ``type_match``, but disables type-indexed candidate enumeration. """
+    return pm.type_match(graph_node, pattern_node)
+
+
+def test_nodes_of_type():
+    state = dace.SDFG('type_index').add_state()
+    r = state.add_read('A')
+    t = state.add_tasklet('t', {'a'}, {'b'}, 'b = a')
+    w = state.add_write('B')
+    state.add_edge(r, None, t, 'a', dace.Memlet('A[0]'))
+    state.add_edge(t, 'b', w, None, dace.Memlet('B[0]'))
+    assert state.nodes_of_type(nodes.AccessNode) == [r, w]
+    assert state.nodes_of_type(nodes.Node) == [r, t, w]
+    assert state.number_of_nodes_of_type(nodes.CodeNode) == 1
+
+    state.remove_node(r)
+    assert state.nodes_of_type(nodes.AccessNode) == [w]
+    assert state.number_of_nodes_of_type(nodes.MapEntry) == 0
+
+
+def test_same_matches():
+    sdfg = _make_sdfg()
+    for xform in (MapChain, MapBody, NestedInOut, AnyNode):
+        indexed = [(m.state_id, m.expr_index, tuple(m.subgraph.values())) for m in pm.match_patterns(sdfg, xform)]
+        plain = [(m.state_id, m.expr_index, tuple(m.subgraph.values()))
+                 for m in pm.match_patterns(sdfg, xform, node_match=_plain_type_match)]
+        assert len(indexed) > 0
+        assert indexed == plain
+
+
+def test_empty_pattern():
+    """ Patterns without nodes (e.g., GPUTransformSDFG) match once per SDFG in the hierarchy. """
+    from dace.transformation.interstate import GPUTransformSDFG
+    sdfg = _make_sdfg()
+    indexed = [m.sdfg_id for m in pm.match_patterns(sdfg, GPUTransformSDFG)]
+    plain = [m.sdfg_id for m in pm.match_patterns(sdfg, GPUTransformSDFG, node_match=_plain_type_match)]
+    assert indexed == plain == [s.sdfg_id for s in sdfg.all_sdfgs_recursive()]
+
+
+if __name__ == '__main__':
+    test_nodes_of_type()
+    test_same_matches()
+    test_empty_pattern()
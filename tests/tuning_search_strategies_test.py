@@ -0,0 +1,99 @@
+# Copyright 2019-2022 ETH Zurich and the DaCe authors. All rights reserved.
+""" Tests search strategies of cutout tuners on a synthetic configuration space. """
+import itertools
+import math
+
+import dace
+from dace.optimization import cutout_tuner
+from dace.optimization import search_strategies as ss
+
+TILE_SIZES = [1, 2, 4, 8, 16, 32]
+BEST = (32, 8, 1)
+
+
+class SyntheticTuner(cutout_tuner.CutoutTuner):
+    """ A tuner over tile sizes whose runtime is a function of the distance to the best tile sizes. """
+
+    def __init__(self, strategy=None):
+        super().__init__(task='Synthetic', sdfg=dace.SDFG('synthetic'), strategy=strategy)
+        self.evaluations = []
+
+    def space(self, dims: int):
+        return itertools.product(TILE_SIZES, repeat=dims)
+
+    def pre_evaluate(self, cutout, measurements: int, **kwargs):
+        return {
+            "space_kwargs": {
+                "dims": len(BEST)
+            },
+            "measurements": measurements,
+            "key": lambda point: ".".join(map(str, point))
+        }
+
+    def evaluate(self, config, measurements: int, **kwargs) -> float:
+        self.evaluations.append((config, measurements))
+        if config[0] == 1:  # Failed configurations
+            return math.inf
+        return 1.0 + sum(abs(math.log2(c) - math.log2(b)) for c, b in zip(config, BEST))
+
+
+def test_exhaustive():
+    tuner = SyntheticTuner()
+    results = tuner.search(None, measurements=10)
+    assert len(results) == len(TILE_SIZES)**3
+    assert all(m == 10 for _, m in tuner.evaluations)
+    assert min(results, key=results.get) == '32.8.1'
+
+
+def test_pruning():
+    tuner = SyntheticTuner(ss.ExhaustiveSearch(prune_factor=2.0, screening=1))
+    results = tuner.search(None, measurements=10)
+    assert len(results) == len(TILE_SIZES)**3
+    assert min(results, key=results.get) == '32.8.1'
+    # Clearly losing configurations are only screened
+    assert sum(m for _, m in tuner.evaluations) < 10 * len(results)
+
+
+def test_random_search():
+    tuner = SyntheticTuner()
+    results = tuner.search(None, measurements=10, strategy=ss.RandomSearch(budget=20, seed=0))
+    assert len(results) == 20
+    assert len(set(c for c, _ in tuner.evaluations)) == 20
+
+
+def test_successive_halving():
+    tuner = SyntheticTuner(ss.SuccessiveHalving(eta=3))
+    results = tuner.search(None, measurements=81)
+    assert len(results) == len(TILE_SIZES)**3
+    assert min(results, key=results.get) == '32.8.1'
+    # The winner is measured with all repetitions, and most configurations only with few
+    assert (BEST, 81) in tuner.evaluations
+    assert sum(m for _, m in tuner.evaluations) < 81 * len(results) / 5
+
+
+def test_tpe():
+    budget = 40
+    tuner = SyntheticTuner(ss.TPESearch(budget=budget, startup=10, seed=0))
+    results = tuner.search(None, measurements=10)
+    assert len(results) == budget
+    assert len(set(results)) == budget
+
+    # The model finds better configurations than random sampling with the same budget
+    random_tuner = SyntheticTuner(ss.RandomSearch(budget=budget, seed=0))
+    random_results = random_tuner.search(None, measurements=10)
+    assert min(results.values()) <= min(random_results.values())
+
+
+def test_sample_space():
+    sample = ss.sample_space(iter(range(1000)), 10, ss.random.Random(0))
+    assert len(sample) == 10 and sample == sorted(sample)
+    assert ss.sample_space(range(5), 10, ss.random.Random(0)) == list(range(5))
+
+
+if __name__ == '__main__':
+    test_exhaustive()
+    test_pruning()
+    test_random_search()
+    test_successive_halving()
+    test_tpe()
+    test_sample_space()